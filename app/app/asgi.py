@@ -12,5 +12,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+# Serve the async user views, which do not hold a thread while waiting on
+# the database, Redis or AWS.
+os.environ.setdefault("ASYNC_USER_VIEWS", "true")
 
 application = get_asgi_application()
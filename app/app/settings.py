@@ -12,9 +12,10 @@ https://docs.djangoproject.com/en/3.2/ref/settings/
 
 import os
 import sys
+import tempfile
 from pathlib import Path
 
-from core.utils import ssm_util
+from core.utils import config_loader
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -40,11 +41,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.MetricsMiddleware",
+    "core.middleware.TracingMiddleware",
+    "core.middleware.ProfilingMiddleware",
+    "core.middleware.RequestTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.db.middleware.PrimaryStickinessMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -73,6 +79,7 @@ WSGI_APPLICATION = "app.wsgi.application"
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
 if "test" in sys.argv or os.environ.get("DJANGO_ENV") in ["local", "test"]:
+    REQUIRED_PARAMETERS = []
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
@@ -80,22 +87,73 @@ if "test" in sys.argv or os.environ.get("DJANGO_ENV") in ["local", "test"]:
         }
     }
 else:
+    # Every parameter needed at startup is resolved in one concurrent batch.
+    # The Redis URL and KMS key id are included so later lookups through
+    # get_cached_parameter are served from the process cache.
+    REQUIRED_PARAMETERS = [
+        name for name in [
+            os.environ.get("DB_NAME"),
+            os.environ.get("DB_USER"),
+            os.environ.get("DB_PASSWORD"),
+            os.environ.get("DB_HOST"),
+            os.environ.get("REDIS_URL_SSM_NAME"),
+            "/myapp/kms-key-id",
+        ] if name
+    ]
+    PARAMETERS = config_loader.load_parameters(REQUIRED_PARAMETERS)
+    # Connections persist for DB_CONN_MAX_AGE seconds and are health checked
+    # once per request. Setting DB_POOL_MAX_SIZE enables a per-worker pool
+    # shared by the worker's threads instead. Behind PgBouncer in
+    # transaction mode, server-side cursors must be disabled.
+    DB_POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", 0))
     DATABASES = {
         "default": {
-            "ENGINE":
-            "django.db.backends.postgresql",
-            "NAME":
-            ssm_util.get_cached_parameter(os.environ.get("DB_NAME")),
-            "USER":
-            ssm_util.get_cached_parameter(os.environ.get("DB_USER")),
-            "PASSWORD":
-            ssm_util.get_cached_parameter(os.environ.get("DB_PASSWORD")),
-            "HOST":
-            ssm_util.get_cached_parameter(os.environ.get("DB_HOST")),
-            "PORT":
-            5432,
+            "ENGINE": "core.db.backends.postgresql",
+            "NAME": PARAMETERS[os.environ.get("DB_NAME")],
+            "USER": PARAMETERS[os.environ.get("DB_USER")],
+            "PASSWORD": PARAMETERS[os.environ.get("DB_PASSWORD")],
+            "HOST": PARAMETERS[os.environ.get("DB_HOST")],
+            "PORT": 5432,
+            "CONN_MAX_AGE": (0 if DB_POOL_MAX_SIZE else int(
+                os.environ.get("DB_CONN_MAX_AGE", 60))),
+            "CONN_HEALTH_CHECKS": os.environ.get("DB_CONN_HEALTH_CHECKS",
+                                                 "true").lower() == "true",
+            "DISABLE_SERVER_SIDE_CURSORS": os.environ.get(
+                "DB_PGBOUNCER_TRANSACTION_MODE", "false").lower() == "true",
+            "POOL": {
+                "MAX_SIZE": DB_POOL_MAX_SIZE,
+                "TIMEOUT": float(os.environ.get("DB_POOL_TIMEOUT", 5)),
+                "MAX_IDLE": float(os.environ.get("DB_POOL_MAX_IDLE", 300)),
+                "CHECK_INTERVAL": float(
+                    os.environ.get("DB_POOL_CHECK_INTERVAL", 30)),
+            } if DB_POOL_MAX_SIZE else None,
         }
     }
+    # Read replicas share the primary's credentials. Each one gets its own
+    # alias (replica_1, replica_2, ...) and, when enabled, its own pool.
+    for index, host in enumerate(
+            filter(None,
+                   os.environ.get("DB_REPLICA_HOSTS", "").split(",")), 1):
+        DATABASES[f"replica_{index}"] = dict(DATABASES["default"],
+                                             HOST=host.strip(),
+                                             TEST={"MIRROR": "default"})
+
+# Reads go to replicas whose replication lag is within
+# REPLICA_MAX_LAG_SECONDS; replica health is probed at most once per
+# REPLICA_CHECK_SECONDS. After a write, the client's reads stick to the
+# primary for PRIMARY_STICKY_SECONDS.
+
+DATABASE_ROUTERS = ["core.db.routers.ReplicaRouter"]
+
+READ_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get("REPLICA_MAX_LAG_SECONDS", 5))
+
+REPLICA_CHECK_SECONDS = float(os.environ.get("REPLICA_CHECK_SECONDS", 5))
+
+PRIMARY_STICKY_SECONDS = float(os.environ.get("PRIMARY_STICKY_SECONDS", 10))
+
+PRIMARY_STICKY_COOKIE = "primary_until"
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -145,3 +203,185 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
+
+# Rate limiting for the endpoints that forward requests to Cognito.
+# Windows are expressed in seconds and bucket refill rates in tokens per
+# second. The global buckets sit below the default Cognito request quotas.
+
+RATE_LIMIT_ENABLED = os.environ.get(
+    "RATE_LIMIT_ENABLED",
+    "false" if "test" in sys.argv else "true").lower() == "true"
+
+RATE_LIMIT_TRUST_X_FORWARDED_FOR = os.environ.get(
+    "RATE_LIMIT_TRUST_X_FORWARDED_FOR", "false").lower() == "true"
+
+# Number of trusted proxies in front of the app that append to
+# X-Forwarded-For. The client address is the entry this far from the right;
+# anything to its left was sent by the client and can be forged.
+
+RATE_LIMIT_TRUSTED_PROXY_HOPS = max(
+    1, int(os.environ.get("RATE_LIMIT_TRUSTED_PROXY_HOPS", 1)))
+
+RATE_LIMITS = {
+    "authenticate": {
+        "USERNAME_LIMIT": 5,
+        "USERNAME_WINDOW": 60,
+        "IP_LIMIT": 30,
+        "IP_WINDOW": 60,
+        "BUCKET_CAPACITY": 100,
+        "BUCKET_REFILL_RATE": 100,
+    },
+    "register": {
+        "USERNAME_LIMIT": 3,
+        "USERNAME_WINDOW": 300,
+        "IP_LIMIT": 10,
+        "IP_WINDOW": 300,
+        "BUCKET_CAPACITY": 40,
+        "BUCKET_REFILL_RATE": 40,
+    },
+    "initiate_password_reset": {
+        "USERNAME_LIMIT": 3,
+        "USERNAME_WINDOW": 900,
+        "IP_LIMIT": 10,
+        "IP_WINDOW": 900,
+        "BUCKET_CAPACITY": 25,
+        "BUCKET_REFILL_RATE": 25,
+    },
+}
+
+# Identity provider used by the authentication and password services.
+# Point IDENTITY_PROVIDER_BACKEND at
+# "core.utils.identity_providers.InMemoryIdentityProvider" to load test the
+# registration and login flows without calling Cognito.
+
+IDENTITY_PROVIDER_BACKEND = os.environ.get(
+    "IDENTITY_PROVIDER_BACKEND",
+    "core.utils.identity_providers.CognitoIdentityProvider")
+
+IDENTITY_PROVIDER_OPTIONS = {
+    "LATENCY_MS": float(os.environ.get("IDENTITY_PROVIDER_LATENCY_MS", 0)),
+    "LATENCY_JITTER_MS": float(
+        os.environ.get("IDENTITY_PROVIDER_LATENCY_JITTER_MS", 0)),
+    "ERROR_RATE": float(os.environ.get("IDENTITY_PROVIDER_ERROR_RATE", 0)),
+    "CONFIRMATION_CODE": os.environ.get("IDENTITY_PROVIDER_CONFIRMATION_CODE",
+                                        "123456"),
+    "AUTO_CONFIRM": os.environ.get("IDENTITY_PROVIDER_AUTO_CONFIRM",
+                                   "false").lower() == "true",
+}
+
+# Registration runs the identity provider sign up and the password
+# encryption concurrently. The deadline bounds both remote calls.
+
+REGISTRATION_MAX_WORKERS = int(os.environ.get("REGISTRATION_MAX_WORKERS", 8))
+
+REGISTRATION_DEADLINE_SECONDS = float(
+    os.environ.get("REGISTRATION_DEADLINE_SECONDS", 10))
+
+# Readiness results are cached per process so load balancers can probe
+# /readyz at high frequency without adding database load.
+
+HEALTH_CHECK_CACHE_SECONDS = float(
+    os.environ.get("HEALTH_CHECK_CACHE_SECONDS", 5))
+
+READINESS_REQUIRE_CACHE = os.environ.get("READINESS_REQUIRE_CACHE",
+                                         "false").lower() == "true"
+
+# SSM parameters held in the process cache are polled for new versions
+# every PARAMETER_WATCH_SECONDS (+/- PARAMETER_WATCH_JITTER as a fraction)
+# and swapped in without a restart. Set to 0 to disable; it is disabled by
+# default when the parameters come from the environment.
+
+PARAMETER_WATCH_SECONDS = float(
+    os.environ.get("PARAMETER_WATCH_SECONDS",
+                   300 if REQUIRED_PARAMETERS else 0))
+
+PARAMETER_WATCH_JITTER = float(os.environ.get("PARAMETER_WATCH_JITTER", 0.2))
+
+# Per-request time and call counts for each dependency, returned in a
+# Server-Timing header and logged. Costs a context variable lookup per
+# instrumented call when disabled.
+
+REQUEST_TIMING_ENABLED = os.environ.get("REQUEST_TIMING_ENABLED",
+                                        "false").lower() == "true"
+
+# Queries slower than SLOW_QUERY_THRESHOLD_MS are logged and kept, with
+# their call site, in a ring buffer of the last SLOW_QUERY_BUFFER_SIZE
+# entries served to staff users at /admin/slow-queries. Set the threshold to
+# 0 to disable. SLOW_QUERY_EXPLAIN also captures the plan of the first slow
+# occurrence of each SELECT in the background; on Postgres this is EXPLAIN
+# ANALYZE, which runs the query a second time.
+
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", 200))
+
+SLOW_QUERY_BUFFER_SIZE = int(os.environ.get("SLOW_QUERY_BUFFER_SIZE", 100))
+
+SLOW_QUERY_EXPLAIN = os.environ.get("SLOW_QUERY_EXPLAIN",
+                                    "false").lower() == "true"
+
+# OpenTelemetry tracing of requests, services, repositories, cache, database
+# and AWS calls (see core.utils.tracing). TRACING_SAMPLE_RATIO of new traces
+# are recorded; requests carrying a W3C traceparent follow the caller's
+# sampling decision. Spans are exported in batches from a background thread
+# to a JSON-lines file or to an OTLP/HTTP collector. Without the
+# opentelemetry-exporter-otlp-proto-http package, otlp falls back to the file.
+
+TRACING_ENABLED = os.environ.get("TRACING_ENABLED", "false").lower() == "true"
+
+TRACING_SAMPLE_RATIO = float(os.environ.get("TRACING_SAMPLE_RATIO", 0.01))
+
+TRACING_EXPORTER = os.environ.get("TRACING_EXPORTER", "file")
+
+TRACING_FILE_PATH = os.environ.get("TRACING_FILE_PATH", "spans.jsonl")
+
+TRACING_OTLP_ENDPOINT = os.environ.get("TRACING_OTLP_ENDPOINT",
+                                       "http://localhost:4318/v1/traces")
+
+TRACING_SERVICE_NAME = os.environ.get("TRACING_SERVICE_NAME", "user-service")
+
+# On-demand profiling of single requests (see core.utils.profiling). A
+# request is profiled when it carries an X-Profile header signed with
+# PROFILING_SECRET (make one with the profile_token command), or with
+# probability PROFILING_SAMPLE_RATE when its path starts with one of the
+# comma separated PROFILING_SAMPLE_PATHS (any path when empty). The last
+# PROFILING_STORE_SIZE profiles are kept as files in PROFILING_DIR, which
+# all worker processes share, and served to staff users at /admin/profiles.
+# Profiles taken on another host are only found if it mounts the same
+# directory.
+
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED",
+                                   "false").lower() == "true"
+
+PROFILING_SECRET = os.environ.get("PROFILING_SECRET", "")
+
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", 0))
+
+PROFILING_SAMPLE_PATHS = [
+    path for path in os.environ.get("PROFILING_SAMPLE_PATHS", "").split(",")
+    if path
+]
+
+PROFILING_INTERVAL_MS = float(os.environ.get("PROFILING_INTERVAL_MS", 5))
+
+PROFILING_STORE_SIZE = int(os.environ.get("PROFILING_STORE_SIZE", 50))
+
+PROFILING_DIR = os.environ.get(
+    "PROFILING_DIR", os.path.join(tempfile.gettempdir(), "profiles"))
+
+# Async views (see user.async_views, served when running app.asgi) run the
+# ORM and other blocking clients on a dedicated pool of this many threads
+# per worker. Keep it within the database pool size.
+
+ASYNC_BLOCKING_MAX_WORKERS = int(os.environ.get("ASYNC_BLOCKING_MAX_WORKERS",
+                                                10))
+
+# Serve the async user views instead of the DRF ones. app.asgi turns this on.
+
+ASYNC_USER_VIEWS = os.environ.get("ASYNC_USER_VIEWS",
+                                  "false").lower() == "true"
+
+# Concurrent identical user reads (find_by_id, find_user_by_username) in one
+# worker share a single in-flight call. The coalescing ratio is
+# coalesced_calls_total{role="follower"} over all coalesced_calls_total.
+
+REQUEST_COALESCING_ENABLED = os.environ.get("REQUEST_COALESCING_ENABLED",
+                                            "true").lower() == "true"
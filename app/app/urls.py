@@ -16,7 +16,20 @@ Including another URLconf
 
 from django.urls import include, path
 
+from core import views as core_views
+
 urlpatterns = [
     # ... other url patterns ...
+    path('healthz', core_views.healthz, name='healthz'),
+    path('readyz', core_views.readyz, name='readyz'),
+    path('metrics', core_views.metrics, name='metrics'),
+    path('admin/slow-queries',
+         core_views.slow_queries,
+         name='slow_queries'),
+    path('admin/cache-keys', core_views.cache_keys, name='cache_keys'),
+    path('admin/profiles', core_views.profiles, name='profiles'),
+    path('admin/profiles/<str:profile_id>',
+         core_views.profile,
+         name='profile'),
     path('api/user/', include('user.urls')),
 ]
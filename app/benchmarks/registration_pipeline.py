@@ -0,0 +1,99 @@
+"""
+Benchmark for the registration critical path.
+
+Compares the sequential registration flow (identity provider sign up, then
+KMS encrypt, then database insert) with RegistrationPipeline, which runs the
+two remote calls concurrently. Remote latencies are stubbed with sleeps so
+the result only depends on the shape of the pipeline.
+
+Usage (from the app directory):
+    python -m benchmarks.registration_pipeline --signup-ms 120 --kms-ms 40
+"""
+
+import argparse
+import statistics
+import time
+
+from core.services.registration_pipeline import (RegistrationPipeline,
+                                                 RegistrationStep)
+
+
+def stub(latency_ms: float, result=None):
+
+    def call():
+        time.sleep(latency_ms / 1000)
+        return result
+
+    return call
+
+
+def run_sequential(signup, encrypt, insert) -> None:
+    signup()
+    ciphertext = encrypt()
+    insert(ciphertext)
+
+
+def run_pipeline(pipeline: RegistrationPipeline, signup, encrypt,
+                 insert) -> None:
+    pipeline.run(
+        [
+            RegistrationStep("identity_provider", signup, lambda _: None),
+            RegistrationStep("encrypt_password", encrypt),
+        ],
+        lambda results: insert(results["encrypt_password"]),
+    )
+
+
+def measure(fn, iterations: int):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(name: str, samples) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[int(0.95 * (len(ordered) - 1))]
+    return (f"{name:<12} mean={statistics.mean(samples):8.2f}ms "
+            f"p50={statistics.median(samples):8.2f}ms p95={p95:8.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--signup-ms", type=float, default=120)
+    parser.add_argument("--kms-ms", type=float, default=40)
+    parser.add_argument("--db-ms", type=float, default=10)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    signup = stub(args.signup_ms)
+    encrypt = stub(args.kms_ms, "ciphertext")
+    insert_stub = stub(args.db_ms)
+
+    def insert(ciphertext):
+        return insert_stub()
+
+    pipeline = RegistrationPipeline(max_workers=4, deadline=10)
+    sequential = measure(lambda: run_sequential(signup, encrypt, insert),
+                         args.iterations)
+    concurrent = measure(
+        lambda: run_pipeline(pipeline, signup, encrypt, insert),
+        args.iterations)
+
+    expected_sequential = args.signup_ms + args.kms_ms + args.db_ms
+    expected_pipeline = max(args.signup_ms, args.kms_ms) + args.db_ms
+    print(f"Stubbed latencies: signup={args.signup_ms}ms "
+          f"kms={args.kms_ms}ms db={args.db_ms}ms")
+    print(f"Expected critical path: sequential={expected_sequential}ms "
+          f"pipeline={expected_pipeline}ms")
+    print(summarize("sequential", sequential))
+    print(summarize("pipeline", concurrent))
+    saved = statistics.mean(sequential) - statistics.mean(concurrent)
+    print(f"Critical path reduced by {saved:.2f}ms "
+          f"({saved / statistics.mean(sequential):.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Local load benchmark comparing runserver with the gunicorn production
+profile (gunicorn.conf.py).
+
+Each server is started as a subprocess with the current environment, warmed
+up, then driven by --concurrency keep-alive clients for --duration seconds
+per path. Use a local/test environment (DJANGO_ENV=local, REDIS_URL) so no
+AWS calls are made.
+
+Usage (from the app directory):
+    DJANGO_ENV=local REDIS_URL=redis://localhost:6379 \\
+        python -m benchmarks.serving --concurrency 32 --duration 10
+"""
+
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List
+
+SERVERS = {
+    "runserver":
+    lambda port: [
+        sys.executable, "manage.py", "runserver", "--noreload",
+        f"127.0.0.1:{port}"
+    ],
+    "gunicorn":
+    lambda port: [
+        sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--bind",
+        f"127.0.0.1:{port}", "--access-logfile", "/dev/null"
+    ],
+}
+
+
+def wait_until_up(port: int, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, 1)
+            connection.request("GET", "/healthz")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+def drive(port: int, path: str, concurrency: int,
+          duration: float) -> Dict[str, object]:
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client():
+        connection = http.client.HTTPConnection("127.0.0.1", port, 10)
+        local, failed = [], 0
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                connection.request("GET", path)
+                response = connection.getresponse()
+                response.read()
+                if response.status >= 500:
+                    failed += 1
+                else:
+                    local.append(time.perf_counter() - start)
+                if response.getheader("Connection", "").lower() == "close":
+                    connection.close()
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                connection.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    ordered = sorted(latencies) or [0.0]
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / elapsed,
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "mean": statistics.mean(ordered) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--server",
+                        action="append",
+                        choices=sorted(SERVERS),
+                        help="Server to benchmark (default: all).")
+    parser.add_argument("--path", action="append", help="Default: /healthz")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    paths = args.path or ["/healthz"]
+    print(f"{'server':<10} {'path':<12} {'rps':>9} {'p50 ms':>8} "
+          f"{'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for offset, name in enumerate(args.server or sorted(SERVERS)):
+        port = args.port + offset
+        process = subprocess.Popen(SERVERS[name](port),
+                                   env=dict(os.environ),
+                                   stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.DEVNULL)
+        try:
+            wait_until_up(port)
+            for path in paths:
+                drive(port, path, args.concurrency, min(2, args.duration))
+                result = drive(port, path, args.concurrency, args.duration)
+                print(f"{name:<10} {path:<12} {result['rps']:9.1f} "
+                      f"{result['p50']:8.2f} {result['p95']:8.2f} "
+                      f"{result['p99']:8.2f} {result['errors']:7d}")
+        finally:
+            process.terminate()
+            process.wait(10)
+
+
+if __name__ == "__main__":
+    main()
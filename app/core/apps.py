@@ -1,8 +1,16 @@
-import asyncio
+import os
 
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
-from core.utils.cache_util import _initialize_cache
+from core.utils.cache_util import cache
+
+
+def _redis_url_changed(name: str, value: str) -> None:
+    from core.utils.rate_limiter import rate_limiter
+
+    cache.reconnect()
+    rate_limiter.reset()
 
 
 class CoreConfig(AppConfig):
@@ -10,13 +18,29 @@ class CoreConfig(AppConfig):
     name = "core"
 
     def ready(self):
-        try:
-            # Try to get the running event loop (if one exists)
-            loop = asyncio.get_running_loop()
-            # Schedule the async cache initialization
-            loop.create_task(_initialize_cache())
-        except RuntimeError:
-            # If no running loop, create one and run the initializer
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(_initialize_cache())
+        from core.db import query_hooks, slow_queries
+        from core.utils import config_loader, metrics
+        from core.utils.parameter_watcher import parameter_watcher
+        from core.utils.tracing import configure_tracing
+
+        # Connect in the background; requests served before Redis is
+        # reachable fall back to the database.
+        cache.connect()
+
+        # Parameters read through get_cached_parameter (Cognito client id,
+        # KMS key id, ...) pick up rotated values on their next call; the
+        # Redis clients hold a connection and must be rebuilt.
+        redis_url_name = os.environ.get("REDIS_URL_SSM_NAME")
+        if redis_url_name:
+            parameter_watcher.subscribe(redis_url_name, _redis_url_changed)
+        parameter_watcher.start()
+
+        configure_tracing()
+
+        connection_created.connect(query_hooks.install)
+        connection_created.connect(slow_queries.install)
+
+        # Under gunicorn this runs in the preloaded master, whose metric
+        # files gunicorn.conf.py has already set up and keeps.
+        config_loader.record_ready()
+        metrics.record_startup()
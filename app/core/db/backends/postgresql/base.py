@@ -0,0 +1,81 @@
+"""
+PostgreSQL backend with connection health checks and an optional
+in-process connection pool.
+
+Extra keys in a DATABASES entry using this ENGINE:
+
+    CONN_HEALTH_CHECKS: check a persistent connection with ``SELECT 1`` the
+        first time it is used in each request, and reconnect when it is no
+        longer usable (backport of the Django 4.1 setting).
+    POOL: when set, a dict with MAX_SIZE, TIMEOUT, MAX_IDLE and
+        CHECK_INTERVAL. Connections are taken from a per-process pool shared
+        by all threads of the worker and handed back when Django closes
+        them, so CONN_MAX_AGE should be 0.
+"""
+
+from functools import partial
+
+from django.db.backends.postgresql import base
+
+from core.db.pool import ConnectionPool, get_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.health_check_done = False
+
+    @property
+    def pool(self):
+        options = self.settings_dict.get("POOL")
+        if not options:
+            return None
+
+        def factory():
+            return ConnectionPool(
+                partial(super(DatabaseWrapper, self).get_new_connection,
+                        self.get_connection_params()),
+                max_size=options.get("MAX_SIZE", 10),
+                timeout=options.get("TIMEOUT", 5.0),
+                max_idle=options.get("MAX_IDLE", 300.0),
+                check_interval=options.get("CHECK_INTERVAL", 30.0),
+            )
+
+        return get_pool(self.alias, factory)
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        connection = pool.acquire()
+        options = self.settings_dict["OPTIONS"]
+        self.isolation_level = options.get("isolation_level",
+                                           connection.isolation_level)
+        return connection
+
+    def _close(self):
+        pool = self.pool
+        if pool is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            pool.release(self.connection, discard=self.errors_occurred
+                         and not self.is_usable())
+
+    def connect(self):
+        super().connect()
+        self.health_check_done = True
+
+    def ensure_connection(self):
+        if (self.connection is not None and not self.health_check_done
+                and self.settings_dict.get("CONN_HEALTH_CHECKS")
+                and not self.in_atomic_block):
+            if not self.is_usable():
+                self.close()
+            self.health_check_done = True
+        super().ensure_connection()
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        # Check the connection again the next time it is used.
+        self.health_check_done = False
@@ -0,0 +1,66 @@
+import time
+
+from django.conf import settings
+
+from core.db import routers
+from core.middleware import AsyncCapableMiddleware
+from core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PrimaryStickinessMiddleware(AsyncCapableMiddleware):
+    """
+    Keeps a client's reads on the primary for PRIMARY_STICKY_SECONDS after
+    one of its requests wrote to the database.
+
+    The window is carried by a cookie holding its expiry (epoch seconds).
+    """
+
+    def _remaining(self, request) -> float:
+        remaining = 0.0
+        try:
+            until = float(
+                request.COOKIES.get(settings.PRIMARY_STICKY_COOKIE, 0))
+            remaining = until - time.time()
+        except ValueError:
+            pass
+        return remaining
+
+    def _remember_write(self, request, response) -> None:
+        window = settings.PRIMARY_STICKY_SECONDS
+        response.set_cookie(settings.PRIMARY_STICKY_COOKIE,
+                            str(round(time.time() + window, 3)),
+                            max_age=int(window) + 1,
+                            httponly=True,
+                            samesite="Lax")
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        routers.reset_stickiness()
+        if settings.READ_REPLICAS:
+            remaining = self._remaining(request)
+            if remaining > 0:
+                routers.pin_to_primary(remaining)
+
+        response = self.get_response(request)
+
+        if settings.READ_REPLICAS and routers.wrote_to_primary():
+            self._remember_write(request, response)
+        routers.reset_stickiness()
+        return response
+
+    async def __acall__(self, request):
+        routers.reset_stickiness()
+        if settings.READ_REPLICAS:
+            remaining = self._remaining(request)
+            if remaining > 0:
+                routers.pin_to_primary(remaining)
+
+        response = await self.get_response(request)
+
+        if settings.READ_REPLICAS and routers.wrote_to_primary():
+            self._remember_write(request, response)
+        routers.reset_stickiness()
+        return response
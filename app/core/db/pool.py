@@ -0,0 +1,182 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Tuple
+
+from core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of DB-API connections for one database alias
+    in one worker process.
+
+    At most ``max_size`` connections exist at a time; ``acquire`` blocks for
+    up to ``timeout`` seconds for one to be released. Idle connections are
+    reused most-recently-released first, discarded after ``max_idle``
+    seconds, and checked with ``SELECT 1`` when they have been idle for
+    longer than ``check_interval`` seconds.
+    """
+
+    def __init__(self,
+                 connect: Callable[[], Any],
+                 max_size: int = 10,
+                 timeout: float = 5.0,
+                 max_idle: float = 300.0,
+                 check_interval: float = 30.0) -> None:
+        self.connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.check_interval = check_interval
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self.in_use = 0
+        self.created = 0
+        self.discarded = 0
+        self.acquisitions = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    @staticmethod
+    def _close(connection: Any) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, connection: Any, idle_for: float) -> bool:
+        if connection.closed or idle_for > self.max_idle:
+            return False
+        if idle_for <= self.check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except Exception:
+            return False
+
+    def acquire(self) -> Any:
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.timeouts += 1
+            raise PoolTimeout(
+                f"No database connection available within {self.timeout}s "
+                f"(pool size {self.max_size})")
+        waited = time.monotonic() - started
+        with self._lock:
+            self.acquisitions += 1
+            self.in_use += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+        try:
+            while True:
+                with self._lock:
+                    if not self._idle:
+                        break
+                    connection, released_at = self._idle.pop()
+                if self._is_healthy(connection,
+                                    time.monotonic() - released_at):
+                    return connection
+                self._close(connection)
+                with self._lock:
+                    self.discarded += 1
+            connection = self.connect()
+            with self._lock:
+                self.created += 1
+            return connection
+        except BaseException:
+            with self._lock:
+                self.in_use -= 1
+            self._slots.release()
+            raise
+
+    def release(self, connection: Any, discard: bool = False) -> None:
+        """
+        Return a connection to the pool, rolling back any open transaction.
+        Broken connections are closed instead of being reused.
+        """
+        if not discard and not connection.closed:
+            try:
+                if connection.get_transaction_status() != 0:
+                    connection.rollback()
+            except Exception:
+                discard = True
+        discard = discard or bool(connection.closed)
+        if discard:
+            self._close(connection)
+        with self._lock:
+            self.in_use -= 1
+            if discard:
+                self.discarded += 1
+            else:
+                self._idle.append((connection, time.monotonic()))
+        self._slots.release()
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for connection, _ in idle:
+            self._close(connection)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            idle = len(self._idle)
+            acquisitions = self.acquisitions
+            return {
+                "max_size": self.max_size,
+                "in_use": self.in_use,
+                "idle": idle,
+                "utilization": self.in_use / self.max_size,
+                "created": self.created,
+                "discarded": self.discarded,
+                "acquisitions": acquisitions,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+                "wait_seconds_avg": (self.wait_seconds_total / acquisitions
+                                     if acquisitions else 0.0),
+            }
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias: str, factory: Callable[[], ConnectionPool]) \
+        -> ConnectionPool:
+    pool = _pools.get(alias)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None:
+                pool = _pools[alias] = factory()
+                logger.info("[ConnectionPool] Created pool for %s (max %s)",
+                            alias, pool.max_size)
+    return pool
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistics of every pool in this process, keyed by database alias."""
+    return {alias: pool.stats() for alias, pool in list(_pools.items())}
+
+
+def reset_pools() -> None:
+    """
+    Forget the pools without closing their connections. Called in forked
+    workers, which must not use connections opened by the parent.
+    """
+    global _pools_lock
+    _pools_lock = threading.Lock()
+    _pools.clear()
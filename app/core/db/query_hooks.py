@@ -0,0 +1,46 @@
+"""
+Database query hooks scoped to the current context instead of a connection.
+
+``connection.execute_wrapper()`` only applies to the calling thread's
+connection, but under ASGI the queries of a request run on other threads:
+the blocking executor for async views, Django's sync thread for sync views.
+``dispatch``, installed on every connection, runs the hooks registered with
+``hooks()`` in the current context, and the context follows the request
+into those threads.
+"""
+
+import contextlib
+import functools
+from contextvars import ContextVar
+from typing import Callable, Iterator, Tuple
+
+# Hooks of the current context, outermost first.
+_hooks: ContextVar[Tuple[Callable, ...]] = ContextVar("query_hooks",
+                                                      default=())
+
+
+@contextlib.contextmanager
+def hooks(*wrappers: Callable) -> Iterator[None]:
+    """
+    Run the queries made in the block, on whichever thread, through
+    ``wrappers``, which take the arguments of a
+    ``connection.execute_wrapper`` hook.
+    """
+    token = _hooks.set(_hooks.get() + wrappers)
+    try:
+        yield
+    finally:
+        _hooks.reset(token)
+
+
+def dispatch(execute, sql, params, many, context):
+    """``connection.execute_wrapper`` hook running the context's hooks."""
+    for wrapper in reversed(_hooks.get()):
+        execute = functools.partial(wrapper, execute)
+    return execute(sql, params, many, context)
+
+
+def install(sender, connection, **kwargs) -> None:
+    """``connection_created`` receiver adding ``dispatch``."""
+    if dispatch not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, dispatch)
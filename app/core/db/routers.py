@@ -0,0 +1,101 @@
+"""
+Routes reads to healthy read replicas and writes to the primary.
+
+Replicas are the aliases in settings.READ_REPLICAS. Each is probed at most
+once per REPLICA_CHECK_SECONDS for availability and replication lag; reads
+go to a random replica whose lag is within REPLICA_MAX_LAG_SECONDS, or to
+the primary when there is none.
+
+After a write, reads in the same context stick to the primary for
+PRIMARY_STICKY_SECONDS, so a read following ``update_entity`` never returns
+stale data. PrimaryStickinessMiddleware carries the window across requests.
+"""
+
+import random
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core.utils.health import CachedCheck
+
+# Monotonic deadline until which reads go to the primary.
+_primary_until: ContextVar[float] = ContextVar("primary_until", default=0.0)
+# Whether the current context has written to the primary.
+_wrote: ContextVar[bool] = ContextVar("wrote", default=False)
+
+LAG_QUERY = ("SELECT COALESCE(EXTRACT(EPOCH FROM now() - "
+             "pg_last_xact_replay_timestamp()), 0)")
+
+
+def pin_to_primary(seconds: Optional[float] = None) -> None:
+    """Send reads in the current context to the primary for ``seconds``."""
+    if seconds is None:
+        seconds = settings.PRIMARY_STICKY_SECONDS
+    _primary_until.set(max(_primary_until.get(),
+                           time.monotonic() + seconds))
+
+
+def pinned_to_primary() -> bool:
+    return time.monotonic() < _primary_until.get()
+
+
+def reset_stickiness() -> None:
+    _primary_until.set(0.0)
+    _wrote.set(False)
+
+
+def wrote_to_primary() -> bool:
+    return _wrote.get()
+
+
+def probe_replica(alias: str) -> Dict[str, Any]:
+    with connections[alias].cursor() as cursor:
+        cursor.execute(LAG_QUERY)
+        lag = float(cursor.fetchone()[0])
+    return {"ok": lag <= settings.REPLICA_MAX_LAG_SECONDS, "lag_seconds": lag}
+
+
+_replica_checks: Dict[str, CachedCheck] = {}
+
+
+def replica_status() -> Dict[str, Dict[str, Any]]:
+    """Health and lag of every configured replica, cached per process."""
+    for alias in settings.READ_REPLICAS:
+        if alias not in _replica_checks:
+            _replica_checks[alias] = CachedCheck(
+                alias, lambda alias=alias: probe_replica(alias),
+                settings.REPLICA_CHECK_SECONDS)
+    return {
+        alias: _replica_checks[alias]()
+        for alias in settings.READ_REPLICAS
+    }
+
+
+def available_replicas() -> List[str]:
+    return [
+        alias for alias, status in replica_status().items() if status["ok"]
+    ]
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if not settings.READ_REPLICAS or pinned_to_primary():
+            return DEFAULT_DB_ALIAS
+        replicas = available_replicas()
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)
+        pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas mirror the primary, so objects from any of them relate.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
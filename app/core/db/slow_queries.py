@@ -0,0 +1,220 @@
+import hashlib
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+
+from core.db import query_hooks
+from core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Fingerprints remembered for EXPLAIN capture; the oldest are forgotten.
+MAX_FINGERPRINTS = 1000
+MAX_STACK_FRAMES = 10
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\(\w+\)s")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+# Frames of the query hooks themselves are left out of call sites.
+_HOOK_FILES = {__file__, query_hooks.__file__}
+_REPOSITORIES = os.sep + "repositories" + os.sep
+
+EXPLAIN_PREFIXES = {
+    "postgresql": "EXPLAIN (ANALYZE, BUFFERS) ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+
+
+def normalize_sql(sql: str) -> str:
+    """SQL with literals and parameters replaced by ``?`` and IN lists
+    collapsed, so queries differing only in their values group together."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def fingerprint(normalized_sql: str) -> str:
+    return hashlib.sha1(normalized_sql.encode("utf-8")).hexdigest()[:16]
+
+
+def params_shape(params: Any, many: bool) -> str:
+    """The parameter types, never their values: ``(str, int)``, or
+    ``<rows> x (...)`` for executemany."""
+    if many:
+        rows = list(params or [])
+        first = params_shape(rows[0], False) if rows else "()"
+        return f"{len(rows)} x {first}"
+    if isinstance(params, dict):
+        params = params.values()
+    return "(" + ", ".join(type(p).__name__ for p in params or ()) + ")"
+
+
+def call_site() -> Dict[str, Any]:
+    """
+    The application frames (innermost last) that issued the current query,
+    and the first repository method among them.
+    """
+    frames: List[str] = []
+    repository_method = None
+    frame = sys._getframe(1)
+    while frame is not None and len(frames) < MAX_STACK_FRAMES:
+        code = frame.f_code
+        if (code.co_filename.startswith(_APP_ROOT)
+                and code.co_filename not in _HOOK_FILES):
+            frames.append(f"{os.path.relpath(code.co_filename, _APP_ROOT)}:"
+                          f"{frame.f_lineno} in {code.co_name}")
+            in_repository = _REPOSITORIES in code.co_filename
+            if repository_method is None and in_repository:
+                owner = frame.f_locals.get("self")
+                repository_method = (f"{type(owner).__name__}.{code.co_name}"
+                                     if owner is not None else code.co_name)
+        frame = frame.f_back
+    frames.reverse()
+    return {"repository_method": repository_method, "stack": frames}
+
+
+class SlowQueryLog:
+    """
+    Records the queries slower than ``threshold_ms`` in a ring buffer of the
+    last ``size`` entries, with their normalized SQL, parameter types,
+    duration and call site, and logs a warning for each.
+
+    With ``explain`` set, the plan of the first slow occurrence of each
+    fingerprint is captured by a background thread on its own connection.
+    Postgres runs ``EXPLAIN (ANALYZE, BUFFERS)``, which executes the query
+    again, so only SELECT statements are explained.
+    """
+
+    def __init__(self,
+                 threshold_ms: float,
+                 size: int = 100,
+                 explain: bool = False) -> None:
+        self.threshold = threshold_ms / 1000
+        self.explain = explain
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=size)
+        self._plans: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def wrapper(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` hook."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            if 0 < self.threshold <= duration and not sql.startswith(
+                    "EXPLAIN"):
+                self.record(sql, params, many, duration,
+                            context["connection"])
+
+    def record(self, sql: str, params: Any, many: bool, duration: float,
+               connection) -> None:
+        normalized = normalize_sql(sql)
+        key = fingerprint(normalized)
+        entry = {
+            "fingerprint": key,
+            "sql": normalized,
+            "params": params_shape(params, many),
+            "duration_ms": round(duration * 1000, 2),
+            "alias": connection.alias,
+            "recorded_at": time.time(),
+            **call_site(),
+        }
+        with self._lock:
+            self._entries.append(entry)
+            first = key not in self._plans
+            if first:
+                self._plans[key] = None
+                if len(self._plans) > MAX_FINGERPRINTS:
+                    self._plans.popitem(last=False)
+        logger.warning("[SlowQuery] %.1fms in %s: %s",
+                       entry["duration_ms"],
+                       entry["repository_method"] or "-",
+                       normalized,
+                       extra={"slow_query": entry})
+
+        if (first and self.explain and not many
+                and normalized[:6].upper() == "SELECT"
+                and connection.vendor in EXPLAIN_PREFIXES):
+            self._submit(self._explain_in_background, key, connection.alias,
+                         connection.vendor, sql, params)
+
+    def _submit(self, fn, *args) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="slow-query-explain")
+            executor = self._executor
+        executor.submit(fn, *args)
+
+    def capture_plan(self, key: str, alias: str, vendor: str, sql: str,
+                     params: Any) -> None:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(EXPLAIN_PREFIXES[vendor] + sql, params)
+            rows = cursor.fetchall()
+        plan = "\n".join(" ".join(str(column) for column in row)
+                         for row in rows)
+        with self._lock:
+            if key in self._plans:
+                self._plans[key] = plan
+
+    def _explain_in_background(self, *args) -> None:
+        try:
+            self.capture_plan(*args)
+        except Exception:
+            logger.warning("[SlowQuery] EXPLAIN failed", exc_info=True)
+        finally:
+            connections.close_all()
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """The recorded queries, newest first, with any captured plan."""
+        with self._lock:
+            return [
+                dict(entry, plan=self._plans.get(entry["fingerprint"]))
+                for entry in reversed(self._entries)
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._plans.clear()
+
+    def reset(self) -> None:
+        """
+        Forget the EXPLAIN thread. Called in forked worker processes, which
+        do not inherit the parent's threads.
+        """
+        self._lock = threading.Lock()
+        self._executor = None
+
+
+def install(sender, connection, **kwargs) -> None:
+    """
+    ``connection_created`` receiver adding the slow query hook. It goes to
+    the front of the list: ``connection.execute_wrapper()`` blocks pop the
+    last entry on exit, and a connection opened inside one of them would
+    otherwise lose this hook and leave that block's wrapper behind.
+    """
+    if slow_query_log.wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, slow_query_log.wrapper)
+
+
+# Process-wide log, installed on every connection by CoreConfig.ready.
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_THRESHOLD_MS,
+                              settings.SLOW_QUERY_BUFFER_SIZE,
+                              settings.SLOW_QUERY_EXPLAIN)
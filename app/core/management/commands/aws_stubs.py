@@ -0,0 +1,347 @@
+"""
+Django command to serve local stand-ins for Cognito, KMS and SSM
+"""
+
+import base64
+import json
+import os
+import random
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+
+# X-Amz-Target prefix of each service's JSON protocol.
+TARGET_PREFIXES = {
+    "AWSCognitoIdentityProviderService": "cognito-idp",
+    "TrentService": "kms",
+    "AmazonSSM": "ssm",
+}
+
+CIPHERTEXT_PREFIX = b"kms-stub:"
+DATA_KEY_SIZES = {"AES_256": 32, "AES_128": 16}
+
+Reply = Tuple[int, Dict[str, Any]]
+
+
+class AwsError(Exception):
+
+    def __init__(self, code: str, message: str = "", status: int = 400):
+        super().__init__(message or code)
+        self.code = code
+        self.status = status
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+class AwsStub:
+    """
+    In-memory Cognito user pool, KMS and SSM parameter store answering the
+    AWS JSON 1.1 protocol, with configurable latency per service.
+
+    KMS "ciphertexts" are the plaintext behind a fixed prefix, so anything
+    encrypted by one stub can be decrypted by another.
+    """
+
+    def __init__(self,
+                 parameters: Optional[Dict[str, str]] = None,
+                 latency_ms: float = 0,
+                 jitter_ms: float = 0,
+                 service_latency_ms: Optional[Dict[str, float]] = None,
+                 confirmation_code: str = "123456",
+                 auto_confirm: bool = False,
+                 seed: Optional[int] = None) -> None:
+        self.parameters = dict(parameters or {})
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.service_latency_ms = dict(service_latency_ms or {})
+        self.confirmation_code = confirmation_code
+        self.auto_confirm = auto_confirm
+        self.calls: Dict[str, int] = {}
+        self._users: Dict[str, Dict[str, Any]] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self, service: str) -> float:
+        with self._lock:
+            jitter = self._random.uniform(0, self.jitter_ms)
+        return (self.service_latency_ms.get(service, self.latency_ms) +
+                jitter) / 1000
+
+    def handle(self, target: str, body: Dict[str, Any]) -> Reply:
+        prefix, _, operation = target.partition(".")
+        service = TARGET_PREFIXES.get(prefix)
+        handler = getattr(self, f"{service or ''}_{operation}".replace(
+            "-", "_"), None)
+        if handler is None:
+            return 400, {
+                "__type": "UnknownOperationException",
+                "message": target
+            }
+        with self._lock:
+            self.calls[target] = self.calls.get(target, 0) + 1
+        try:
+            return 200, handler(body)
+        except AwsError as error:
+            return error.status, {"__type": error.code, "message": str(error)}
+
+    # Cognito
+
+    def _user(self, username: str) -> Dict[str, Any]:
+        user = self._users.get(username)
+        if user is None:
+            raise AwsError("UserNotFoundException", "User does not exist.")
+        return user
+
+    def _check_code(self, code: str) -> None:
+        if code != self.confirmation_code:
+            raise AwsError("CodeMismatchException", "Invalid code provided.")
+
+    def cognito_idp_SignUp(self, body):
+        with self._lock:
+            if body["Username"] in self._users:
+                raise AwsError("UsernameExistsException",
+                               "User already exists")
+            self._users[body["Username"]] = {
+                "password": body["Password"],
+                "confirmed": self.auto_confirm,
+            }
+        return {
+            "UserConfirmed": self.auto_confirm,
+            "UserSub": secrets.token_hex(16)
+        }
+
+    def cognito_idp_ConfirmSignUp(self, body):
+        with self._lock:
+            user = self._user(body["Username"])
+            self._check_code(body["ConfirmationCode"])
+            user["confirmed"] = True
+        return {}
+
+    def cognito_idp_AdminInitiateAuth(self, body):
+        params = body.get("AuthParameters", {})
+        with self._lock:
+            user = self._user(params.get("USERNAME", ""))
+            if user["password"] != params.get("PASSWORD"):
+                raise AwsError("NotAuthorizedException",
+                               "Incorrect username or password.")
+            if not user["confirmed"]:
+                raise AwsError("UserNotConfirmedException",
+                               "User is not confirmed.")
+        return {
+            "AuthenticationResult": {
+                "IdToken": f"stub.{secrets.token_urlsafe(24)}",
+                "AccessToken": f"stub.{secrets.token_urlsafe(24)}",
+                "RefreshToken": f"stub.{secrets.token_urlsafe(24)}",
+                "ExpiresIn": 3600,
+                "TokenType": "Bearer",
+            }
+        }
+
+    def cognito_idp_ForgotPassword(self, body):
+        with self._lock:
+            self._user(body["Username"])
+        return {
+            "CodeDeliveryDetails": {
+                "Destination": "e***@example.com",
+                "DeliveryMedium": "EMAIL",
+                "AttributeName": "email",
+            }
+        }
+
+    def cognito_idp_ConfirmForgotPassword(self, body):
+        with self._lock:
+            user = self._user(body["Username"])
+            self._check_code(body["ConfirmationCode"])
+            user["password"] = body["Password"]
+        return {}
+
+    def cognito_idp_AdminDeleteUser(self, body):
+        with self._lock:
+            self._users.pop(body["Username"], None)
+        return {}
+
+    # KMS
+
+    def kms_GenerateDataKey(self, body):
+        size = body.get("NumberOfBytes") or DATA_KEY_SIZES[body.get(
+            "KeySpec", "AES_256")]
+        key = os.urandom(size)
+        return {
+            "KeyId": body["KeyId"],
+            "Plaintext": _b64(key),
+            "CiphertextBlob": _b64(CIPHERTEXT_PREFIX + key),
+        }
+
+    def kms_Encrypt(self, body):
+        plaintext = base64.b64decode(body["Plaintext"])
+        return {
+            "KeyId": body["KeyId"],
+            "CiphertextBlob": _b64(CIPHERTEXT_PREFIX + plaintext),
+        }
+
+    def kms_Decrypt(self, body):
+        blob = base64.b64decode(body["CiphertextBlob"])
+        if not blob.startswith(CIPHERTEXT_PREFIX):
+            raise AwsError("InvalidCiphertextException")
+        return {
+            "KeyId": body.get("KeyId", "stub"),
+            "Plaintext": _b64(blob[len(CIPHERTEXT_PREFIX):]),
+        }
+
+    def kms_ReEncrypt(self, body):
+        blob = base64.b64decode(body["CiphertextBlob"])
+        if not blob.startswith(CIPHERTEXT_PREFIX):
+            raise AwsError("InvalidCiphertextException")
+        return {
+            "KeyId": body["DestinationKeyId"],
+            "SourceKeyId": body.get("SourceKeyId", "stub"),
+            "CiphertextBlob": _b64(blob),
+        }
+
+    # SSM
+
+    def _parameter(self, name: str) -> Optional[Dict[str, Any]]:
+        value = self.parameters.get(name)
+        if value is None:
+            return None
+        return {
+            "Name": name,
+            "Type": "SecureString",
+            "Value": value,
+            "Version": 1
+        }
+
+    def ssm_GetParameter(self, body):
+        parameter = self._parameter(body["Name"])
+        if parameter is None:
+            raise AwsError("ParameterNotFound", body["Name"])
+        return {"Parameter": parameter}
+
+    def ssm_GetParameters(self, body):
+        found, missing = [], []
+        for name in body["Names"]:
+            parameter = self._parameter(name)
+            if parameter is None:
+                missing.append(name)
+            else:
+                found.append(parameter)
+        return {"Parameters": found, "InvalidParameters": missing}
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        stub: AwsStub = self.server.stub
+        target = self.headers.get("X-Amz-Target", "")
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        service = TARGET_PREFIXES.get(target.partition(".")[0], "")
+        delay = stub.delay(service)
+        if delay > 0:
+            time.sleep(delay)
+
+        status, reply = stub.handle(target, body)
+        payload = json.dumps(reply).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/x-amz-json-1.1")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("x-amzn-RequestId", secrets.token_hex(16))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(stub: AwsStub, host: str = "127.0.0.1",
+                port: int = 0) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), StubRequestHandler)
+    server.daemon_threads = True
+    server.stub = stub
+    return server
+
+
+def parse_pairs(values, option: str) -> Dict[str, str]:
+    pairs = {}
+    for value in values or []:
+        name, separator, rest = value.partition("=")
+        if not separator:
+            raise CommandError(f"{option} expects NAME=VALUE, got '{value}'")
+        pairs[name] = rest
+    return pairs
+
+
+class Command(BaseCommand):
+    """
+    Serves Cognito, KMS and SSM stand-ins on one port. Point the app at it
+    with AWS_ENDPOINT_URL (see core.utils.aws_clients) and dummy
+    credentials, e.g.::
+
+        python manage.py aws_stubs --port 4566 --latency-ms 20 \\
+            --service-latency cognito-idp=120 --auto-confirm \\
+            --parameter /myapp/kms-key-id=stub-key
+
+        AWS_ENDPOINT_URL=http://127.0.0.1:4566 AWS_ACCESS_KEY_ID=stub \\
+            AWS_SECRET_ACCESS_KEY=stub gunicorn -c gunicorn.conf.py
+    """
+
+    help = "Serve local Cognito, KMS and SSM stand-ins for load testing"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=4566)
+        parser.add_argument("--latency-ms",
+                            type=float,
+                            default=0,
+                            help="Latency added to every call.")
+        parser.add_argument("--jitter-ms",
+                            type=float,
+                            default=0,
+                            help="Uniform jitter added on top.")
+        parser.add_argument(
+            "--service-latency",
+            action="append",
+            metavar="SERVICE=MS",
+            help="Latency for one service (cognito-idp, kms or ssm).")
+        parser.add_argument("--parameter",
+                            action="append",
+                            metavar="NAME=VALUE",
+                            help="An SSM parameter to serve.")
+        parser.add_argument("--confirmation-code", default="123456")
+        parser.add_argument("--auto-confirm",
+                            action="store_true",
+                            help="Confirm users on sign up.")
+        parser.add_argument("--seed", type=int)
+
+    def handle(self, *args, **options):
+        """Entrypoint for the command"""
+        service_latency = {
+            service: float(ms)
+            for service, ms in parse_pairs(options["service_latency"],
+                                           "--service-latency").items()
+        }
+        stub = AwsStub(
+            parameters=parse_pairs(options["parameter"], "--parameter"),
+            latency_ms=options["latency_ms"],
+            jitter_ms=options["jitter_ms"],
+            service_latency_ms=service_latency,
+            confirmation_code=options["confirmation_code"],
+            auto_confirm=options["auto_confirm"],
+            seed=options["seed"],
+        )
+        server = make_server(stub, options["host"], options["port"])
+        host, port = server.server_address[:2]
+        self.stdout.write(f"Serving AWS stubs on http://{host}:{port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,286 @@
+"""
+Django command to micro-benchmark the repository, cache and serialization
+layers
+"""
+
+import contextlib
+import itertools
+import json
+import statistics
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.forms.models import model_to_dict
+
+from core.models import User
+from core.repositories.user_repository import UserRepository
+from core.utils.cache_util import cache
+from core.utils.cache_util_model import CacheModel
+from core.utils.http_response import HttpResponse
+from core.utils.model_serializers import deserialize_instance
+
+Benchmark = Tuple[str, Callable[[], Any]]
+
+
+class InMemoryRedis:
+    """
+    Stand-in for the subset of the redis client used by ResilientCache, so
+    the cache paths can be measured without a Redis server.
+    """
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def ping(self) -> bool:
+        return True
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: Any, ex: Optional[int] = None) -> bool:
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        expires_at = time.monotonic() + ex if ex else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+        return True
+
+    def ttl(self, key: str) -> int:
+        with self._lock:
+            item = self._data.get(key)
+        if item is None:
+            return -2
+        if item[1] is None:
+            return -1
+        return max(0, int(item[1] - time.monotonic()))
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def close(self) -> None:
+        pass
+
+
+@contextlib.contextmanager
+def in_memory_cache() -> Iterator[Any]:
+    """Point the process cache at a fresh InMemoryRedis for the block."""
+    factory = cache.client_factory
+    cache.client_factory = InMemoryRedis
+    cache.reconnect()
+    try:
+        yield cache
+    finally:
+        cache.client_factory = factory
+        cache.reset()
+
+
+@contextlib.contextmanager
+def throwaway_database(verbosity: int) -> Iterator[None]:
+    """Run the block against a freshly migrated test database."""
+    old_name = connection.creation.create_test_db(verbosity=verbosity,
+                                                  autoclobber=True,
+                                                  serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+
+
+def measure(fn: Callable[[], Any], iterations: int,
+            repeat: int) -> Dict[str, float]:
+    """Microseconds per call: the median and the best of ``repeat`` runs."""
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        runs.append((time.perf_counter() - started) / iterations * 1e6)
+    return {"median_us": statistics.median(runs), "min_us": min(runs)}
+
+
+def seed_users(rows: int, prefix: str) -> List[int]:
+    User.objects.bulk_create(
+        User(username=f"{prefix}-{i}",
+             email=f"{prefix}-{i}@example.com",
+             name=f"User {i}",
+             password="x" * 64) for i in range(rows))
+    return list(
+        User.objects.filter(username__startswith=f"{prefix}-").order_by(
+            "id").values_list("id", flat=True))
+
+
+def build_benchmarks(rows: int, calls: int, prefix: str) -> List[Benchmark]:
+    """
+    The benchmarks, over ``rows`` seeded users whose usernames start with
+    ``prefix``. ``calls`` is the number of times each benchmark will run,
+    for those that consume a row per call.
+    """
+    repository = UserRepository()
+    ids = seed_users(rows, prefix)
+    user = User.objects.get(pk=ids[0])
+    user_dict = model_to_dict(user)
+    counter = itertools.count()
+    deletable = iter(seed_users(calls, f"{prefix}-delete"))
+    cache_model = CacheModel(key=f"user:{user.id}", expiration=3600)
+
+    def create():
+        i = next(counter)
+        repository.create_entity(
+            User(username=f"{prefix}-create-{i}",
+                 email=f"{prefix}-create-{i}@example.com",
+                 password="x" * 64))
+
+    repository.find_entity_by_id(user.id, cache_model)
+    cache.set("bench:hit", json.dumps(user_dict), timeout=3600)
+
+    benchmarks: List[Benchmark] = [
+        ("repository.create_entity", create),
+        ("repository.find_entity_by_id",
+         lambda: repository.find_entity_by_id(user.id)),
+        ("repository.find_entity_by_id[cached]",
+         lambda: repository.find_entity_by_id(user.id, cache_model)),
+        ("repository.find_user_by_username",
+         lambda: repository.find_user_by_username(user.username)),
+        ("repository.update_entity",
+         lambda: repository.update_entity(user.id, {"name": "Updated"})),
+        ("repository.delete_entity",
+         lambda: repository.delete_entity(next(deletable))),
+    ]
+    for offset in sorted({0, rows // 10, rows // 2, max(0, rows - 20)}):
+        benchmarks.append(
+            (f"repository.get_entities_with_pagination[skip={offset}]",
+             lambda offset=offset: repository.get_entities_with_pagination(
+                 offset, 20)))
+    benchmarks += [
+        ("serialization.model_to_dict", lambda: model_to_dict(user)),
+        ("serialization.deserialize_instance",
+         lambda: deserialize_instance(User, user_dict)),
+        ("http_response.success",
+         lambda: HttpResponse.success(user_dict, "User retrieved")),
+        ("http_response.error",
+         lambda: HttpResponse.error("User not found", 404)),
+        ("cache.get[hit]", lambda: cache.get("bench:hit")),
+        ("cache.get[miss]", lambda: cache.get("bench:miss")),
+        ("cache.set",
+         lambda: cache.set("bench:set", "value", timeout=60)),
+    ]
+    return benchmarks
+
+
+def compare(current: Dict[str, Dict[str, float]],
+            baseline: Dict[str, Dict[str, float]]) -> List[Dict[str, Any]]:
+    """Median change per benchmark present in both runs, worst first."""
+    rows = []
+    for name in sorted(set(current) & set(baseline)):
+        now = current[name]["median_us"]
+        before = baseline[name]["median_us"]
+        rows.append({
+            "name": name,
+            "current_us": now,
+            "baseline_us": before,
+            "change_pct": (now - before) / before * 100 if before else 0.0,
+        })
+    return sorted(rows, key=lambda row: row["change_pct"], reverse=True)
+
+
+class Command(BaseCommand):
+    """
+    Times the repository CRUD and pagination methods, model serialization,
+    the HttpResponse envelope and the cache hit and miss paths, on a
+    throwaway test database (SQLite with DJANGO_ENV=local) and an in-memory
+    Redis stand-in. Results can be saved and compared with a baseline saved
+    by a previous run on the same machine.
+    """
+
+    help = "Micro-benchmark the repository, cache and serialization layers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--rows",
+                            type=int,
+                            default=1000,
+                            help="Users seeded for the reads and pagination.")
+        parser.add_argument("--filter",
+                            default="",
+                            help="Only run benchmarks containing this text.")
+        parser.add_argument("--save", help="Write the results to this file.")
+        parser.add_argument("--baseline",
+                            help="Compare against saved results.")
+        parser.add_argument(
+            "--fail-over",
+            type=float,
+            help=("Exit with an error when any benchmark's median regresses "
+                  "by more than this percentage of the baseline."))
+        parser.add_argument(
+            "--existing-db",
+            action="store_true",
+            help=("Use the configured database instead of a throwaway "
+                  "test database."))
+
+    def handle(self, *args, **options):
+        """Entrypoint for the command"""
+        iterations, repeat = options["iterations"], options["repeat"]
+        database = (contextlib.nullcontext() if options["existing_db"] else
+                    throwaway_database(verbosity=0))
+        prefix = f"bench-{uuid.uuid4().hex[:8]}"
+        with database, in_memory_cache():
+            try:
+                results = {
+                    name: measure(fn, iterations, repeat)
+                    for name, fn in build_benchmarks(
+                        options["rows"], iterations * repeat, prefix)
+                    if options["filter"] in name
+                }
+            finally:
+                User.objects.filter(username__startswith=prefix).delete()
+
+        if options["save"]:
+            saved = {
+                "iterations": iterations,
+                "repeat": repeat,
+                "rows": options["rows"],
+                "results": results,
+            }
+            with open(options["save"], "w") as results_file:
+                json.dump(saved, results_file, indent=2, sort_keys=True)
+
+        if not options["baseline"]:
+            self.stdout.write(f"{'median us':>12} {'min us':>10}  name")
+            for name, result in results.items():
+                self.stdout.write(f"{result['median_us']:12.1f} "
+                                  f"{result['min_us']:10.1f}  {name}")
+            return
+
+        with open(options["baseline"]) as baseline_file:
+            rows = compare(results, json.load(baseline_file)["results"])
+        self.stdout.write(f"{'median us':>12} {'baseline':>10} "
+                          f"{'change':>8}  name")
+        for row in rows:
+            self.stdout.write(f"{row['current_us']:12.1f} "
+                              f"{row['baseline_us']:10.1f} "
+                              f"{row['change_pct']:+7.1f}%  {row['name']}")
+
+        limit = options["fail_over"]
+        if limit is not None:
+            regressed = [row for row in rows if row["change_pct"] > limit]
+            if regressed:
+                raise CommandError(
+                    "Benchmarks regressed by more than "
+                    f"{limit}%: " + ", ".join(
+                        f"{row['name']} ({row['change_pct']:+.1f}%)"
+                        for row in regressed))
@@ -0,0 +1,160 @@
+"""
+Django command to report Redis memory usage by key prefix
+"""
+
+import heapq
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from django.core.management.base import BaseCommand
+from redis import Redis
+
+from core.utils.cache_util import get_redis_url
+
+
+def key_prefix(key: str) -> str:
+    prefix, separator, _ = key.partition(":")
+    return prefix if separator else "(none)"
+
+
+def scan_keyspace(client,
+                  match: str = "*",
+                  batch: int = 500,
+                  max_keys: Optional[int] = None,
+                  pause: float = 0,
+                  top: int = 10) -> Dict[str, Any]:
+    """
+    Walk the key space with SCAN, ``batch`` keys at a time, and fetch the
+    MEMORY USAGE and TTL of each batch in one pipeline. Stops after
+    ``max_keys`` keys and sleeps ``pause`` seconds between batches so a
+    production Redis is never busy with the scan for long.
+    """
+    prefixes: Dict[str, Dict[str, Any]] = {}
+    largest: List[tuple] = []
+    scanned = 0
+    cursor = 0
+    truncated = False
+    while True:
+        cursor, keys = client.scan(cursor, match=match, count=batch)
+        if max_keys is not None and len(keys) > max_keys - scanned:
+            keys = keys[:max_keys - scanned]
+            truncated = True
+        if keys:
+            pipeline = client.pipeline(transaction=False)
+            for key in keys:
+                pipeline.memory_usage(key)
+                pipeline.ttl(key)
+            results = pipeline.execute()
+            for index, key in enumerate(keys):
+                size, ttl = results[2 * index], results[2 * index + 1]
+                if size is None:
+                    # Expired or deleted since the SCAN.
+                    continue
+                key = key.decode("utf-8", "replace") if isinstance(
+                    key, bytes) else key
+                stats = prefixes.setdefault(key_prefix(key), {
+                    "keys": 0,
+                    "bytes": 0,
+                    "max_bytes": 0,
+                    "without_ttl": 0,
+                    "ttl_total": 0,
+                })
+                stats["keys"] += 1
+                stats["bytes"] += size
+                stats["max_bytes"] = max(stats["max_bytes"], size)
+                if ttl is not None and ttl >= 0:
+                    stats["ttl_total"] += ttl
+                else:
+                    stats["without_ttl"] += 1
+                if top:
+                    entry = (size, key)
+                    if len(largest) < top:
+                        heapq.heappush(largest, entry)
+                    else:
+                        heapq.heappushpop(largest, entry)
+            scanned += len(keys)
+        if not cursor or (max_keys is not None and scanned >= max_keys):
+            break
+        if pause:
+            time.sleep(pause)
+
+    for stats in prefixes.values():
+        with_ttl = stats["keys"] - stats["without_ttl"]
+        stats["avg_bytes"] = stats["bytes"] / stats["keys"]
+        stats["avg_ttl"] = (stats.pop("ttl_total") / with_ttl
+                            if with_ttl else None)
+    return {
+        "scanned": scanned,
+        "complete": not cursor and not truncated,
+        "prefixes": dict(
+            sorted(prefixes.items(), key=lambda item: -item[1]["bytes"])),
+        "largest_keys": [{
+            "key": key,
+            "bytes": size
+        } for size, key in sorted(largest, reverse=True)],
+    }
+
+
+class Command(BaseCommand):
+    """
+    Reports key count, memory and remaining TTL per key prefix (the part
+    of the key before the first ``:``) and the largest keys. SCAN and
+    MEMORY USAGE run in bounded batches, so it is safe against the
+    production Redis, but a large key space takes a while.
+    """
+
+    help = "Report Redis memory usage by key prefix"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--match", default="*")
+        parser.add_argument("--batch",
+                            type=int,
+                            default=500,
+                            help="SCAN COUNT hint and pipeline size.")
+        parser.add_argument("--max-keys",
+                            type=int,
+                            help="Stop after this many keys.")
+        parser.add_argument("--pause-ms",
+                            type=float,
+                            default=10,
+                            help="Sleep between batches.")
+        parser.add_argument("--top",
+                            type=int,
+                            default=10,
+                            help="Number of largest keys to list.")
+        parser.add_argument("--json",
+                            action="store_true",
+                            help="Print the report as JSON.")
+
+    def handle(self, *args, **options):
+        """Entrypoint for the command"""
+        client = Redis.from_url(get_redis_url())
+        try:
+            report = scan_keyspace(client, options["match"], options["batch"],
+                                   options["max_keys"],
+                                   options["pause_ms"] / 1000, options["top"])
+        finally:
+            client.close()
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(f"Scanned {report['scanned']} keys" +
+                          ("" if report["complete"] else " (stopped early)"))
+        self.stdout.write(f"{'prefix':<24}{'keys':>10}{'bytes':>14}"
+                          f"{'avg':>10}{'max':>10}{'no ttl':>8}"
+                          f"{'avg ttl s':>11}")
+        for prefix, stats in report["prefixes"].items():
+            avg_ttl = ("-" if stats["avg_ttl"] is None else
+                       f"{stats['avg_ttl']:.0f}")
+            self.stdout.write(f"{prefix:<24}{stats['keys']:>10}"
+                              f"{stats['bytes']:>14}"
+                              f"{stats['avg_bytes']:>10.0f}"
+                              f"{stats['max_bytes']:>10}"
+                              f"{stats['without_ttl']:>8}{avg_ttl:>11}")
+        if report["largest_keys"]:
+            self.stdout.write("Largest keys:")
+            for entry in report["largest_keys"]:
+                self.stdout.write(f"{entry['bytes']:>10}  {entry['key']}")
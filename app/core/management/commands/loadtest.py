@@ -0,0 +1,271 @@
+"""
+Django command to load test the user endpoints over HTTP
+"""
+
+import asyncio
+import json
+import math
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+ENDPOINTS = ("register", "authenticate", "get_user")
+
+
+class HttpConnection:
+    """Minimal keep-alive HTTP/1.1 client connection on asyncio streams."""
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+        self._reader = self._writer = None
+
+    async def request(self,
+                      method: str,
+                      path: str,
+                      body: Optional[Dict[str, Any]] = None
+                      ) -> Tuple[int, bytes]:
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        head = (f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                "Accept: application/json\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n\r\n").encode("ascii")
+        reused = self._writer is not None
+        try:
+            return await self._exchange(head + payload)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            await self.close()
+            if not reused:
+                raise
+        # The server closed the idle keep-alive connection; retry once.
+        return await self._exchange(head + payload)
+
+    async def _exchange(self, data: bytes) -> Tuple[int, bytes]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(
+                self.host, self.port)
+        self._writer.write(data)
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by the server")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = b""
+            while True:
+                size = int((await self._reader.readline()).split(b";")[0], 16)
+                chunk = await self._reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                body += chunk[:-2]
+        else:
+            body = await self._reader.readexactly(
+                int(headers.get("content-length", 0)))
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, body
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: Dict[str, List[float]], errors: Dict[str, int],
+              elapsed: float) -> Dict[str, Dict[str, float]]:
+    """Per endpoint request rate, error count and latency percentiles (ms)."""
+    summary = {}
+    for endpoint in ENDPOINTS:
+        values = sorted(latencies.get(endpoint, []))
+        if not values and not errors.get(endpoint):
+            continue
+        summary[endpoint] = {
+            "requests": len(values),
+            "errors": errors.get(endpoint, 0),
+            "rps": len(values) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+            "max_ms": (values[-1] if values else 0.0) * 1000,
+        }
+    return summary
+
+
+class LoadTest:
+    """
+    Runs ``concurrency`` virtual users for ``duration`` seconds. Each user
+    repeatedly registers a new account, authenticates with it and then
+    fetches it by id ``reads`` times, each on its own keep-alive
+    connection. Non-2xx responses and connection failures count as errors
+    and are not included in the latencies.
+    """
+
+    def __init__(self,
+                 base_url: str,
+                 concurrency: int,
+                 duration: float,
+                 reads: int = 1,
+                 password: str = "LoadTest123!") -> None:
+        url = urlsplit(base_url)
+        self.host = url.hostname or "127.0.0.1"
+        self.port = url.port or 80
+        self.prefix = url.path.rstrip("/")
+        self.concurrency = concurrency
+        self.duration = duration
+        self.reads = reads
+        self.password = password
+        self.run_id = uuid.uuid4().hex[:8]
+        self.latencies: Dict[str, List[float]] = {e: [] for e in ENDPOINTS}
+        self.errors: Dict[str, int] = {e: 0 for e in ENDPOINTS}
+
+    async def _call(self, connection: HttpConnection, endpoint: str,
+                    method: str, path: str,
+                    body: Optional[Dict[str, Any]] = None
+                    ) -> Optional[Dict[str, Any]]:
+        started = time.perf_counter()
+        try:
+            status, content = await connection.request(
+                method, f"{self.prefix}/api/user/{path}", body)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            await connection.close()
+            self.errors[endpoint] += 1
+            return None
+        if not 200 <= status < 300:
+            self.errors[endpoint] += 1
+            return None
+        self.latencies[endpoint].append(time.perf_counter() - started)
+        try:
+            return json.loads(content)
+        except ValueError:
+            return {}
+
+    async def _user(self, number: int, deadline: float) -> None:
+        connection = HttpConnection(self.host, self.port)
+        iteration = 0
+        try:
+            while time.monotonic() < deadline:
+                username = f"lt-{self.run_id}-{number}-{iteration}"
+                iteration += 1
+                registered = await self._call(
+                    connection, "register", "POST", "register/", {
+                        "username": username,
+                        "password": self.password,
+                        "email": f"{username}@example.com",
+                    })
+                if registered is None:
+                    continue
+                await self._call(connection, "authenticate", "POST",
+                                 "authenticate/", {
+                                     "username": username,
+                                     "password": self.password
+                                 })
+                user_id = (registered.get("data") or {}).get("id")
+                for _ in range(self.reads if user_id else 0):
+                    if time.monotonic() >= deadline:
+                        break
+                    await self._call(connection, "get_user", "GET",
+                                     f"{user_id}/")
+        finally:
+            await connection.close()
+
+    async def run(self) -> Dict[str, Dict[str, float]]:
+        started = time.monotonic()
+        deadline = started + self.duration
+        await asyncio.gather(*(self._user(number, deadline)
+                               for number in range(self.concurrency)))
+        return summarize(self.latencies, self.errors,
+                         time.monotonic() - started)
+
+
+class Command(BaseCommand):
+    """
+    Drives /api/user/register/, /authenticate/ and /<id>/ of a running
+    server and reports requests per second and p50/p95/p99 latency per
+    endpoint. Run the server against the local AWS stand-ins (see the
+    aws_stubs command) to measure the whole stack without AWS.
+    """
+
+    help = "Load test the user endpoints of a running server"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument("--duration",
+                            type=float,
+                            default=30,
+                            help="Seconds to run for.")
+        parser.add_argument("--reads",
+                            type=int,
+                            default=5,
+                            help="GET /<id>/ requests per registered user.")
+        parser.add_argument("--save", help="Write the report to this file.")
+        parser.add_argument(
+            "--max-error-rate",
+            type=float,
+            help=("Exit with an error when more than this fraction of the "
+                  "requests to any endpoint fail."))
+
+    def handle(self, *args, **options):
+        """Entrypoint for the command"""
+        load_test = LoadTest(options["base_url"], options["concurrency"],
+                             options["duration"], options["reads"])
+        summary = asyncio.run(load_test.run())
+
+        if options["save"]:
+            with open(options["save"], "w") as report_file:
+                json.dump(
+                    {
+                        "base_url": options["base_url"],
+                        "concurrency": options["concurrency"],
+                        "duration": options["duration"],
+                        "endpoints": summary,
+                    },
+                    report_file,
+                    indent=2,
+                    sort_keys=True)
+
+        self.stdout.write(f"{'endpoint':<14}{'requests':>9}{'errors':>8}"
+                          f"{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}"
+                          f"{'p99 ms':>9}{'max ms':>9}")
+        for endpoint, row in summary.items():
+            self.stdout.write(f"{endpoint:<14}{row['requests']:>9}"
+                              f"{row['errors']:>8}{row['rps']:>9.1f}"
+                              f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+                              f"{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}")
+
+        limit = options["max_error_rate"]
+        if limit is not None:
+            failing = [
+                endpoint for endpoint, row in summary.items()
+                if row["errors"] > limit * (row["requests"] + row["errors"])
+            ]
+            if failing:
+                raise CommandError("Error rate above "
+                                   f"{limit:.0%} for {', '.join(failing)}")
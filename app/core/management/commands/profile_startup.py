@@ -0,0 +1,179 @@
+"""
+Django command to report where process startup spends its import time
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple, Optional
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Imports the settings, runs every AppConfig.ready and loads the URLconf,
+# which is what a worker does before it can serve its first request.
+STARTUP_CODE = ("import django; django.setup(); "
+                "from django.urls import get_resolver; "
+                "get_resolver().url_patterns")
+
+
+class ImportRecord(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """Parse the stderr produced by ``python -X importtime``."""
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        records.append(
+            ImportRecord(stripped, int(parts[0]), int(parts[1]),
+                         (len(name) - len(stripped) - 1) // 2))
+    return records
+
+
+def aggregate(records: List[ImportRecord], group: str) -> Dict[str, int]:
+    """
+    Aggregate import times in microseconds. ``module`` reports the
+    cumulative time of every module; ``package`` sums the self time of all
+    modules under each top level package, so nested packages are not
+    counted twice.
+    """
+    totals: Dict[str, int] = {}
+    for record in records:
+        if group == "module":
+            totals[record.module] = record.cumulative_us
+        else:
+            package = record.module.split(".")[0]
+            totals[package] = totals.get(package, 0) + record.self_us
+    return totals
+
+
+def median_profile(profiles: List[Dict[str, int]]) -> Dict[str, int]:
+    names = set().union(*profiles)
+    return {
+        name: int(
+            statistics.median(profile.get(name, 0) for profile in profiles))
+        for name in names
+    }
+
+
+def compare(current: Dict[str, int],
+            baseline: Dict[str, int]) -> List[Dict[str, Optional[int]]]:
+    rows = []
+    for name in set(current) | set(baseline):
+        now, before = current.get(name), baseline.get(name)
+        rows.append({
+            "name": name,
+            "current_us": now,
+            "baseline_us": before,
+            "delta_us": (now or 0) - (before or 0),
+        })
+    return sorted(rows, key=lambda row: abs(row["delta_us"]), reverse=True)
+
+
+class Command(BaseCommand):
+    """
+    Runs the app startup in fresh interpreters under ``-X importtime`` and
+    reports aggregated import times, optionally diffed against a baseline
+    saved by a previous run.
+    """
+
+    help = "Report cumulative import times of the app startup"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=3)
+        parser.add_argument("--group",
+                            choices=["package", "module"],
+                            default="package")
+        parser.add_argument("--top", type=int, default=25)
+        parser.add_argument("--save", help="Write the profile to this file.")
+        parser.add_argument("--baseline",
+                            help="Compare against a saved profile.")
+        parser.add_argument(
+            "--fail-over",
+            type=float,
+            help=("Exit with an error when the total import time regresses "
+                  "by more than this percentage of the baseline."))
+
+    def run_once(self) -> str:
+        env = dict(os.environ)
+        env.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP_CODE],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Startup failed:\n{result.stderr[-2000:]}")
+        return result.stderr
+
+    def handle(self, *args, **options):
+        """Entrypoint for the command"""
+        group = options["group"]
+        profiles = []
+        for _ in range(options["runs"]):
+            records = parse_importtime(self.run_once())
+            profiles.append(aggregate(records, group))
+            profiles[-1]["<total>"] = sum(record.self_us
+                                          for record in records)
+        profile = median_profile(profiles)
+
+        if options["save"]:
+            saved = {
+                "group": group,
+                "runs": options["runs"],
+                "entries": profile
+            }
+            with open(options["save"], "w") as profile_file:
+                json.dump(saved, profile_file, indent=2, sort_keys=True)
+
+        baseline = None
+        if options["baseline"]:
+            with open(options["baseline"]) as baseline_file:
+                saved = json.load(baseline_file)
+            if saved.get("group") != group:
+                raise CommandError(
+                    f"Baseline was recorded with --group {saved.get('group')}")
+            baseline = saved["entries"]
+
+        self.report(profile, baseline, options["top"])
+
+        if baseline and options["fail_over"] is not None:
+            before = baseline.get("<total>") or 1
+            increase = (profile["<total>"] - before) / before * 100
+            if increase > options["fail_over"]:
+                raise CommandError(
+                    f"Startup import time regressed by {increase:.1f}% "
+                    f"(limit {options['fail_over']}%)")
+
+    def report(self, profile: Dict[str, int],
+               baseline: Optional[Dict[str, int]], top: int) -> None:
+        if baseline is None:
+            self.stdout.write(f"{'ms':>10}  name")
+            for name, value in sorted(profile.items(),
+                                      key=lambda item: item[1],
+                                      reverse=True)[:top]:
+                self.stdout.write(f"{value / 1000:10.1f}  {name}")
+            return
+
+        self.stdout.write(f"{'ms':>10} {'baseline':>10} {'delta':>10}  name")
+        for row in compare(profile, baseline)[:top]:
+            current = (f"{row['current_us'] / 1000:10.1f}"
+                       if row["current_us"] is not None else f"{'-':>10}")
+            before = (f"{row['baseline_us'] / 1000:10.1f}"
+                      if row["baseline_us"] is not None else f"{'-':>10}")
+            self.stdout.write(f"{current} {before} "
+                              f"{row['delta_us'] / 1000:+10.1f}  "
+                              f"{row['name']}")
@@ -0,0 +1,32 @@
+"""
+Django command to make a signed header value for on-demand profiling
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.utils import profiling
+
+
+class Command(BaseCommand):
+    """
+    Prints an X-Profile header value, signed with PROFILING_SECRET, that
+    has requests profiled by ProfilingMiddleware until it expires. The
+    same header grants access to /admin/profiles::
+
+        curl -H "X-Profile: $(python manage.py profile_token)" ...
+    """
+
+    help = "Print a signed X-Profile header value"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ttl",
+                            type=float,
+                            default=300,
+                            help="Seconds the token stays valid.")
+
+    def handle(self, *args, **options):
+        """Entrypoint for the command"""
+        if not settings.PROFILING_SECRET:
+            raise CommandError("PROFILING_SECRET is not set")
+        self.stdout.write(profiling.sign(options["ttl"]))
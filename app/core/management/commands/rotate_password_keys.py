@@ -0,0 +1,238 @@
+"""
+Django command to re-encrypt stored passwords under the current KMS key
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.models import User
+from core.utils import kms_util
+from core.utils.logger import get_logger
+from core.utils.rate_limiter import TokenBucket
+from core.utils.ssm_util import get_cached_parameter
+
+logger = get_logger(__name__)
+
+KMS_KEY_ID_PARAMETER = "/myapp/kms-key-id"
+
+
+class Command(BaseCommand):
+    """
+    Re-encrypt every User.password under the destination KMS key.
+
+    Users are streamed in primary key order (keyset pagination) so the job
+    never holds more than one batch in memory. Each batch is re-encrypted
+    with KMS ReEncrypt through a bounded thread pool, throttled by a token
+    bucket to stay under the KMS request quota, and written back in one
+    transaction. A row is only written if its password is still the one
+    that was read, so a password reset committed meanwhile is kept. After
+    every batch the last processed primary key is written to the checkpoint
+    file so an interrupted run can resume; users that failed are retried
+    first when it does.
+    """
+
+    help = "Re-encrypt stored passwords under the current KMS key"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--key-id",
+                            help=("Destination KMS key id. Defaults to the "
+                                  f"{KMS_KEY_ID_PARAMETER} parameter."))
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--rate",
+                            type=float,
+                            default=50,
+                            help="Maximum KMS ReEncrypt calls per second.")
+        parser.add_argument("--checkpoint",
+                            default="rotate_password_keys.checkpoint.json")
+        parser.add_argument("--reset",
+                            action="store_true",
+                            help="Ignore an existing checkpoint.")
+
+    def handle(self, *args, **options):
+        """Entrypoint for the command"""
+        key_id = options["key_id"] or get_cached_parameter(
+            KMS_KEY_ID_PARAMETER)
+        if not key_id:
+            raise CommandError("No destination KMS key id available")
+        if options["batch_size"] < 1 or options["workers"] < 1:
+            raise CommandError("--batch-size and --workers must be positive")
+        if options["rate"] <= 0:
+            raise CommandError("--rate must be positive")
+
+        checkpoint_path = options["checkpoint"]
+        checkpoint = self.load_checkpoint(checkpoint_path, key_id,
+                                          options["reset"])
+        if checkpoint["last_id"]:
+            self.stdout.write(
+                self.style.NOTICE(
+                    f"Resuming after user id {checkpoint['last_id']}"))
+
+        self.bucket = TokenBucket(options["rate"])
+        started = time.perf_counter()
+        batch_size = options["batch_size"]
+        with ThreadPoolExecutor(max_workers=options["workers"],
+                                thread_name_prefix="rotate-keys") as executor:
+            retry_ids = checkpoint["failed_ids"]
+            if retry_ids:
+                self.stdout.write(
+                    self.style.NOTICE(
+                        f"Retrying {len(retry_ids)} failed passwords"))
+            while retry_ids:
+                batch = list(
+                    User.objects.filter(pk__in=retry_ids[:batch_size]).only(
+                        "pk", "password"))
+                retry_ids = retry_ids[batch_size:]
+                failed = self.process_batch(executor, batch, key_id,
+                                            checkpoint)
+                checkpoint["failed_ids"] = failed + retry_ids
+                self.save_checkpoint(checkpoint_path, checkpoint)
+
+            while True:
+                batch = list(
+                    User.objects.filter(
+                        pk__gt=checkpoint["last_id"]).order_by("pk").only(
+                            "pk", "password")[:batch_size])
+                if not batch:
+                    break
+
+                failed = self.process_batch(executor, batch, key_id,
+                                            checkpoint)
+                checkpoint["last_id"] = batch[-1].pk
+                checkpoint["failed_ids"].extend(failed)
+                self.save_checkpoint(checkpoint_path, checkpoint)
+                logger.info(
+                    "[RotatePasswordKeys] Batch rotated up to user id %s "
+                    "(%s failed)", checkpoint["last_id"], len(failed))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"Rotated {checkpoint['rotated']} passwords in {elapsed:.2f}s")
+        if checkpoint["changed"]:
+            self.stdout.write(
+                f"{checkpoint['changed']} passwords were changed during the "
+                "rotation and left as written")
+        if checkpoint["failed_ids"]:
+            raise CommandError(
+                f"{len(checkpoint['failed_ids'])} passwords could not be "
+                f"re-encrypted: {checkpoint['failed_ids']}. Run the command "
+                "again to retry them.")
+        self.stdout.write(self.style.SUCCESS("Password key rotation complete"))
+
+    def process_batch(self, executor: ThreadPoolExecutor, batch: List[User],
+                      key_id: str, checkpoint: Dict) -> List[int]:
+        """
+        Rotate and write back a batch, counting the results in
+        ``checkpoint``. Returns the ids that failed.
+        """
+        read = {user.pk: user.password for user in batch}
+        updated, failed = self.rotate_batch(executor, batch, key_id)
+        changed = 0
+        with transaction.atomic():
+            for user in updated:
+                changed += 1 - User.objects.filter(
+                    pk=user.pk, password=read[user.pk]).update(
+                        password=user.password)
+        if changed:
+            logger.warning(
+                "[RotatePasswordKeys] %s passwords changed during rotation "
+                "and were left as written", changed)
+        checkpoint["rotated"] += len(updated) - changed
+        checkpoint["changed"] += changed
+        return failed
+
+    def rotate_batch(self, executor: ThreadPoolExecutor, batch: List[User],
+                     key_id: str):
+        """
+        Re-encrypt a batch of users. Envelope ciphertexts that share a data
+        key only cost one ReEncrypt call for that key.
+        """
+        wrapped_keys: Dict[bytes, Optional[bytes]] = {}
+        legacy: List[User] = []
+        for user in batch:
+            if not user.password:
+                continue
+            if kms_util.is_envelope_ciphertext(user.password):
+                wrapped_key, _, _ = kms_util.unpack_envelope(user.password)
+                wrapped_keys[wrapped_key] = None
+            else:
+                legacy.append(user)
+
+        def reencrypt_key(wrapped_key: bytes) -> Optional[bytes]:
+            self.bucket.acquire()
+            try:
+                return kms_util.reencrypt_blob(wrapped_key, key_id)
+            except Exception:
+                logger.error("[RotatePasswordKeys] Data key re-encryption "
+                             "failed",
+                             exc_info=True)
+                return None
+
+        def reencrypt_legacy(user: User) -> Optional[str]:
+            self.bucket.acquire()
+            try:
+                return kms_util.reencrypt_password(user.password, key_id)
+            except Exception:
+                logger.error(
+                    "[RotatePasswordKeys] Re-encryption failed for user id %s",
+                    user.pk,
+                    exc_info=True)
+                return None
+
+        wrapped_keys = dict(
+            zip(wrapped_keys, executor.map(reencrypt_key, wrapped_keys)))
+        legacy_results = dict(
+            zip((user.pk for user in legacy),
+                executor.map(reencrypt_legacy, legacy)))
+
+        updated, failed = [], []
+        for user in batch:
+            if not user.password:
+                continue
+            if user.pk in legacy_results:
+                password = legacy_results[user.pk]
+            else:
+                wrapped_key, _, _ = kms_util.unpack_envelope(user.password)
+                new_key = wrapped_keys[wrapped_key]
+                password = (kms_util.rewrap_envelope(user.password, new_key)
+                            if new_key else None)
+            if password is None:
+                failed.append(user.pk)
+                continue
+            user.password = password
+            updated.append(user)
+        return updated, failed
+
+    @staticmethod
+    def load_checkpoint(path: str, key_id: str, reset: bool) -> Dict:
+        checkpoint = {
+            "key_id": key_id,
+            "last_id": 0,
+            "rotated": 0,
+            "changed": 0,
+            "failed_ids": []
+        }
+        if reset or not os.path.exists(path):
+            return checkpoint
+        with open(path) as checkpoint_file:
+            saved = json.load(checkpoint_file)
+        if saved.get("key_id") != key_id:
+            logger.warning(
+                "[RotatePasswordKeys] Ignoring checkpoint for key %s",
+                saved.get("key_id"))
+            return checkpoint
+        checkpoint.update(saved)
+        return checkpoint
+
+    @staticmethod
+    def save_checkpoint(path: str, checkpoint: Dict) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+        os.replace(tmp_path, path)
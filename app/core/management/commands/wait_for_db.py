@@ -1,27 +1,94 @@
 """
-Django command to wait for the DB to be available
+Django command to wait for the DB and the other dependencies to be available
 """
 
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-from django.core.management.base import BaseCommand
-from django.db.utils import OperationalError
-from psycopg2 import OperationalError as Psycopg2Error
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.utils.health import probe_database, probe_parameters, probe_redis
 
 
 class Command(BaseCommand):
-    """Django command to wait for the DB to be available"""
+    """
+    Django command to wait for Postgres, Redis and the parameter store.
 
-    def handle(self, *args, **options):
-        """Entrypoint for the command"""
-        self.stdout.write(self.style.NOTICE("Waiting for DB..."))
-        db_up = False
-        while not db_up:
+    The dependencies are probed concurrently. Each probe retries with
+    exponential backoff and full jitter until it succeeds or the overall
+    deadline passes.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--deadline",
+                            type=float,
+                            default=60,
+                            help="Give up after this many seconds.")
+        parser.add_argument("--backoff-base", type=float, default=0.25)
+        parser.add_argument("--backoff-max", type=float, default=5)
+        parser.add_argument("--skip",
+                            action="append",
+                            default=[],
+                            choices=["db", "redis", "parameters"],
+                            help="Do not wait for this dependency.")
+
+    def wait_for(self, name, probe, deadline, base, maximum):
+        attempt = 0
+        while True:
             try:
-                self.check(databases=["default"])
-                db_up = True
-            except (Psycopg2Error, OperationalError):
+                probe()
+                self.stdout.write(self.style.SUCCESS(f"{name} available!"))
+                return True
+            except Exception as error:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stdout.write(
+                        self.style.ERROR(f"{name} unavailable: {error}"))
+                    return False
+                delay = min(remaining,
+                            random.uniform(0, min(maximum, base * 2**attempt)))
                 self.stdout.write(
-                    self.style.WARNING("DB unavailable, waiting 1 second..."))
-                time.sleep(1)
-        self.stdout.write(self.style.SUCCESS("DB available!"))
+                    self.style.WARNING(
+                        f"{name} unavailable, waiting {delay:.2f} seconds..."))
+                attempt += 1
+                time.sleep(delay)
+            finally:
+                # Probes run in worker threads; do not leak their connections.
+                connections.close_all()
+
+    def handle(self, *args, **options):
+        """Entrypoint for the command"""
+        probes = {
+            "db": ("DB", probe_database),
+            "redis": ("Redis", probe_redis),
+            "parameters": ("Parameter store", probe_parameters),
+        }
+        probes = {
+            key: probe
+            for key, probe in probes.items() if key not in options["skip"]
+        }
+        self.stdout.write(
+            self.style.NOTICE("Waiting for " +
+                              ", ".join(name
+                                        for name, _ in probes.values()) +
+                              "..."))
+
+        deadline = time.monotonic() + options["deadline"]
+        with ThreadPoolExecutor(max_workers=len(probes) or 1) as executor:
+            futures = {
+                key: executor.submit(self.wait_for, name, probe, deadline,
+                                     options["backoff_base"],
+                                     options["backoff_max"])
+                for key, (name, probe) in probes.items()
+            }
+            failed = [
+                probes[key][0] for key, future in futures.items()
+                if not future.result()
+            ]
+        if failed:
+            raise CommandError(
+                f"Dependencies unavailable after {options['deadline']}s: "
+                f"{', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS("All dependencies available!"))
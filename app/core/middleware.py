@@ -0,0 +1,207 @@
+import asyncio
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import markcoroutinefunction
+from django.conf import settings
+from opentelemetry import trace
+
+from core.db import query_hooks
+from core.utils import instrumentation, metrics, profiling, tracing
+from core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncCapableMiddleware:
+    """
+    Base of the middleware serving both WSGI and ASGI. As with Django's
+    MiddlewareMixin, when ``get_response`` is a coroutine function the
+    instance is marked as one and ``__call__`` returns the coroutine of
+    ``__acall__``, so under ASGI the async views are not adapted back to
+    sync, one thread per request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+
+class RequestTimingMiddleware(AsyncCapableMiddleware):
+    """
+    Breaks the latency of each request down by dependency (db, redis,
+    cognito, kms, ssm, s3) and reports it as a ``Server-Timing`` header and
+    one structured log line. Does nothing unless REQUEST_TIMING_ENABLED is
+    set. Place it right after ProfilingMiddleware: the total then covers the
+    view and Django's middleware, but not the metrics, tracing and profiling
+    middleware before it.
+    """
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not settings.REQUEST_TIMING_ENABLED:
+            return self.get_response(request)
+
+        token = instrumentation.start_request()
+        started = time.perf_counter()
+        try:
+            with query_hooks.hooks(instrumentation.database_wrapper):
+                response = self.get_response(request)
+        finally:
+            timings = instrumentation.finish_request(token)
+        return self._report(request, response, timings,
+                            time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        if not settings.REQUEST_TIMING_ENABLED:
+            return await self.get_response(request)
+
+        token = instrumentation.start_request()
+        started = time.perf_counter()
+        try:
+            with query_hooks.hooks(instrumentation.database_wrapper):
+                response = await self.get_response(request)
+        finally:
+            timings = instrumentation.finish_request(token)
+        return self._report(request, response, timings,
+                            time.perf_counter() - started)
+
+    def _report(self, request, response, timings, total):
+        response["Server-Timing"] = instrumentation.server_timing(
+            timings, total)
+        logger.info(
+            "[RequestTiming] %s %s %s in %.2fms",
+            request.method,
+            request.path,
+            response.status_code,
+            total * 1000,
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "total_ms": round(total * 1000, 2),
+                "timings": {
+                    name: {
+                        "ms": round(seconds * 1000, 2),
+                        "calls": int(calls)
+                    }
+                    for name, (seconds, calls) in timings.items()
+                },
+            })
+        return response
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+    """
+    Observes request latency per view for the Prometheus endpoint. Requests
+    that match no URL are grouped under ``unmatched`` so unknown paths
+    cannot grow the label set.
+    """
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        return self._observe(request, response, started)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        return self._observe(request, response, started)
+
+    def _observe(self, request, response, started):
+        match = request.resolver_match
+        metrics.observe_request(
+            match.view_name if match else "unmatched", request.method,
+            response.status_code,
+            time.perf_counter() - started)
+        metrics.record_process_stats()
+        return response
+
+
+class TracingMiddleware(AsyncCapableMiddleware):
+    """
+    Runs each request in an OpenTelemetry server span that continues the
+    caller's W3C trace context and, when the trace is sampled, traces the
+    database queries made while serving it. Place it right after
+    MetricsMiddleware.
+    """
+
+    def _use_span(self, span, stack: ExitStack) -> None:
+        stack.enter_context(
+            trace.use_span(span,
+                           end_on_exit=False,
+                           record_exception=True,
+                           set_status_on_exception=True))
+        if span.is_recording():
+            stack.enter_context(query_hooks.hooks(tracing.database_wrapper))
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not tracing.enabled():
+            return self.get_response(request)
+
+        span = tracing.start_server_span(request)
+        with ExitStack() as stack:
+            self._use_span(span, stack)
+            try:
+                response = self.get_response(request)
+            except BaseException:
+                span.end()
+                raise
+        tracing.finish_server_span(span, request, response)
+        return response
+
+    async def __acall__(self, request):
+        if not tracing.enabled():
+            return await self.get_response(request)
+
+        span = tracing.start_server_span(request)
+        with ExitStack() as stack:
+            self._use_span(span, stack)
+            try:
+                response = await self.get_response(request)
+            except BaseException:
+                span.end()
+                raise
+        tracing.finish_server_span(span, request, response)
+        return response
+
+
+class ProfilingMiddleware(AsyncCapableMiddleware):
+    """
+    Runs a request under a stack sampling profiler when it carries a valid
+    signed X-Profile header (see core.utils.profiling.sign) or is selected
+    by the PROFILING_SAMPLE_RATE rule, and keeps the profile for download
+    from /admin/profiles. Other requests cost a header lookup, plus a
+    random draw when sampling is on. Place it right after TracingMiddleware.
+    """
+
+    @staticmethod
+    def _selected(request) -> bool:
+        if not settings.PROFILING_ENABLED:
+            return False
+        token = request.headers.get(profiling.PROFILE_HEADER)
+        return ((token is not None and profiling.verify(token))
+                or profiling.sampled(request.path))
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if self._selected(request):
+            return profiling.profile_request(request, self.get_response)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if self._selected(request):
+            return await profiling.aprofile_request(request,
+                                                    self.get_response)
+        return await self.get_response(request)
@@ -5,9 +5,10 @@ from django.db import models
 class User(models.Model):
     """User object"""
 
+    username = models.CharField(max_length=255, unique=True)
     email = models.EmailField(max_length=255, unique=True)
     name = models.CharField(max_length=255)
-    password = models.CharField(max_length=255)
+    password = models.CharField(max_length=512)
     is_active = models.BooleanField(default=True)
 
     def __str__(self):
@@ -0,0 +1,221 @@
+import json
+from typing import Any, Dict, List, Optional, Type, TypeVar
+
+from django.forms.models import model_to_dict
+
+from core.repositories.repository_methods import IRepository
+from core.utils.async_executor import run_blocking
+from core.utils.cache_util import get_async_cache
+from core.utils.cache_util_model import CacheModel
+from core.utils.instrumentation import timed
+from core.utils.logger import get_logger
+from core.utils.metrics import observe_async_repository, record_cache
+from core.utils.model_serializers import deserialize_instance
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncGenericRepository(IRepository[T]):
+    """
+    The async counterpart of GenericRepository. Queries run on the
+    dedicated blocking executor (Django 3.2 has no async ORM) and the cache
+    is the async Redis client, holding the same keys and JSON as the
+    synchronous repositories so both can serve the same entries. When Redis
+    is unavailable reads miss and writes are dropped.
+    """
+
+    def __init__(self, model: Type[T]) -> None:
+        self.model = model
+
+    async def _cache_get(self, key: str) -> Optional[str]:
+        cache = await get_async_cache()
+        if cache is None:
+            record_cache("get", key, "unavailable")
+            return None
+        try:
+            with timed("redis", "GET"):
+                value = await cache.get(key)
+        except Exception:
+            record_cache("get", key, "error")
+            return None
+        record_cache("get", key, "miss" if value is None else "hit")
+        return value
+
+    async def _cache_set(self, cache_model: CacheModel, data: Any) -> None:
+        cache = await get_async_cache()
+        if cache is None:
+            record_cache("set", cache_model.key, "unavailable")
+            return
+        try:
+            with timed("redis", "SET"):
+                await cache.set(cache_model.key, json.dumps(data),
+                                cache_model.expiration)
+            record_cache("set", cache_model.key, "ok")
+        except Exception:
+            record_cache("set", cache_model.key, "error")
+
+    async def _cache_delete(self, key: str) -> None:
+        cache = await get_async_cache()
+        if cache is None:
+            record_cache("delete", key, "unavailable")
+            return
+        try:
+            with timed("redis", "DEL"):
+                await cache.delete(key)
+            record_cache("delete", key, "ok")
+        except Exception:
+            record_cache("delete", key, "error")
+
+    async def _first(self, **filters) -> Optional[T]:
+        return await run_blocking(
+            lambda: self.model.objects.filter(**filters).first())
+
+    @observe_async_repository
+    async def create_entity(
+            self,
+            entity: T,
+            cache_model: Optional[CacheModel] = None) -> Optional[T]:
+        try:
+            await run_blocking(entity.save)
+            if cache_model:
+                await self._cache_set(cache_model, model_to_dict(entity))
+            return entity
+        except Exception as error:
+            logger.error("[AsyncGenericRepository] Error creating entity: %s",
+                         error,
+                         exc_info=True)
+            return None
+
+    @observe_async_repository
+    async def find_entity_by_id(
+            self,
+            id: int,
+            cache_model: Optional[CacheModel] = None) -> Optional[T]:
+        try:
+            if cache_model:
+                cached = await self._cache_get(cache_model.key)
+                if cached:
+                    data = json.loads(cached)
+                    return deserialize_instance(self.model, data)
+            entity = await self._first(pk=id)
+            if not entity:
+                logger.info(
+                    "[AsyncGenericRepository] Entity with id %s not found", id)
+                raise Exception("Entity not found")
+            if cache_model:
+                await self._cache_set(cache_model, model_to_dict(entity))
+            return entity
+        except Exception as error:
+            logger.error("[AsyncGenericRepository] Error finding entity: %s",
+                         error,
+                         exc_info=True)
+            return None
+
+    @observe_async_repository
+    async def update_entity(
+        self,
+        id: int,
+        updated_data: Dict[str, Any],
+        cache_model: Optional[CacheModel] = None,
+    ) -> Optional[T]:
+        try:
+            updated = await run_blocking(
+                self.model.objects.filter(pk=id).update, **updated_data)
+            if not updated:
+                logger.error(
+                    "[AsyncGenericRepository] Entity with id %s not found "
+                    "for update", id)
+                raise Exception(f"Entity with id {id} not found")
+            updated_entity = await self._first(pk=id)
+            if not updated_entity:
+                logger.error(
+                    "[AsyncGenericRepository] Updated entity with id %s not "
+                    "found", id)
+                raise Exception(f"Entity with id {id} not found")
+            if cache_model:
+                await self._cache_set(cache_model,
+                                      model_to_dict(updated_entity))
+            return updated_entity
+        except Exception as error:
+            logger.error("[AsyncGenericRepository] Error updating entity: %s",
+                         error,
+                         exc_info=True)
+            return None
+
+    @observe_async_repository
+    async def delete_entity(self,
+                            id: int,
+                            cache_model: Optional[CacheModel] = None) -> bool:
+        try:
+            result = await run_blocking(
+                lambda: self.model.objects.filter(pk=id).delete())
+            if result[0] == 0:
+                logger.error(
+                    "[AsyncGenericRepository] Failed to delete entity with "
+                    "id %s", id)
+                raise Exception(f"Entity with id {id} not found")
+            if cache_model:
+                await self._cache_delete(cache_model.key)
+            return True
+        except Exception as error:
+            logger.error("[AsyncGenericRepository] Error deleting entity: %s",
+                         error,
+                         exc_info=True)
+            return False
+
+    @observe_async_repository
+    async def get_all_entities(self,
+                               cache_model: Optional[CacheModel] = None
+                               ) -> List[T]:
+        try:
+            if cache_model:
+                cached = await self._cache_get(cache_model.key)
+                if cached:
+                    return [
+                        deserialize_instance(self.model, data)
+                        for data in json.loads(cached)
+                    ]
+            entities = await run_blocking(
+                lambda: list(self.model.objects.all()))
+            if cache_model:
+                await self._cache_set(cache_model,
+                                      [model_to_dict(e) for e in entities])
+            return entities
+        except Exception as error:
+            logger.error(
+                "[AsyncGenericRepository] Error retrieving all entities: %s",
+                error,
+                exc_info=True,
+            )
+            return []
+
+    @observe_async_repository
+    async def get_entities_with_pagination(
+            self,
+            skip: int,
+            take: int,
+            cache_model: Optional[CacheModel] = None) -> Dict[str, Any]:
+        try:
+            if cache_model:
+                cached = await self._cache_get(cache_model.key)
+                if cached:
+                    return json.loads(cached)
+
+            def page():
+                qs = self.model.objects.all()
+                return qs.count(), list(qs[skip:skip + take])
+
+            count, data = await run_blocking(page)
+            if cache_model:
+                await self._cache_set(cache_model, {
+                    "data": [model_to_dict(e) for e in data],
+                    "count": count
+                })
+            return {"data": data, "count": count}
+        except Exception as error:
+            logger.error("[AsyncGenericRepository] Error in pagination: %s",
+                         error,
+                         exc_info=True)
+            return {"data": [], "count": 0}
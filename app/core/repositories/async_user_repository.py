@@ -0,0 +1,47 @@
+import json
+from typing import Optional
+
+from django.forms.models import model_to_dict
+
+from core.models import User
+from core.repositories.async_generic_repositories import \
+    AsyncGenericRepository
+from core.utils.cache_util_model import CacheModel
+from core.utils.logger import get_logger
+from core.utils.metrics import observe_async_repository
+from core.utils.model_serializers import deserialize_instance
+
+logger = get_logger(__name__)
+
+
+class AsyncUserRepository(AsyncGenericRepository[User]):
+
+    def __init__(self) -> None:
+        super().__init__(User)
+
+    @observe_async_repository
+    async def find_user_by_username(
+            self,
+            username: str,
+            cache_model: Optional[CacheModel] = None) -> Optional[User]:
+        try:
+            if cache_model:
+                cache_entity = await self._cache_get(cache_model.key)
+                if cache_entity:
+                    data = json.loads(cache_entity)
+                    return deserialize_instance(self.model, data)
+            user = await self._first(username=username)
+            if not user:
+                logger.warning(
+                    "[AsyncUserRepository] No user found with username: %s",
+                    username)
+                raise Exception(f"User with username {username} not found")
+            if cache_model:
+                await self._cache_set(cache_model, model_to_dict(user))
+            return user
+        except Exception:
+            logger.error(
+                "[AsyncUserRepository] Error finding user by username:",
+                exc_info=True,
+            )
+            return None
@@ -7,6 +7,7 @@ from django.forms.models import model_to_dict
 from core.utils.cache_util import cache
 from core.utils.cache_util_model import CacheModel
 from core.utils.logger import get_logger
+from core.utils.metrics import observe_repository
 from core.utils.model_serializers import deserialize_instance
 
 logger = get_logger(__name__)
@@ -23,6 +24,7 @@ class GenericRepository(ABC):
     def __init__(self, model: Type[T]) -> None:
         self.model = model
 
+    @observe_repository
     def create_entity(self,
                       entity: T,
                       cache_model: Optional[CacheModel] = None) -> Optional[T]:
@@ -40,6 +42,7 @@ class GenericRepository(ABC):
                          exc_info=True)
             return None
 
+    @observe_repository
     def find_entity_by_id(
             self,
             id: int,
@@ -67,6 +70,7 @@ class GenericRepository(ABC):
                          exc_info=True)
             return None
 
+    @observe_repository
     def update_entity(
         self,
         id: int,
@@ -98,6 +102,7 @@ class GenericRepository(ABC):
                          exc_info=True)
             return None
 
+    @observe_repository
     def delete_entity(self,
                       id: int,
                       cache_model: Optional[CacheModel] = None) -> bool:
@@ -117,6 +122,7 @@ class GenericRepository(ABC):
                          exc_info=True)
             return False
 
+    @observe_repository
     def get_all_entities(self,
                          cache_model: Optional[CacheModel] = None) -> List[T]:
         try:
@@ -145,6 +151,7 @@ class GenericRepository(ABC):
             )
             return []
 
+    @observe_repository
     def get_entities_with_pagination(
             self,
             skip: int,
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Generic, List, Optional, TypeVar, Union
 
-from utils.cache_util_model import CacheModel
+from core.utils.cache_util_model import CacheModel
 
 # Declare a generic type variable
 T = TypeVar("T")
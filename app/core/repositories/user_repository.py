@@ -8,6 +8,7 @@ from core.repositories.generic_repositories import GenericRepository
 from core.utils.cache_util import cache
 from core.utils.cache_util_model import CacheModel
 from core.utils.logger import get_logger
+from core.utils.metrics import observe_repository
 from core.utils.model_serializers import deserialize_instance
 
 logger = get_logger(__name__)
@@ -18,6 +19,7 @@ class UserRepository(GenericRepository):
     def __init__(self) -> None:
         super().__init__(User)
 
+    @observe_repository
     def find_user_by_username(
             self,
             username: str,
@@ -31,8 +33,8 @@ class UserRepository(GenericRepository):
             user = self.model.objects.filter(username=username).first()
             if not user:
                 logger.warning(
-                    f"[UserRepository] No user found with username: {username}"
-                )
+                    "[UserRepository] No user found with username: %s",
+                    username)
                 raise Exception(f"User with username {username} not found")
             if cache_model:
                 data = json.dumps(model_to_dict(user))
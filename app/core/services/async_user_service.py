@@ -0,0 +1,78 @@
+from typing import Any, Dict, Optional
+
+from core.models import User
+from core.repositories.async_user_repository import AsyncUserRepository
+from core.services.request_coalescing import AsyncRequestCoalescer
+from core.services.user_service import UserService
+from core.utils.async_executor import run_blocking
+from core.utils.cache_util_model import CacheModel
+from core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncUserService:
+    """
+    UserService for async views. Reads and updates go through the
+    AsyncUserRepository; the flows that call the identity provider and KMS
+    run the synchronous UserService on the blocking executor, as boto3 has
+    no async client.
+    """
+
+    user_repository: AsyncUserRepository = AsyncUserRepository()
+    find_by_id_coalescer = AsyncRequestCoalescer("find_by_id")
+    find_by_username_coalescer = AsyncRequestCoalescer("find_user_by_username")
+
+    def __init__(self, user_service: UserService) -> None:
+        self.user_service = user_service
+
+    async def save(self, entity: Dict[str, Any]) -> Optional[User]:
+        return await run_blocking(self.user_service.save, entity)
+
+    async def confirm_registration(self, username: str,
+                                   confirmation_code: str) -> Dict[str, Any]:
+        return await run_blocking(self.user_service.confirm_registration,
+                                  username, confirmation_code)
+
+    async def authenticate(self, username: str,
+                           password: str) -> Dict[str, str]:
+        return await run_blocking(self.user_service.authenticate, username,
+                                  password)
+
+    async def initiate_password_reset(self, username: str) -> Dict[str, Any]:
+        return await run_blocking(self.user_service.initiate_password_reset,
+                                  username)
+
+    async def complete_password_reset(self, username: str, new_password: str,
+                                      confirmation_code: str
+                                      ) -> Dict[str, Any]:
+        return await run_blocking(self.user_service.complete_password_reset,
+                                  username, new_password, confirmation_code)
+
+    async def find_by_id(self,
+                         id: int,
+                         cache_model: Optional[CacheModel] = None
+                         ) -> Optional[User]:
+        logger.info("[AsyncUserService] Finding user by ID: %s", id)
+        return await AsyncUserService.find_by_id_coalescer.call(
+            (id, cache_model.key if cache_model else None),
+            lambda: AsyncUserService.user_repository.find_entity_by_id(
+                id, cache_model))
+
+    async def find_user_by_username(
+            self,
+            username: str,
+            cache_model: Optional[CacheModel] = None) -> Optional[User]:
+        return await AsyncUserService.find_by_username_coalescer.call(
+            (username, cache_model.key if cache_model else None),
+            lambda: AsyncUserService.user_repository.find_user_by_username(
+                username, cache_model))
+
+    async def update(self,
+                     id: int,
+                     updated_data: Dict[str, Any],
+                     cache_model: Optional[CacheModel] = None
+                     ) -> Optional[User]:
+        logger.info("[AsyncUserService] Updating user with ID: %s", id)
+        return await AsyncUserService.user_repository.update_entity(
+            id, updated_data, cache_model)
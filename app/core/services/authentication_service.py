@@ -1,50 +1,74 @@
+from typing import Optional
+
+from core.services.identity_provider_methods import IIdentityProvider
 from core.utils.cache_util import cache
-from core.utils.cognito_util import authenticate as cognito_authenticate
-from core.utils.cognito_util import \
-    confirm_user_registration as cognito_confirm_user_registration
-from core.utils.cognito_util import register_user as cognito_register_user
+from core.utils.identity_providers import get_identity_provider
 from core.utils.logger import get_logger
+from core.utils.tracing import traced
 
 logger = get_logger(__name__)
 
 
 class AuthenticationService:
 
+    def __init__(self,
+                 identity_provider: Optional[IIdentityProvider] = None
+                 ) -> None:
+        self.identity_provider = identity_provider or get_identity_provider()
+
+    @traced
     def register_user(self, username: str, password: str, email: str) -> None:
-        cognito_user_created = False
+        """
+        Register the user with the identity provider. Undoing it when a later
+        registration step fails is left to RegistrationPipeline, which calls
+        rollback_user_registration.
+        """
         try:
-            logger.info(("[AuthenticationService] Registering user in "
-                         f"Cognito: {username}"))
-            cognito_register_user(username, password, email)
-            cognito_user_created = True
-            logger.info(("[AuthenticationService] User registered in "
-                         f"Cognito: {username}"))
-        except Exception:
-            if cognito_user_created:
-                logger.info(("[UserService] Rolling back Cognito user: "
-                             f"{username}"))
-                cache.delete(username)
-                logger.info(("[UserService] Cognito user rolled back: "
-                             f"{username}"))
-            logger.info(f"[UserService] Removing cache for user: {username}")
+            logger.info(
+                "[AuthenticationService] Registering user in Cognito: %s",
+                username)
+            self.identity_provider.register_user(username, password, email)
+            logger.info(
+                "[AuthenticationService] User registered in Cognito: %s",
+                username)
+        except Exception as error:
+            logger.info("[UserService] Removing cache for user: %s", username)
             cache.delete(f"user:{username}")
-            logger.info(f"[UserService] Cache removed for user: {username}")
+            logger.info("[UserService] Cache removed for user: %s", username)
+            raise Exception("Registration failed") from error
+
+    @traced
+    def rollback_user_registration(self, username: str) -> None:
+        """
+        Undo a registration: delete the user from the identity provider and
+        drop any cached copy of it.
+        """
+        logger.info("[AuthenticationService] Rolling back Cognito user: %s",
+                    username)
+        self.identity_provider.delete_user(username)
+        cache.delete(f"user:{username}")
+        logger.info("[AuthenticationService] Cognito user rolled back: %s",
+                    username)
 
+    @traced
     def authenticate_user(self, username: str, password: str) -> str:
-        logger.info(("[AuthenticationService] Authenticating user: "
-                     f"{username}"))
-        token = cognito_authenticate(username, password)
+        logger.info("[AuthenticationService] Authenticating user: %s",
+                    username)
+        token = self.identity_provider.authenticate(username, password)
         if not token:
-            logger.error(("[AuthenticationService] Failed to retrieve token "
-                          f"for user: {username}"))
+            logger.error(
+                "[AuthenticationService] Failed to retrieve token for user: "
+                "%s", username)
             raise Exception("Authentication failed")
         return token
 
+    @traced
     def confirm_user_registration(self, username: str,
                                   confirmation_code: str) -> None:
         logger.info(
-            ("[AuthenticationService] Confirming registration for user: "
-             f"{username}"))
-        cognito_confirm_user_registration(username, confirmation_code)
-        logger.info(("[AuthenticationService] User registration confirmed: "
-                     f"{username}"))
+            "[AuthenticationService] Confirming registration for user: %s",
+            username)
+        self.identity_provider.confirm_user_registration(
+            username, confirmation_code)
+        logger.info("[AuthenticationService] User registration confirmed: %s",
+                    username)
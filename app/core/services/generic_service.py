@@ -17,13 +17,13 @@ class GenericService(ICRUD[T], Generic[T]):
     def save(self,
              entity: T,
              cache_model: Optional[CacheModel] = None) -> Optional[T]:
-        logger.info(f"[GenericService] Saving entity: {entity}")
+        logger.info("[GenericService] Saving entity: %s", entity)
         return self.generic_repository.create_entity(entity, cache_model)
 
     def find_by_id(self,
                    id: int,
                    cache_model: Optional[CacheModel] = None) -> Optional[T]:
-        logger.info(f"[GenericService] Finding entity by ID: {id}")
+        logger.info("[GenericService] Finding entity by ID: %s", id)
         return self.generic_repository.find_entity_by_id(id, cache_model)
 
     def update(
@@ -33,15 +33,15 @@ class GenericService(ICRUD[T], Generic[T]):
         cache_model: Optional[CacheModel] = None,
     ) -> Optional[T]:
         logger.info(
-            f"[GenericService] Updating entity with ID: {id} with data: "
-            f"{updated_data}")
+            "[GenericService] Updating entity with ID: %s with data: %s", id,
+            updated_data)
         return self.generic_repository.update_entity(id, updated_data,
                                                      cache_model)
 
     def delete(self,
                id: int,
                cache_model: Optional[CacheModel] = None) -> bool:
-        logger.info(f"[GenericService] Deleting entity with ID: {id}")
+        logger.info("[GenericService] Deleting entity with ID: %s", id)
         return self.generic_repository.delete_entity(id, cache_model)
 
     def find_all(self, cache_model: Optional[CacheModel] = None) -> List[T]:
@@ -54,7 +54,7 @@ class GenericService(ICRUD[T], Generic[T]):
             take: int,
             cache_model: Optional[CacheModel] = None) -> Dict[str, Any]:
         logger.info(
-            f"[GenericService] Finding entities with pagination: skip={skip}, "
-            f"take={take}")
+            "[GenericService] Finding entities with pagination: skip=%s, "
+            "take=%s", skip, take)
         return self.generic_repository.get_entities_with_pagination(
             skip, take, cache_model)
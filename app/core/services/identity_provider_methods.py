@@ -0,0 +1,69 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+
+class IIdentityProvider(ABC):
+
+    @abstractmethod
+    def register_user(self, username: str, password: str,
+                      email: str) -> Dict[str, Any]:
+        """
+        Register a new user with the identity provider.
+
+        :param username: The username of the new user.
+        :param password: The plaintext password of the new user.
+        :param email: The email address of the new user.
+        :return: A dictionary describing the result.
+        """
+
+    @abstractmethod
+    def confirm_user_registration(self, username: str,
+                                  confirmation_code: str) -> Dict[str, Any]:
+        """
+        Confirm a user's registration.
+
+        :param username: The username to confirm.
+        :param confirmation_code: The code sent to the user.
+        :return: A dictionary describing the result.
+        """
+
+    @abstractmethod
+    def authenticate(self, username: str, password: str) -> str:
+        """
+        Authenticate a user.
+
+        :param username: The username of the user.
+        :param password: The plaintext password of the user.
+        :return: The identity token issued for the user.
+        """
+
+    @abstractmethod
+    def initiate_password_reset(self, username: str) -> Dict[str, Any]:
+        """
+        Start the forgot password flow for a user.
+
+        :param username: The username of the user.
+        :return: A dictionary describing the result.
+        """
+
+    @abstractmethod
+    def complete_password_reset(self, username: str, new_password: str,
+                                confirmation_code: str) -> Dict[str, Any]:
+        """
+        Complete the forgot password flow for a user.
+
+        :param username: The username of the user.
+        :param new_password: The new plaintext password.
+        :param confirmation_code: The code sent to the user.
+        :return: A dictionary describing the result.
+        """
+
+    @abstractmethod
+    def delete_user(self, username: str) -> Dict[str, Any]:
+        """
+        Delete a user. Used to compensate a registration that could not be
+        completed.
+
+        :param username: The username of the user.
+        :return: A dictionary describing the result.
+        """
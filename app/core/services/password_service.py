@@ -1,14 +1,23 @@
-from core.utils.cognito_util import (complete_password_reset,
-                                     initiate_password_reset)
+from typing import Optional
+
+from core.services.identity_provider_methods import IIdentityProvider
+from core.utils.identity_providers import get_identity_provider
 from core.utils.kms_util import encrypt_password
 from core.utils.logger import get_logger
 from core.utils.ssm_util import get_cached_parameter
+from core.utils.tracing import traced
 
 logger = get_logger(__name__)
 
 
 class PasswordService:
 
+    def __init__(self,
+                 identity_provider: Optional[IIdentityProvider] = None
+                 ) -> None:
+        self.identity_provider = identity_provider or get_identity_provider()
+
+    @traced
     def get_password_encrypted(self, new_password: str) -> str:
         """
         Encrypt the given password using KMS and return the encrypted string.
@@ -21,23 +30,27 @@ class PasswordService:
             logger.error(msg, exc_info=True)
             raise Exception("Failed to encrypt password") from error
 
+    @traced
     def initiate_user_password_reset(self, username: str) -> None:
         """
-        Initiate a password reset for the given username using Cognito.
+        Initiate a password reset for the given username using the identity
+        provider.
         """
         try:
-            logger.info(("[PasswordService] Initiate user password reset in "
-                         f"Cognito: {username}"))
-            initiate_password_reset(username)
             logger.info(
-                ("[PasswordService] Password reset initiated for user: "
-                 f"{username}"))
+                "[PasswordService] Initiate user password reset in Cognito: "
+                "%s", username)
+            self.identity_provider.initiate_password_reset(username)
+            logger.info(
+                "[PasswordService] Password reset initiated for user: %s",
+                username)
         except Exception as error:
             msg = ("[PasswordService] Failed to initiate "
                    f"password reset for user: {username}")
             logger.error(msg, exc_info=True)
             raise Exception("Failed to initiate password reset") from error
 
+    @traced
     def complete_user_password_reset(self, username: str,
                                      confirmation_code: str,
                                      new_password: str) -> None:
@@ -46,11 +59,13 @@ class PasswordService:
         """
         try:
             logger.info(
-                ("[AuthenticationService] Completing password reset for "
-                 f"user: {username}"))
-            complete_password_reset(username, confirmation_code, new_password)
-            logger.info(("[AuthenticationService] Password reset "
-                         f"completed for user: {username}"))
+                "[AuthenticationService] Completing password reset for user: "
+                "%s", username)
+            self.identity_provider.complete_password_reset(
+                username, confirmation_code, new_password)
+            logger.info(
+                "[AuthenticationService] Password reset completed for user: "
+                "%s", username)
         except Exception as error:
             msg = ("[AuthenticationService] Failed to complete "
                    f"password reset for user: {username}")
@@ -0,0 +1,149 @@
+import contextvars
+import time
+from concurrent.futures import (FIRST_EXCEPTION, Future, ThreadPoolExecutor,
+                                wait)
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class RegistrationStep:
+    """
+    A remote step that can run concurrently with the other steps.
+    ``compensate`` receives the step result and undoes its side effects.
+    """
+    name: str
+    action: Callable[[], Any]
+    compensate: Optional[Callable[[Any], None]] = None
+
+
+@dataclass
+class PipelineReport:
+    durations: Dict[str, float] = field(default_factory=dict)
+    compensations: List[Dict[str, Any]] = field(default_factory=list)
+    failed_step: Optional[str] = None
+
+
+class RegistrationPipelineError(Exception):
+
+    def __init__(self, message: str, report: PipelineReport) -> None:
+        super().__init__(message)
+        self.report = report
+
+
+class RegistrationPipeline:
+    """
+    Runs the independent remote steps of a registration concurrently under a
+    shared deadline, then the step that depends on their results. When any
+    step fails or the deadline passes, the compensations of the steps that
+    succeeded are run and recorded on the report. Steps still running at the
+    deadline are compensated as soon as they finish.
+    """
+
+    def __init__(self, max_workers: int = 8, deadline: float = 10.0) -> None:
+        self.deadline = deadline
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="registration")
+
+    def _timed(self, step: RegistrationStep, report: PipelineReport) -> Any:
+        start = time.perf_counter()
+        try:
+            return step.action()
+        finally:
+            report.durations[step.name] = time.perf_counter() - start
+
+    def _compensate(self, step: RegistrationStep, result: Any,
+                    report: PipelineReport, deferred: bool = False) -> None:
+        record = {"step": step.name, "deferred": deferred}
+        try:
+            step.compensate(result)
+            record["status"] = "succeeded"
+        except Exception as error:
+            record["status"] = "failed"
+            record["error"] = str(error)
+            logger.error("[RegistrationPipeline] Compensation failed for "
+                         "step %s",
+                         step.name,
+                         exc_info=True)
+        report.compensations.append(record)
+        logger.warning("[RegistrationPipeline] Compensation recorded",
+                       extra={"compensation": record})
+
+    def _compensate_when_done(self, step: RegistrationStep, future: Future,
+                              report: PipelineReport) -> None:
+
+        def callback(done: Future) -> None:
+            if done.exception() is None:
+                self._compensate(step, done.result(), report, deferred=True)
+
+        future.add_done_callback(callback)
+
+    def _rollback(self, futures: Dict[Future, RegistrationStep],
+                  report: PipelineReport) -> None:
+        for future, step in futures.items():
+            if step.compensate is None:
+                continue
+            if not future.done():
+                self._compensate_when_done(step, future, report)
+            elif future.exception() is None:
+                self._compensate(step, future.result(), report)
+
+    def run(self, steps: List[RegistrationStep],
+            finalize: Callable[[Dict[str, Any]], Any]) -> Any:
+        """
+        Run ``steps`` concurrently and pass their results, keyed by step
+        name, to ``finalize``. Returns the result of ``finalize``.
+
+        :raises RegistrationPipelineError: If any step fails or times out.
+        """
+        report = PipelineReport()
+        started = time.perf_counter()
+        futures = {
+            # Run in a copy of the request context so the steps' calls are
+            # counted in the request's timings.
+            self.executor.submit(contextvars.copy_context().run, self._timed,
+                                 step, report): step
+            for step in steps
+        }
+        done, pending = wait(futures,
+                             timeout=self.deadline,
+                             return_when=FIRST_EXCEPTION)
+
+        failed = [future for future in done if future.exception()]
+        if failed or pending:
+            if failed:
+                report.failed_step = futures[failed[0]].name
+                cause = failed[0].exception()
+                message = f"Registration step {report.failed_step} failed"
+            else:
+                report.failed_step = futures[next(iter(pending))].name
+                cause = None
+                message = (f"Registration step {report.failed_step} "
+                           f"exceeded the {self.deadline}s deadline")
+            logger.error("[RegistrationPipeline] %s", message)
+            self._rollback(futures, report)
+            raise RegistrationPipelineError(message, report) from cause
+
+        results = {
+            step.name: future.result()
+            for future, step in futures.items()
+        }
+        try:
+            start = time.perf_counter()
+            result = finalize(results)
+            report.durations["finalize"] = time.perf_counter() - start
+        except Exception as error:
+            report.failed_step = "finalize"
+            logger.error("[RegistrationPipeline] Finalize step failed")
+            self._rollback(futures, report)
+            raise RegistrationPipelineError("Registration finalize failed",
+                                            report) from error
+
+        report.durations["total"] = time.perf_counter() - started
+        logger.info("[RegistrationPipeline] Registration completed",
+                    extra={"durations": report.durations})
+        return result
@@ -0,0 +1,91 @@
+import asyncio
+import copy
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from django.conf import settings
+
+from core.db import routers
+from core.utils.metrics import record_coalescing
+
+
+def _bypass() -> bool:
+    """
+    Whether the caller must run its own call: coalescing is off, or the
+    caller reads from the primary after a write and must not be handed a
+    result read from a replica.
+    """
+    return (not settings.REQUEST_COALESCING_ENABLED
+            or routers.pinned_to_primary() or routers.wrote_to_primary())
+
+
+class RequestCoalescer:
+    """
+    Lets concurrent identical reads share one call. The first caller for a
+    key (the leader) runs the call; callers arriving while it is in flight
+    (followers) wait for its outcome instead of running their own. Nothing
+    is cached: the next call after the leader finishes runs again.
+
+    Followers receive a shallow copy of the leader's result, so one caller
+    changing a returned model instance does not change another's. Callers
+    pinned to the primary (see core.db.routers) neither lead nor follow,
+    which keeps reads after a write consistent.
+    """
+
+    def __init__(self, operation: str) -> None:
+        self.operation = operation
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def call(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        if _bypass():
+            return fn()
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+        record_coalescing(self.operation, "leader" if leader else "follower")
+        if not leader:
+            return copy.copy(future.result())
+
+        try:
+            result = fn()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+
+class AsyncRequestCoalescer:
+    """
+    RequestCoalescer for coroutines, keyed per event loop. Followers await
+    the leader's task through ``asyncio.shield`` so a follower being
+    cancelled does not cancel the call for everyone else.
+    """
+
+    def __init__(self, operation: str) -> None:
+        self.operation = operation
+        self._in_flight: "weakref.WeakKeyDictionary[Any, Dict]" = (
+            weakref.WeakKeyDictionary())
+
+    async def call(self, key: Hashable,
+                   fn: Callable[[], Awaitable[Any]]) -> Any:
+        if _bypass():
+            return await fn()
+        in_flight = self._in_flight.setdefault(asyncio.get_running_loop(), {})
+        task = in_flight.get(key)
+        leader = task is None
+        if leader:
+            task = in_flight[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda _: in_flight.pop(key, None))
+        record_coalescing(self.operation, "leader" if leader else "follower")
+        result = await asyncio.shield(task)
+        return result if leader else copy.copy(result)
@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 
+from django.conf import settings
 from django.core.cache import cache
 from django.forms.models import model_to_dict
 
@@ -9,83 +10,133 @@ from core.repositories.user_repository import UserRepository
 from core.services.authentication_service import AuthenticationService
 from core.services.generic_service import GenericService
 from core.services.password_service import PasswordService
+from core.services.registration_pipeline import (RegistrationPipeline,
+                                                 RegistrationStep)
+from core.services.request_coalescing import RequestCoalescer
 from core.utils.cache_util_model import CacheModel
 from core.utils.logger import get_logger
 from core.utils.reset_password_input_validator import \
     reset_password_input_validator
+from core.utils.tracing import traced
 
 logger = get_logger(__name__)
 
 
 class UserService(GenericService[User]):
     user_repository: UserRepository = UserRepository()
+    registration_pipeline: RegistrationPipeline = RegistrationPipeline(
+        max_workers=settings.REGISTRATION_MAX_WORKERS,
+        deadline=settings.REGISTRATION_DEADLINE_SECONDS,
+    )
+    find_by_id_coalescer = RequestCoalescer("find_by_id")
+    find_by_username_coalescer = RequestCoalescer("find_user_by_username")
 
     def __init__(self) -> None:
         super().__init__(UserService.user_repository)
         self.auth_service = AuthenticationService()
         self.password_service = PasswordService()
 
+    @traced
     def save(self,
              entity: User,
              cache_model: Optional[CacheModel] = None) -> Optional[User]:
+        if isinstance(entity, dict):
+            entity = User(**entity)
         try:
-            logger.info(f"[UserService] Registering user: {entity.username}")
-            self.auth_service.register_user(entity.username, entity.password,
-                                            entity.email)
-            encrypted_password = self.password_service.get_password_encrypted(
-                entity.password)
-            logger.info("[UserService] Password encrypted.")
-            user = UserService.user_repository.create_entity(
-                User(
-                    username=entity.username,
-                    password=encrypted_password,
-                    email=entity.email,
-                ),
-                cache_model,
+            logger.info("[UserService] Registering user: %s", entity.username)
+            # Registering with the identity provider and encrypting the
+            # password are independent remote calls, so they run
+            # concurrently. The database insert needs the ciphertext and
+            # runs once both have completed.
+            return UserService.registration_pipeline.run(
+                [
+                    RegistrationStep(
+                        "identity_provider",
+                        lambda: self.auth_service.register_user(
+                            entity.username, entity.password, entity.email),
+                        lambda _: self.auth_service.rollback_user_registration(
+                            entity.username),
+                    ),
+                    RegistrationStep(
+                        "encrypt_password",
+                        lambda: self.password_service.get_password_encrypted(
+                            entity.password),
+                    ),
+                ],
+                lambda results: self._create_user(
+                    entity, results["encrypt_password"], cache_model),
             )
-            logger.info(
-                f"[UserService] User created in database: {entity.username}")
-            return user
         except Exception as error:
-            logger.error(
-                f"[UserService] Registration failed for user: "
-                f"{entity.username}",
-                exc_info=True,
-            )
+            logger.error("[UserService] Registration failed for user: %s",
+                         entity.username,
+                         exc_info=True)
             raise Exception("Registration failed") from error
 
+    def _create_user(self, entity: User, encrypted_password: str,
+                     cache_model: Optional[CacheModel]) -> User:
+        logger.info("[UserService] Password encrypted.")
+        user = UserService.user_repository.create_entity(
+            User(
+                username=entity.username,
+                password=encrypted_password,
+                email=entity.email,
+            ),
+            cache_model,
+        )
+        if not user:
+            raise Exception("Failed to create user in database")
+        logger.info("[UserService] User created in database: %s",
+                    entity.username)
+        return user
+
+    def find_by_id(self,
+                   id: int,
+                   cache_model: Optional[CacheModel] = None) -> Optional[User]:
+        return UserService.find_by_id_coalescer.call(
+            (id, cache_model.key if cache_model else None),
+            lambda: super(UserService, self).find_by_id(id, cache_model))
+
+    def find_user_by_username(
+            self,
+            username: str,
+            cache_model: Optional[CacheModel] = None) -> Optional[User]:
+        return UserService.find_by_username_coalescer.call(
+            (username, cache_model.key if cache_model else None),
+            lambda: UserService.user_repository.find_user_by_username(
+                username, cache_model))
+
+    @traced
     def confirm_registration(self, username: str,
                              confirmation_code: str) -> Dict[str, Any]:
         try:
-            logger.info(
-                f"[UserService] Confirming registration for user: {username}")
+            logger.info("[UserService] Confirming registration for user: %s",
+                        username)
             response = self.auth_service.confirm_user_registration(
                 username, confirmation_code)
-            logger.info(
-                f"[UserService] User confirmed successfully: {username}")
+            logger.info("[UserService] User confirmed successfully: %s",
+                        username)
             return response
         except Exception as error:
-            logger.error(
-                f"[UserService] Confirmation failed for user: {username}",
-                exc_info=True,
-            )
+            logger.error("[UserService] Confirmation failed for user: %s",
+                         username,
+                         exc_info=True)
             raise Exception("User confirmation failed") from error
 
+    @traced
     def authenticate(self, username: str, password: str) -> Dict[str, str]:
         try:
-            logger.info(
-                f"[UserService] Starting authentication for user: {username}")
+            logger.info("[UserService] Starting authentication for user: %s",
+                        username)
             token = self.auth_service.authenticate_user(username, password)
             cached_user = cache.get(f"user:{username}")
             if cached_user:
                 user = json.loads(cached_user)
             else:
-                user = UserService.user_repository.find_user_by_username(
-                    username)
+                user = self.find_user_by_username(username)
             if not user:
                 logger.warning(
-                    f"[UserService] User not found in cache or database: "
-                    f"{username}")
+                    "[UserService] User not found in cache or database: %s",
+                    username)
                 raise Exception("User not found")
             if not cached_user:
                 cache.set(
@@ -93,29 +144,28 @@ class UserService(GenericService[User]):
                     json.dumps(model_to_dict(user)),
                     3600,
                 )
-            logger.info(
-                f"[UserService] User authenticated successfully: {username}")
+            logger.info("[UserService] User authenticated successfully: %s",
+                        username)
             return {"token": token}
         except Exception as error:
             logger.error(
-                f"[UserService] Authentication process failed for user: "
-                f"{username}",
-                exc_info=True,
-            )
+                "[UserService] Authentication process failed for user: %s",
+                username,
+                exc_info=True)
             raise Exception(
                 "Authentication failed: Invalid username or password"
             ) from error
 
+    @traced
     def initiate_password_reset(self, username: str) -> Dict[str, Any]:
         try:
-            logger.info(
-                f"[UserService] Initiating password reset for user: {username}"
-            )
+            logger.info("[UserService] Initiating password reset for user: %s",
+                        username)
             response = self.password_service.initiate_user_password_reset(
                 username)
             logger.info(
-                f"[UserService] Password reset initiated successfully for "
-                f"user: {username}")
+                "[UserService] Password reset initiated successfully for "
+                "user: %s", username)
             return {
                 "message":
                 ("Password reset initiated. Check your email for the code."),
@@ -124,50 +174,50 @@ class UserService(GenericService[User]):
             }
         except Exception as error:
             logger.error(
-                f"[UserService] Failed to initiate password reset for user: "
-                f"{username}",
-                exc_info=True,
-            )
+                "[UserService] Failed to initiate password reset for user: %s",
+                username,
+                exc_info=True)
             raise Exception("Failed to initiate password reset") from error
 
+    @traced
     def complete_password_reset(self, username: str, new_password: str,
                                 confirmation_code: str) -> Dict[str, Any]:
         try:
-            logger.info(
-                f"[UserService] Starting password reset for user: {username}")
+            logger.info("[UserService] Starting password reset for user: %s",
+                        username)
             reset_password_input_validator(username, new_password,
                                            confirmation_code)
             response = self.password_service.complete_user_password_reset(
                 username, new_password, confirmation_code)
             logger.info(
-                f"[UserService] Cognito password reset completed for user: "
-                f"{username}")
+                "[UserService] Cognito password reset completed for user: %s",
+                username)
             encrypted_password = self.password_service.get_password_encrypted(
                 new_password)
             logger.info(
-                f"[UserService] Password encrypted successfully for user: "
-                f"{username}")
+                "[UserService] Password encrypted successfully for user: %s",
+                username)
+            # Read on its own rather than coalesced: the row is written next.
             user = UserService.user_repository.find_user_by_username(username)
             if not user:
                 logger.warning(
-                    f"[UserService] User not found in repository: {username}")
+                    "[UserService] User not found in repository: %s", username)
                 raise Exception("User not found in the repository")
             UserService.user_repository.update_entity(
                 user.id, {"password": encrypted_password})
             logger.info(
-                f"[UserService] Password updated in the database for user: "
-                f"{username}")
+                "[UserService] Password updated in the database for user: %s",
+                username)
             logger.info(
-                f"[UserService] Password reset successfully completed for "
-                f"user: {username}")
+                "[UserService] Password reset successfully completed for "
+                "user: %s", username)
             return {
                 "message": "Password reset successfully completed.",
                 "response": response,
             }
         except Exception as error:
             logger.error(
-                f"[UserService] Failed to complete password reset for user: "
-                f"{username}",
-                exc_info=True,
-            )
+                "[UserService] Failed to complete password reset for user: %s",
+                username,
+                exc_info=True)
             raise Exception("Failed to complete password reset") from error
@@ -0,0 +1,120 @@
+"""
+Query budgets for tests.
+
+``QueryBudgetMixin.assertQueryBudget`` records the queries run in its block
+and fails the test when there are more than the budget, or when one query
+fingerprint (see core.db.slow_queries.normalize_sql) repeats more often than
+allowed, which is how an N+1 shows up::
+
+    with self.assertQueryBudget("UserRepository.find_user_by_username", 1):
+        repository.find_user_by_username("alice")
+
+Every checked budget is added to ``report``. Set QUERY_BUDGET_REPORT to a
+path to have the report written there as JSON when the test run exits.
+"""
+
+import atexit
+import contextlib
+import json
+import os
+from collections import Counter
+from typing import Any, Dict, List
+
+from django.db import connections
+
+from core.db.slow_queries import normalize_sql
+
+
+class QueryRecorder:
+    """Records the normalized SQL of every query run on any connection."""
+
+    def __init__(self) -> None:
+        self.queries: List[str] = []
+        self._stack = contextlib.ExitStack()
+
+    def _wrapper(self, execute, sql, params, many, context):
+        self.queries.append(normalize_sql(sql))
+        return execute(sql, params, many, context)
+
+    def __enter__(self) -> "QueryRecorder":
+        for connection in connections.all():
+            self._stack.enter_context(
+                connection.execute_wrapper(self._wrapper))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stack.close()
+
+    def repeated(self, max_repeats: int) -> Dict[str, int]:
+        """Queries run more than ``max_repeats`` times, with their count."""
+        return {
+            sql: count
+            for sql, count in Counter(self.queries).items()
+            if count > max_repeats
+        }
+
+
+class QueryBudgetReport:
+
+    def __init__(self) -> None:
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, name: str, budget: int, recorder: QueryRecorder,
+            max_repeats: int) -> Dict[str, Any]:
+        repeated = recorder.repeated(max_repeats)
+        result = {
+            "budget": budget,
+            "queries": len(recorder.queries),
+            "repeated": repeated,
+            "passed": len(recorder.queries) <= budget and not repeated,
+            "sql": recorder.queries,
+        }
+        self.results[name] = result
+        return result
+
+    def failures(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: result
+            for name, result in self.results.items() if not result["passed"]
+        }
+
+    def write(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "passed": not self.failures(),
+                    "budgets": self.results
+                },
+                file,
+                indent=2,
+                sort_keys=True)
+
+
+def describe(name: str, result: Dict[str, Any]) -> str:
+    lines = [
+        f"{name}: {result['queries']} queries, budget {result['budget']}"
+    ]
+    lines += [
+        f"  repeated {count}x (possible N+1): {sql}"
+        for sql, count in result["repeated"].items()
+    ]
+    lines += [f"  {sql}" for sql in result["sql"]]
+    return "\n".join(lines)
+
+
+report = QueryBudgetReport()
+
+if os.environ.get("QUERY_BUDGET_REPORT"):
+    atexit.register(report.write, os.environ["QUERY_BUDGET_REPORT"])
+
+
+class QueryBudgetMixin:
+    """TestCase mixin adding ``assertQueryBudget``."""
+
+    @contextlib.contextmanager
+    def assertQueryBudget(self, name: str, budget: int, max_repeats: int = 1):
+        with QueryRecorder() as recorder:
+            yield recorder
+        result = report.add(name, budget, recorder, max_repeats)
+        if not result["passed"]:
+            self.fail(describe(name, result))
@@ -0,0 +1,96 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+from django.test import RequestFactory, SimpleTestCase
+
+from core.models import User
+from core.utils.rate_limiter import RateLimitResult
+from user import async_views
+from user.async_views import asyncUserService
+
+DUMMY_USER = User(id=1,
+                  username="testuser",
+                  email="test@example.com",
+                  password="ciphertext")
+
+
+class TestAsyncUserViews(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def post(self, path, data):
+        return self.factory.post(path,
+                                 json.dumps(data),
+                                 content_type="application/json")
+
+    @patch.object(asyncUserService,
+                  "save",
+                  new_callable=AsyncMock,
+                  return_value=DUMMY_USER)
+    async def test_register_user(self, mock_save):
+        response = await async_views.register_user(
+            self.post("/api/user/register/", {
+                "username": "testuser",
+                "password": "Secret123!",
+                "email": "test@example.com"
+            }))
+
+        self.assertEqual(response.status_code, 200)
+        body = json.loads(response.content)
+        self.assertEqual(body["data"]["username"], "testuser")
+        self.assertNotIn("password", body["data"])
+        mock_save.assert_awaited_once()
+
+    async def test_register_user_missing_fields(self):
+        response = await async_views.register_user(
+            self.post("/api/user/register/", {"username": "testuser"}))
+
+        self.assertEqual(response.status_code, 400)
+
+    @patch("user.async_views.rate_limiter.check",
+           return_value=RateLimitResult(False, 30, "username"))
+    async def test_authenticate_rate_limited(self, _):
+        response = await async_views.authenticate_user(
+            self.post("/api/user/authenticate/", {
+                "username": "testuser",
+                "password": "Secret123!"
+            }))
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "30")
+
+    @patch.object(asyncUserService,
+                  "find_by_id",
+                  new_callable=AsyncMock,
+                  return_value=None)
+    async def test_get_user_not_found(self, _):
+        response = await async_views.get_user_by_id(
+            self.factory.get("/api/user/2/"), 2)
+
+        self.assertEqual(response.status_code, 404)
+
+    @patch.object(asyncUserService,
+                  "update",
+                  new_callable=AsyncMock,
+                  return_value=DUMMY_USER)
+    async def test_update_user(self, mock_update):
+        request = self.factory.put("/api/user/1/update/",
+                                   json.dumps({"email": "new@example.com"}),
+                                   content_type="application/json")
+
+        response = await async_views.update_user(request, 1)
+
+        self.assertEqual(response.status_code, 200)
+        mock_update.assert_awaited_once_with(1, {"email": "new@example.com"})
+
+    async def test_wrong_method(self):
+        response = await async_views.get_user_by_id(
+            self.post("/api/user/1/", {}), 1)
+
+        self.assertEqual(response.status_code, 405)
+
+    def test_views_are_csrf_exempt_coroutines(self):
+        self.assertTrue(asyncio.iscoroutinefunction(async_views.update_user))
+        self.assertTrue(async_views.update_user.csrf_exempt)
@@ -4,6 +4,9 @@ from unittest.mock import patch
 from rest_framework import status
 from rest_framework.test import APIRequestFactory, APITestCase
 
+from core.models import User
+from core.utils.rate_limiter import RateLimitResult
+
 # Import the API views that you want to test.
 from user.views import (AuthenticateUserView, CompletePasswordResetView,
                         ConfirmUserRegistrationView, GetUserByIdView,
@@ -11,10 +14,16 @@ from user.views import (AuthenticateUserView, CompletePasswordResetView,
                         UpdateUserView)
 
 # Dummy responses for tests.
+DUMMY_USER = User(id=1,
+                  username="testuser",
+                  email="test@example.com",
+                  password="ciphertext")
 DUMMY_USER_RESPONSE = {
     "id": 1,
     "username": "testuser",
-    "email": "test@example.com"
+    "email": "test@example.com",
+    "name": "",
+    "is_active": True,
 }
 DUMMY_CONFIRM_RESPONSE = {"status": "confirmed"}
 DUMMY_AUTH_RESPONSE = {"token": "fake_token"}
@@ -67,7 +76,7 @@ class TestUserApiViews(APITestCase):
     @patch("user.views.userService")
     def test_register_user_success(self, mock_userService):
         # Configure the userService.save to return a dummy user.
-        mock_userService.save.return_value = DUMMY_USER_RESPONSE
+        mock_userService.save.return_value = DUMMY_USER
 
         request = self.factory.post("/api/user/register/",
                                     data=self.valid_registration_data,
@@ -83,6 +92,25 @@ class TestUserApiViews(APITestCase):
         mock_userService.save.assert_called_once_with(
             self.valid_registration_data)
 
+    @patch("user.views.rate_limiter")
+    @patch("user.views.userService")
+    def test_register_user_rate_limited(self, mock_userService,
+                                        mock_rate_limiter):
+        mock_rate_limiter.check.return_value = RateLimitResult(
+            allowed=False, retry_after=30, reason="ip")
+        request = self.factory.post("/api/user/register/",
+                                    data=self.valid_registration_data,
+                                    format="json")
+        view = RegisterUserView.as_view()
+        response = view(request)
+        self.assertEqual(response.status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "30")
+        self.assertFalse(response.data["success"])
+        mock_rate_limiter.check.assert_called_once_with(
+            "register", "testuser", "127.0.0.1")
+        mock_userService.save.assert_not_called()
+
     # -------------------------
     # Tests for ConfirmUserRegistrationView
     # -------------------------
@@ -145,6 +173,23 @@ class TestUserApiViews(APITestCase):
         mock_userService.authenticate.assert_called_once_with(
             self.valid_auth_data["username"], self.valid_auth_data["password"])
 
+    @patch("user.views.rate_limiter")
+    @patch("user.views.userService")
+    def test_authenticate_user_rate_limited(self, mock_userService,
+                                            mock_rate_limiter):
+        mock_rate_limiter.check.return_value = RateLimitResult(
+            allowed=False, retry_after=12, reason="username")
+        request = self.factory.post("/api/user/authenticate/",
+                                    data=self.valid_auth_data,
+                                    format="json")
+        view = AuthenticateUserView.as_view()
+        response = view(request)
+        self.assertEqual(response.status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "12")
+        self.assertEqual(response.data["details"], {"retryAfter": 12})
+        mock_userService.authenticate.assert_not_called()
+
     # -------------------------
     # Tests for InitiatePasswordResetView
     # -------------------------
@@ -175,6 +220,22 @@ class TestUserApiViews(APITestCase):
         mock_userService.initiate_password_reset.assert_called_once_with(
             self.valid_initiate_reset_data["username"])
 
+    @patch("user.views.rate_limiter")
+    @patch("user.views.userService")
+    def test_initiate_password_reset_rate_limited(self, mock_userService,
+                                                  mock_rate_limiter):
+        mock_rate_limiter.check.return_value = RateLimitResult(
+            allowed=False, retry_after=900, reason="global")
+        request = self.factory.post("/api/user/password-reset/initiate/",
+                                    data=self.valid_initiate_reset_data,
+                                    format="json")
+        view = InitiatePasswordResetView.as_view()
+        response = view(request)
+        self.assertEqual(response.status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "900")
+        mock_userService.initiate_password_reset.assert_not_called()
+
     # -------------------------
     # Tests for CompletePasswordResetView
     # -------------------------
@@ -218,27 +279,27 @@ class TestUserApiViews(APITestCase):
         view = GetUserByIdView.as_view()
         response = view(request, id=None)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        mock_userService.findById.assert_not_called()
+        mock_userService.find_by_id.assert_not_called()
 
     @patch("user.views.userService")
     def test_get_user_by_id_not_found(self, mock_userService):
-        mock_userService.findById.return_value = None
+        mock_userService.find_by_id.return_value = None
         request = self.factory.get("/api/user/999/")
         view = GetUserByIdView.as_view()
         response = view(request, id=999)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
-        mock_userService.findById.assert_called_once_with(999)
+        mock_userService.find_by_id.assert_called_once_with(999)
 
     @patch("user.views.userService")
     def test_get_user_by_id_success(self, mock_userService):
-        mock_userService.findById.return_value = DUMMY_USER_RESPONSE
+        mock_userService.find_by_id.return_value = DUMMY_USER
         request = self.factory.get("/api/user/1/")
         view = GetUserByIdView.as_view()
         response = view(request, id=1)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue(response.data["success"])
         self.assertEqual(response.data["data"], DUMMY_USER_RESPONSE)
-        mock_userService.findById.assert_called_once_with(1)
+        mock_userService.find_by_id.assert_called_once_with(1)
 
     # -------------------------
     # Tests for UpdateUserView
@@ -267,11 +328,9 @@ class TestUserApiViews(APITestCase):
 
     @patch("user.views.userService")
     def test_update_user_success(self, mock_userService):
-        updated_user = {
-            "id": 1,
-            "username": "testuser",
-            "email": "newemail@example.com"
-        }
+        updated_user = User(id=1,
+                            username="testuser",
+                            email="newemail@example.com")
         mock_userService.update.return_value = updated_user
         request = self.factory.put("/api/user/1/update/",
                                    data=self.valid_update_data,
@@ -280,7 +339,9 @@ class TestUserApiViews(APITestCase):
         response = view(request, id=1)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue(response.data["success"])
-        self.assertEqual(response.data["data"], updated_user)
+        self.assertEqual(response.data["data"]["email"],
+                         "newemail@example.com")
+        self.assertNotIn("password", response.data["data"])
         self.assertEqual(response.data["message"], "User updated successfully")
         mock_userService.update.assert_called_once_with(
             1, self.valid_update_data)
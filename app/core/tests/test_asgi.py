@@ -0,0 +1,96 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+from django.test import (SimpleTestCase, TransactionTestCase,
+                         override_settings)
+from django.urls import path
+
+from app.asgi import application
+from core.models import User
+from core.utils.async_executor import run_blocking
+from user import async_views
+from user.async_views import asyncUserService
+
+urlpatterns = [
+    path("api/user/<int:id>/", async_views.get_user_by_id),
+]
+
+
+async def get(path):
+    """
+    Serve a GET for ``path`` through app.asgi, returning the status, headers
+    and decoded JSON body.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("ascii"),
+        "query_string": b"",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    body = b"".join(message.get("body", b"") for message in messages
+                    if message["type"] == "http.response.body")
+    headers = {
+        name.decode("latin-1"): value.decode("latin-1")
+        for name, value in messages[0]["headers"]
+    }
+    return messages[0]["status"], headers, json.loads(body)
+
+
+@override_settings(ROOT_URLCONF=__name__, REQUEST_TIMING_ENABLED=True)
+class TestAsgiApplication(SimpleTestCase):
+
+    async def test_concurrent_requests_overlap(self):
+        callers = 5
+        arrived = 0
+        everyone_arrived = asyncio.Event()
+
+        async def find_by_id(id):
+            # Only returns once every request is in the view at once.
+            nonlocal arrived
+            arrived += 1
+            if arrived == callers:
+                everyone_arrived.set()
+            await asyncio.wait_for(everyone_arrived.wait(), 5)
+            return User(id=id, username=f"user{id}")
+
+        with patch.object(asyncUserService,
+                          "find_by_id",
+                          side_effect=find_by_id):
+            responses = await asyncio.gather(
+                *(get(f"/api/user/{id}/") for id in range(1, callers + 1)))
+
+        self.assertEqual([status for status, _, _ in responses],
+                         [200] * callers)
+        self.assertEqual([body["data"]["username"] for *_, body in responses],
+                         [f"user{id}" for id in range(1, callers + 1)])
+
+
+@override_settings(ROOT_URLCONF=__name__, REQUEST_TIMING_ENABLED=True)
+class TestAsgiDatabaseTiming(TransactionTestCase):
+
+    async def test_queries_on_executor_threads_are_timed(self):
+        user = await run_blocking(User.objects.create,
+                                  username="alice",
+                                  email="alice@example.com")
+
+        status, headers, _ = await get(f"/api/user/{user.id}/")
+
+        self.assertEqual(status, 200)
+        self.assertIn('db;dur=', headers["Server-Timing"])
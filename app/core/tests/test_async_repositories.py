@@ -0,0 +1,148 @@
+import json
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from django.test import SimpleTestCase, TransactionTestCase
+
+from core.models import User
+from core.repositories.async_user_repository import AsyncUserRepository
+from core.repositories.repository_methods import IRepository
+from core.utils import cache_util
+from core.utils.cache_util import Cache, get_async_cache
+from core.utils.cache_util_model import CacheModel
+
+
+class FakeAsyncRedis:
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value.encode("utf-8")
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+class TestAsyncUserRepository(TransactionTestCase):
+
+    def setUp(self):
+        self.redis = FakeAsyncRedis()
+        patcher = patch(
+            "core.repositories.async_generic_repositories.get_async_cache",
+            AsyncMock(return_value=Cache(self.redis)))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.repository = AsyncUserRepository()
+        self.user = User.objects.create(username="alice",
+                                        email="alice@example.com",
+                                        password="secret")
+
+    def test_implements_irepository(self):
+        self.assertIsInstance(self.repository, IRepository)
+
+    async def test_find_entity_by_id_fills_the_cache(self):
+        cache_model = CacheModel(key=f"user:{self.user.id}", expiration=60)
+
+        user = await self.repository.find_entity_by_id(
+            self.user.id, cache_model)
+
+        self.assertEqual(user.username, "alice")
+        cached = json.loads(self.redis.data[cache_model.key])
+        self.assertEqual(cached["email"], "alice@example.com")
+
+        self.redis.data[cache_model.key] = json.dumps(
+            dict(cached, name="Cached")).encode("utf-8")
+        user = await self.repository.find_entity_by_id(
+            self.user.id, cache_model)
+        self.assertEqual(user.name, "Cached")
+
+    async def test_missing_entity(self):
+        self.assertIsNone(await self.repository.find_entity_by_id(0))
+        self.assertIsNone(await self.repository.update_entity(0, {"name": ""}))
+        self.assertFalse(await self.repository.delete_entity(0))
+
+    async def test_create_update_and_delete(self):
+        created = await self.repository.create_entity(
+            User(username="bob", email="bob@example.com"))
+
+        updated = await self.repository.update_entity(created.id,
+                                                      {"name": "Bob"})
+        self.assertEqual(updated.name, "Bob")
+
+        cache_model = CacheModel(key=f"user:{created.id}", expiration=60)
+        self.redis.data[cache_model.key] = b"{}"
+        self.assertTrue(await self.repository.delete_entity(
+            created.id, cache_model))
+        self.assertNotIn(cache_model.key, self.redis.data)
+        self.assertFalse(
+            await self.repository.delete_entity(created.id, cache_model))
+
+    async def test_find_user_by_username_and_pagination(self):
+        await self.repository.create_entity(
+            User(username="bob", email="bob@example.com"))
+
+        user = await self.repository.find_user_by_username("bob")
+        page = await self.repository.get_entities_with_pagination(1, 5)
+        everyone = await self.repository.get_all_entities()
+
+        self.assertEqual(user.email, "bob@example.com")
+        self.assertEqual(page["count"], 2)
+        self.assertEqual([u.username for u in page["data"]], ["bob"])
+        self.assertEqual(len(everyone), 2)
+
+
+class TestGetAsyncCache(SimpleTestCase):
+
+    def setUp(self):
+        cache_util._async_cache_retry_at = 0.0
+        self.addCleanup(setattr, cache_util, "_async_cache_retry_at", 0.0)
+        patcher = patch("core.utils.cache_util.get_redis_url",
+                        return_value="redis://localhost:6379")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("core.utils.cache_util.redis.Redis.from_url")
+    async def test_one_cache_per_loop(self, mock_from_url):
+        fake_client = MagicMock()
+        fake_client.ping = AsyncMock(return_value=True)
+        mock_from_url.return_value = fake_client
+
+        first = await get_async_cache()
+        second = await get_async_cache()
+
+        self.assertIs(first, second)
+        self.assertIs(first.client, fake_client)
+        mock_from_url.assert_called_once()
+
+    @patch("core.utils.cache_util.redis.Redis.from_url")
+    async def test_redis_url_is_resolved_off_the_event_loop(
+            self, mock_from_url):
+        fake_client = MagicMock()
+        fake_client.ping = AsyncMock(return_value=True)
+        mock_from_url.return_value = fake_client
+        threads = []
+        cache_util.get_redis_url.side_effect = (
+            lambda: threads.append(threading.get_ident()) or
+            "redis://localhost:6379")
+
+        await get_async_cache()
+
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
+
+    @patch("core.utils.cache_util.redis.Redis.from_url")
+    async def test_unavailable_redis_backs_off(self, mock_from_url):
+        fake_client = MagicMock()
+        fake_client.ping = AsyncMock(side_effect=ConnectionError("down"))
+        mock_from_url.return_value = fake_client
+
+        self.assertIsNone(await get_async_cache())
+        self.assertIsNone(await get_async_cache())
+
+        mock_from_url.assert_called_once()
+        self.assertGreater(cache_util._async_cache_retry_at, time.monotonic())
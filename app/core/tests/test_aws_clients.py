@@ -0,0 +1,56 @@
+import unittest
+from unittest.mock import patch
+
+from core.utils.aws_clients import LazyClient, reset_clients
+
+
+class TestLazyClient(unittest.TestCase):
+
+    @patch("boto3.client")
+    def test_client_is_created_on_first_use(self, mock_boto_client):
+        client = LazyClient("kms", region_name="us-east-1")
+
+        mock_boto_client.assert_not_called()
+        client.encrypt(KeyId="key", Plaintext=b"data")
+        client.decrypt(CiphertextBlob=b"blob")
+
+        mock_boto_client.assert_called_once_with("kms",
+                                                 region_name="us-east-1")
+        mock_boto_client.return_value.encrypt.assert_called_once_with(
+            KeyId="key", Plaintext=b"data")
+
+    @patch.dict("os.environ", {
+        "AWS_ENDPOINT_URL": "http://localhost:4000",
+        "AWS_ENDPOINT_URL_COGNITO_IDP": "http://localhost:4001",
+    })
+    @patch("boto3.client")
+    def test_endpoint_url_from_environment(self, mock_boto_client):
+        LazyClient("cognito-idp").sign_up()
+        LazyClient("kms").encrypt()
+
+        self.assertEqual(mock_boto_client.call_args_list[0].kwargs,
+                         {"endpoint_url": "http://localhost:4001"})
+        self.assertEqual(mock_boto_client.call_args_list[1].kwargs,
+                         {"endpoint_url": "http://localhost:4000"})
+
+    @patch("boto3.client")
+    def test_reset_rebuilds_client(self, mock_boto_client):
+        client = LazyClient("ssm")
+
+        client.get_parameter(Name="a")
+        client.reset()
+        client.get_parameter(Name="a")
+
+        self.assertEqual(mock_boto_client.call_count, 2)
+
+    @patch("boto3.client")
+    def test_reset_clients_drops_every_client(self, mock_boto_client):
+        kms, ssm = LazyClient("kms"), LazyClient("ssm")
+        kms.encrypt()
+        ssm.get_parameter()
+
+        reset_clients()
+        kms.encrypt()
+        ssm.get_parameter()
+
+        self.assertEqual(mock_boto_client.call_count, 4)
@@ -0,0 +1,88 @@
+import threading
+
+import boto3
+from botocore.exceptions import ClientError
+from django.test import SimpleTestCase
+
+from core.management.commands.aws_stubs import AwsStub, make_server
+
+
+class TestAwsStubs(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.stub = AwsStub(parameters={"/myapp/kms-key-id": "stub-key"},
+                           service_latency_ms={"kms": 1})
+        cls.server = make_server(cls.stub)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        host, port = cls.server.server_address[:2]
+        cls.endpoint_url = f"http://{host}:{port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def aws_client(self, service):
+        return boto3.client(service,
+                            endpoint_url=self.endpoint_url,
+                            region_name="us-east-1",
+                            aws_access_key_id="stub",
+                            aws_secret_access_key="stub")
+
+    def authenticate(self, cognito, username):
+        return cognito.admin_initiate_auth(UserPoolId="pool",
+                                           ClientId="client",
+                                           AuthFlow="ADMIN_NO_SRP_AUTH",
+                                           AuthParameters={
+                                               "USERNAME": username,
+                                               "PASSWORD": "Secret123!"
+                                           })
+
+    def test_cognito_sign_up_confirm_and_authenticate(self):
+        cognito = self.aws_client("cognito-idp")
+        cognito.sign_up(ClientId="client",
+                        Username="alice",
+                        Password="Secret123!",
+                        UserAttributes=[{
+                            "Name": "email",
+                            "Value": "alice@example.com"
+                        }])
+        with self.assertRaises(cognito.exceptions.UserNotConfirmedException):
+            self.authenticate(cognito, "alice")
+
+        cognito.confirm_sign_up(ClientId="client",
+                                Username="alice",
+                                ConfirmationCode="123456")
+        response = self.authenticate(cognito, "alice")
+
+        self.assertTrue(
+            response["AuthenticationResult"]["IdToken"].startswith("stub."))
+
+    def test_kms_data_key_round_trip(self):
+        kms = self.aws_client("kms")
+        data_key = kms.generate_data_key(KeyId="stub-key", KeySpec="AES_256")
+
+        decrypted = kms.decrypt(CiphertextBlob=data_key["CiphertextBlob"])
+
+        self.assertEqual(len(data_key["Plaintext"]), 32)
+        self.assertEqual(decrypted["Plaintext"], data_key["Plaintext"])
+
+    def test_ssm_parameters(self):
+        ssm = self.aws_client("ssm")
+
+        response = ssm.get_parameters(Names=["/myapp/kms-key-id", "missing"],
+                                      WithDecryption=True)
+
+        self.assertEqual(response["Parameters"][0]["Value"], "stub-key")
+        self.assertEqual(response["InvalidParameters"], ["missing"])
+        with self.assertRaises(ClientError):
+            ssm.get_parameter(Name="missing")
+
+    def test_unknown_operation(self):
+        status, reply = self.stub.handle("AmazonSSM.PutParameter", {})
+
+        self.assertEqual(status, 400)
+        self.assertEqual(reply["__type"], "UnknownOperationException")
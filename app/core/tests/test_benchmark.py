@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from core.management.commands.benchmark import InMemoryRedis, compare
+
+
+class TestInMemoryRedis(SimpleTestCase):
+
+    def test_get_set_delete(self):
+        client = InMemoryRedis()
+        client.set("key", "value", ex=60)
+
+        self.assertEqual(client.get("key"), b"value")
+        self.assertEqual(client.delete("key", "missing"), 1)
+        self.assertIsNone(client.get("key"))
+
+    def test_expired_keys_are_missing(self):
+        client = InMemoryRedis()
+        with patch("core.management.commands.benchmark.time.monotonic",
+                   side_effect=[0, 61]):
+            client.set("key", "value", ex=60)
+            self.assertIsNone(client.get("key"))
+
+
+class TestCompare(SimpleTestCase):
+
+    def test_regressions_first(self):
+        rows = compare(
+            {
+                "a": {"median_us": 90.0},
+                "b": {"median_us": 150.0},
+                "new": {"median_us": 1.0},
+            },
+            {
+                "a": {"median_us": 100.0},
+                "b": {"median_us": 100.0},
+            },
+        )
+
+        self.assertEqual([row["name"] for row in rows], ["b", "a"])
+        self.assertAlmostEqual(rows[0]["change_pct"], 50.0)
+        self.assertAlmostEqual(rows[1]["change_pct"], -10.0)
+
+
+class TestBenchmarkCommand(TestCase):
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command("benchmark", "--existing-db", "--iterations", "2",
+                     "--repeat", "1", "--rows", "30", *args,
+                     stdout=out)
+        return out.getvalue()
+
+    def test_saves_and_compares_results(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            output = self.run_command("--save", path)
+            with open(path) as results_file:
+                results = json.load(results_file)["results"]
+
+            self.assertIn("cache.get[hit]", output)
+            self.assertIn("repository.get_entities_with_pagination[skip=15]",
+                          results)
+            self.assertIn("serialization.model_to_dict", results)
+
+            with self.assertRaises(CommandError):
+                self.run_command("--baseline", path, "--fail-over", "-100")
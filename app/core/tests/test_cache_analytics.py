@@ -0,0 +1,141 @@
+from unittest.mock import MagicMock, Mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, SimpleTestCase
+from prometheus_client import REGISTRY
+
+from core import views
+from core.management.commands.benchmark import InMemoryRedis
+from core.management.commands.cache_keyspace import scan_keyspace
+from core.utils.cache_analytics import CountMinSketch, KeySpaceAnalytics
+from core.utils.cache_util import ResilientCache
+
+
+class FakeScanRedis:
+    """Serves SCAN, MEMORY USAGE and TTL from a dict of key: (size, ttl)."""
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.scans = 0
+
+    def scan(self, cursor, match=None, count=None):
+        self.scans += 1
+        names = sorted(self.keys)
+        batch = names[cursor:cursor + count]
+        following = cursor + count
+        return (following if following < len(names) else 0,
+                [name.encode() for name in batch])
+
+    def pipeline(self, transaction=True):
+        pipeline = MagicMock()
+        commands = []
+        pipeline.memory_usage.side_effect = lambda key: commands.append(
+            self.keys[key.decode()][0])
+        pipeline.ttl.side_effect = lambda key: commands.append(
+            self.keys[key.decode()][1])
+        pipeline.execute.side_effect = lambda: commands
+        return pipeline
+
+
+class TestCountMinSketch(SimpleTestCase):
+
+    def test_estimates_never_undercount(self):
+        sketch = CountMinSketch(width=64, depth=4)
+        for i in range(200):
+            sketch.add(f"user:{i % 20}")
+
+        self.assertTrue(
+            all(sketch.estimate(f"user:{i}") >= 10 for i in range(20)))
+
+    def test_halve(self):
+        sketch = CountMinSketch(width=64, depth=2)
+        sketch.add("user:1", 10)
+        sketch.halve()
+
+        self.assertEqual(sketch.estimate("user:1"), 5)
+
+
+class TestKeySpaceAnalytics(SimpleTestCase):
+
+    def test_hot_keys(self):
+        analytics = KeySpaceAnalytics(sample_rate=1, top_k=2)
+        for key, count in (("user:1", 5), ("user:2", 1), ("user:3", 3)):
+            for _ in range(count):
+                analytics.record_write(key, "value")
+
+        self.assertEqual([entry["key"] for entry in analytics.hot_keys()],
+                         ["user:1", "user:3"])
+
+    def test_window_halves_counts(self):
+        analytics = KeySpaceAnalytics(sample_rate=1, window=4)
+        for _ in range(4):
+            analytics.record_write("user:1", "value")
+
+        self.assertEqual(analytics.hot_keys()[0]["estimated_samples"], 2)
+
+    def test_unsampled_operations_are_not_counted(self):
+        analytics = KeySpaceAnalytics(sample_rate=0)
+        analytics.record_read("user:1", b"value", Mock())
+
+        self.assertEqual(analytics.samples, 0)
+
+    def test_cache_reports_value_size_and_ttl_at_read(self):
+        analytics = KeySpaceAnalytics(sample_rate=1)
+        cache = ResilientCache(client_factory=InMemoryRedis,
+                               analytics=analytics)
+        cache.reconnect()
+        ttl_count = REGISTRY.get_sample_value(
+            "cache_ttl_at_read_seconds_count", {"prefix": "user"}) or 0
+
+        cache.set("user:1", "x" * 100, timeout=600)
+        cache.get("user:1")
+        cache.get("user:2")
+
+        self.assertEqual(analytics.samples, 3)
+        self.assertEqual(
+            REGISTRY.get_sample_value("cache_ttl_at_read_seconds_count",
+                                      {"prefix": "user"}), ttl_count + 1)
+        self.assertIsNotNone(
+            REGISTRY.get_sample_value("cache_value_bytes_sum", {
+                "operation": "set",
+                "prefix": "user"
+            }))
+
+    def test_view_requires_staff(self):
+        request = RequestFactory().get("/admin/cache-keys")
+        request.user = AnonymousUser()
+
+        self.assertEqual(views.cache_keys(request).status_code, 403)
+
+
+class TestScanKeyspace(SimpleTestCase):
+
+    def setUp(self):
+        self.redis = FakeScanRedis({
+            "user:1": (100, 600),
+            "user:2": (300, 1200),
+            "user:3": (None, -2),
+            "session:1": (1000, -1),
+            "flag": (50, -1),
+        })
+
+    def test_memory_by_prefix(self):
+        report = scan_keyspace(self.redis, batch=2, top=2)
+
+        self.assertTrue(report["complete"])
+        self.assertEqual(list(report["prefixes"]),
+                         ["session", "user", "(none)"])
+        user = report["prefixes"]["user"]
+        self.assertEqual((user["keys"], user["bytes"], user["max_bytes"]),
+                         (2, 400, 300))
+        self.assertEqual(user["avg_ttl"], 900)
+        self.assertEqual(report["prefixes"]["session"]["without_ttl"], 1)
+        self.assertEqual([entry["key"] for entry in report["largest_keys"]],
+                         ["session:1", "user:2"])
+
+    def test_max_keys_bounds_the_scan(self):
+        report = scan_keyspace(self.redis, batch=2, max_keys=3)
+
+        self.assertEqual(report["scanned"], 3)
+        self.assertFalse(report["complete"])
+        self.assertEqual(self.redis.scans, 2)
@@ -1,8 +1,12 @@
 import os
+import time
 import unittest
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from core.utils.cache_util import Cache, init_cache
+from redis import ConnectionError as RedisConnectionError
+
+from core.utils.cache_util import (Cache, CacheState, ResilientCache,
+                                   init_cache)
 
 
 class TestCacheUtil(unittest.IsolatedAsyncioTestCase):
@@ -84,3 +88,97 @@ class TestCacheUtil(unittest.IsolatedAsyncioTestCase):
                 await init_cache()
             self.assertIn("Environment variable 'REDIS_URL' is not set",
                           str(context.exception))
+
+
+class TestResilientCache(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.factory = MagicMock(return_value=self.client)
+        self.cache = ResilientCache(client_factory=self.factory,
+                                    backoff_base=0.01,
+                                    backoff_max=0.02)
+
+    def tearDown(self):
+        self.cache.close()
+
+    def wait_for(self, state):
+        for _ in range(200):
+            if self.cache.state == state:
+                return
+            time.sleep(0.005)
+        self.fail(f"Cache never reached state {state}")
+
+    def test_connects_lazily_on_first_use(self):
+        self.assertIsNone(self.cache.get("key"))
+        self.wait_for(CacheState.HEALTHY)
+        self.client.get.return_value = b"value"
+
+        self.assertEqual(self.cache.get("key"), "value")
+        self.factory.assert_called_once()
+
+    def test_operations_are_no_ops_while_connecting(self):
+        self.factory.side_effect = RedisConnectionError("refused")
+
+        self.assertIsNone(self.cache.get("key"))
+        self.cache.set("key", "value", timeout=60)
+        self.cache.delete("key")
+
+        self.client.set.assert_not_called()
+        self.wait_for(CacheState.DEGRADED)
+
+    def test_failure_degrades_and_reconnects(self):
+        self.cache.connect()
+        self.wait_for(CacheState.HEALTHY)
+        self.client.get.side_effect = RedisConnectionError("reset")
+        self.client.ping.side_effect = [RedisConnectionError("down"), True]
+
+        self.assertIsNone(self.cache.get("key"))
+
+        self.wait_for(CacheState.HEALTHY)
+        self.assertEqual(self.cache.last_error, "down")
+        self.assertGreaterEqual(self.factory.call_count, 3)
+
+    def test_deletes_while_degraded_are_replayed(self):
+        self.factory.side_effect = [RedisConnectionError("down"), self.client]
+
+        self.cache.delete("user:alice")
+        self.wait_for(CacheState.HEALTHY)
+
+        for _ in range(200):
+            if self.client.delete.called:
+                break
+            time.sleep(0.005)
+        self.client.delete.assert_called_once_with("user:alice")
+
+    def test_set_passes_timeout(self):
+        self.cache.connect()
+        self.wait_for(CacheState.HEALTHY)
+
+        self.cache.set("key", "value", timeout=60)
+
+        self.client.set.assert_called_once_with("key", "value", ex=60)
+        self.assertTrue(self.cache.health()["healthy"])
+
+    def test_reset_forgets_inherited_connection(self):
+        self.cache.connect()
+        self.wait_for(CacheState.HEALTHY)
+
+        self.cache.reset()
+
+        self.assertIsNone(self.cache.state)
+        self.assertIsNone(self.cache.get("key"))
+        self.wait_for(CacheState.HEALTHY)
+        self.assertEqual(self.factory.call_count, 2)
+
+    def test_reconnect_swaps_client(self):
+        self.cache.connect()
+        self.wait_for(CacheState.HEALTHY)
+        new_client = MagicMock()
+        self.factory.return_value = new_client
+
+        self.cache.reconnect()
+        self.cache.get("key")
+
+        self.client.close.assert_called_once()
+        new_client.get.assert_called_once_with("key")
@@ -146,6 +146,31 @@ class TestCognitoService(unittest.TestCase):
             ConfirmationCode="654321",
         )
 
+    @patch("core.utils.cognito_util.cognito_client")
+    @patch("core.utils.cognito_util.get_cached_parameter")
+    def test_delete_user_success(self, mock_get_cached_parameter,
+                                 mock_cognito_client):
+        mock_get_cached_parameter.side_effect = self.fake_get_cached_parameter
+
+        result = cognito_service.delete_user("testuser")
+
+        self.assertEqual(result, {"message": "User deleted successfully"})
+        mock_cognito_client.admin_delete_user.assert_called_with(
+            UserPoolId="fake-user-pool-id",
+            Username="testuser",
+        )
+
+    @patch("core.utils.cognito_util.cognito_client")
+    @patch("core.utils.cognito_util.get_cached_parameter")
+    def test_delete_user_failure(self, mock_get_cached_parameter,
+                                 mock_cognito_client):
+        mock_get_cached_parameter.side_effect = self.fake_get_cached_parameter
+        mock_cognito_client.admin_delete_user.side_effect = Exception("boom")
+
+        with self.assertRaises(Exception) as context:
+            cognito_service.delete_user("testuser")
+        self.assertIn("User deletion failed", str(context.exception))
+
     @patch("core.utils.cognito_util.get_cached_parameter")
     def test_missing_env_var(self, mock_get_cached_parameter):
         # Remove the required environment variable.
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from core.utils import config_loader
+from core.utils.config_loader import ConfigLoader, ConfigSnapshot
+
+NAMES = ["/db/name", "/db/host"]
+VALUES = {"/db/name": "app", "/db/host": "db.internal"}
+
+
+class TestConfigSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "snapshot")
+        self.key = os.urandom(32)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip_is_encrypted(self):
+        ConfigSnapshot(self.path, self.key).write(VALUES)
+
+        with open(self.path, "rb") as snapshot_file:
+            self.assertNotIn(b"db.internal", snapshot_file.read())
+        self.assertEqual(ConfigSnapshot(self.path, self.key).read(), VALUES)
+
+    def test_wrong_key_is_ignored(self):
+        ConfigSnapshot(self.path, self.key).write(VALUES)
+
+        self.assertIsNone(ConfigSnapshot(self.path, os.urandom(32)).read())
+
+    def test_missing_snapshot_returns_none(self):
+        self.assertIsNone(ConfigSnapshot(self.path, self.key).read())
+
+
+@patch("core.utils.config_loader.ssm_util")
+class TestConfigLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.snapshot = ConfigSnapshot(
+            os.path.join(self.tmp_dir.name, "snapshot"), os.urandom(32))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_cold_start_fetches_batch_and_writes_snapshot(self, mock_ssm):
+        mock_ssm.get_parameters.return_value = VALUES
+
+        values = ConfigLoader(NAMES + [None], self.snapshot).load()
+
+        self.assertEqual(values, VALUES)
+        mock_ssm.get_parameters.assert_called_once_with(NAMES)
+        self.assertEqual(self.snapshot.read(), VALUES)
+        self.assertEqual(config_loader.startup_metrics["config_source"],
+                         "ssm")
+        self.assertIn("config_load_seconds", config_loader.startup_metrics)
+
+    def test_warm_start_boots_from_snapshot_and_revalidates(self, mock_ssm):
+        self.snapshot.write(VALUES)
+        updated = dict(VALUES, **{"/db/host": "db2.internal"})
+        mock_ssm.get_parameters.return_value = updated
+
+        loader = ConfigLoader(NAMES, self.snapshot)
+        values = loader.load()
+        loader.revalidation.join(1)
+
+        self.assertEqual(values, VALUES)
+        mock_ssm.cache_parameters.assert_called_once_with(VALUES)
+        self.assertEqual(config_loader.startup_metrics["config_source"],
+                         "snapshot")
+        self.assertEqual(self.snapshot.read(), updated)
+
+    def test_incomplete_snapshot_falls_back_to_ssm(self, mock_ssm):
+        self.snapshot.write({"/db/name": "app"})
+        mock_ssm.get_parameters.return_value = VALUES
+
+        values = ConfigLoader(NAMES, self.snapshot).load()
+
+        self.assertEqual(values, VALUES)
+        mock_ssm.get_parameters.assert_called_once_with(NAMES)
+
+    def test_failed_revalidation_keeps_snapshot(self, mock_ssm):
+        self.snapshot.write(VALUES)
+        mock_ssm.get_parameters.side_effect = Exception("ssm down")
+
+        loader = ConfigLoader(NAMES, self.snapshot)
+        loader.load()
+        loader.revalidation.join(1)
+
+        self.assertEqual(self.snapshot.read(), VALUES)
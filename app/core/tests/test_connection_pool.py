@@ -0,0 +1,140 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from core.db import pool as pool_module
+from core.db.backends.postgresql.base import DatabaseWrapper
+from core.db.pool import ConnectionPool, PoolTimeout
+
+
+def fake_connection():
+    connection = MagicMock()
+    connection.closed = 0
+    connection.get_transaction_status.return_value = 0
+    connection.isolation_level = None
+    return connection
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self):
+        self.connect = MagicMock(side_effect=fake_connection)
+        self.pool = ConnectionPool(self.connect, max_size=2, timeout=0.05)
+
+    def test_released_connections_are_reused(self):
+        first = self.pool.acquire()
+        self.pool.release(first)
+
+        self.assertIs(self.pool.acquire(), first)
+        self.connect.assert_called_once()
+
+    def test_pool_is_bounded_and_times_out(self):
+        self.pool.acquire()
+        self.pool.acquire()
+
+        with self.assertRaises(PoolTimeout):
+            self.pool.acquire()
+        self.assertEqual(self.pool.stats()["timeouts"], 1)
+        self.assertEqual(self.pool.stats()["utilization"], 1.0)
+
+    def test_waiter_gets_released_connection(self):
+        pool = ConnectionPool(self.connect, max_size=1, timeout=1)
+        held = pool.acquire()
+        threading.Timer(0.05, pool.release, args=(held, )).start()
+
+        self.assertIs(pool.acquire(), held)
+        self.assertGreater(pool.stats()["wait_seconds_max"], 0.01)
+
+    def test_open_transaction_is_rolled_back_on_release(self):
+        connection = self.pool.acquire()
+        connection.get_transaction_status.return_value = 2
+
+        self.pool.release(connection)
+
+        connection.rollback.assert_called_once()
+        self.assertEqual(self.pool.stats()["idle"], 1)
+
+    def test_broken_connection_is_discarded(self):
+        connection = self.pool.acquire()
+        connection.closed = 2
+
+        self.pool.release(connection)
+
+        self.assertEqual(self.pool.stats()["idle"], 0)
+        self.assertEqual(self.pool.stats()["discarded"], 1)
+        self.assertIsNot(self.pool.acquire(), connection)
+
+    def test_long_idle_connection_is_checked(self):
+        pool = ConnectionPool(self.connect, max_size=1, check_interval=0)
+        connection = pool.acquire()
+        pool.release(connection)
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.execute.side_effect = Exception("server closed")
+        time.sleep(0.01)
+
+        self.assertIsNot(pool.acquire(), connection)
+        connection.close.assert_called_once()
+
+
+@patch("django.db.backends.postgresql.base.psycopg2.extras."
+       "register_default_jsonb")
+@patch("django.db.backends.postgresql.base.Database.connect")
+class TestPooledDatabaseWrapper(unittest.TestCase):
+
+    def setUp(self):
+        pool_module.reset_pools()
+        self.settings_dict = {
+            "ENGINE": "core.db.backends.postgresql",
+            "NAME": "app",
+            "USER": "app",
+            "PASSWORD": "secret",
+            "HOST": "localhost",
+            "PORT": 5432,
+            "ATOMIC_REQUESTS": False,
+            "AUTOCOMMIT": True,
+            "CONN_MAX_AGE": 0,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {},
+            "TIME_ZONE": None,
+            "TEST": {},
+            "POOL": {
+                "MAX_SIZE": 2
+            },
+        }
+
+    def tearDown(self):
+        pool_module.reset_pools()
+
+    def test_close_returns_connection_to_pool(self, mock_connect,
+                                              mock_register):
+        mock_connect.side_effect = lambda **params: fake_connection()
+        first = DatabaseWrapper(self.settings_dict, "default")
+        second = DatabaseWrapper(self.settings_dict, "default")
+
+        first.connect()
+        raw = first.connection
+        first.close()
+        second.connect()
+
+        self.assertIs(second.connection, raw)
+        raw.close.assert_not_called()
+        mock_connect.assert_called_once()
+        self.assertNotIn("POOL", mock_connect.call_args.kwargs)
+        self.assertEqual(pool_module.pool_stats()["default"]["in_use"], 1)
+
+    def test_health_check_reconnects_unusable_connection(
+            self, mock_connect, mock_register):
+        self.settings_dict["POOL"] = None
+        mock_connect.side_effect = lambda **params: fake_connection()
+        wrapper = DatabaseWrapper(self.settings_dict, "default")
+        wrapper.connect()
+        stale = wrapper.connection
+
+        wrapper.close_if_unusable_or_obsolete = MagicMock()
+        wrapper.health_check_done = False
+        with patch.object(wrapper, "is_usable", return_value=False):
+            wrapper.ensure_connection()
+
+        self.assertIsNot(wrapper.connection, stale)
+        self.assertEqual(mock_connect.call_count, 2)
@@ -0,0 +1,119 @@
+from unittest.mock import patch
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.db import routers
+from core.db.middleware import PrimaryStickinessMiddleware
+from core.db.routers import ReplicaRouter
+from core.models import User
+
+
+@override_settings(READ_REPLICAS=["replica_1", "replica_2"],
+                   PRIMARY_STICKY_SECONDS=10)
+class TestReplicaRouter(SimpleTestCase):
+
+    def setUp(self):
+        routers.reset_stickiness()
+        self.router = ReplicaRouter()
+
+    def tearDown(self):
+        routers.reset_stickiness()
+
+    @patch("core.db.routers.replica_status")
+    def test_reads_go_to_healthy_replicas(self, mock_status):
+        mock_status.return_value = {
+            "replica_1": {"ok": False, "lag_seconds": 60.0},
+            "replica_2": {"ok": True, "lag_seconds": 0.1},
+        }
+
+        self.assertEqual(self.router.db_for_read(User), "replica_2")
+
+    @patch("core.db.routers.replica_status")
+    def test_reads_fall_back_to_primary(self, mock_status):
+        mock_status.return_value = {
+            "replica_1": {"ok": False, "error": "connection refused"},
+            "replica_2": {"ok": False, "lag_seconds": 60.0},
+        }
+
+        self.assertEqual(self.router.db_for_read(User), "default")
+
+    @patch("core.db.routers.replica_status")
+    def test_reads_stick_to_primary_after_write(self, mock_status):
+        mock_status.return_value = {"replica_1": {"ok": True}}
+
+        self.assertEqual(self.router.db_for_write(User), "default")
+        self.assertEqual(self.router.db_for_read(User), "default")
+        self.assertTrue(routers.wrote_to_primary())
+
+    @patch("core.db.routers.time.monotonic")
+    @patch("core.db.routers.replica_status")
+    def test_stickiness_expires(self, mock_status, mock_monotonic):
+        mock_status.return_value = {"replica_1": {"ok": True}}
+        mock_monotonic.return_value = 100
+        self.router.db_for_write(User)
+
+        mock_monotonic.return_value = 111
+
+        self.assertEqual(self.router.db_for_read(User), "replica_1")
+
+    def test_migrations_only_run_on_primary(self):
+        self.assertTrue(self.router.allow_migrate("default", "core"))
+        self.assertFalse(self.router.allow_migrate("replica_1", "core"))
+
+    @override_settings(READ_REPLICAS=[])
+    def test_without_replicas_reads_use_primary(self):
+        self.assertEqual(self.router.db_for_read(User), "default")
+
+    @override_settings(REPLICA_MAX_LAG_SECONDS=5)
+    @patch("core.db.routers.connections")
+    def test_probe_replica_reports_lag(self, mock_connections):
+        cursor = mock_connections.__getitem__.return_value.cursor.return_value
+        cursor.__enter__.return_value.fetchone.return_value = (7.5, )
+
+        self.assertEqual(routers.probe_replica("replica_1"), {
+            "ok": False,
+            "lag_seconds": 7.5
+        })
+
+
+@override_settings(READ_REPLICAS=["replica_1"],
+                   PRIMARY_STICKY_SECONDS=10,
+                   PRIMARY_STICKY_COOKIE="primary_until")
+class TestPrimaryStickinessMiddleware(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def tearDown(self):
+        routers.reset_stickiness()
+
+    def test_write_sets_cookie(self):
+        middleware = PrimaryStickinessMiddleware(
+            lambda request: ReplicaRouter().db_for_write(User) and
+            HttpResponse())
+
+        response = middleware(self.factory.post("/"))
+
+        self.assertIn("primary_until", response.cookies)
+        self.assertFalse(routers.pinned_to_primary())
+
+    def test_read_only_request_sets_no_cookie(self):
+        middleware = PrimaryStickinessMiddleware(lambda request: HttpResponse())
+
+        response = middleware(self.factory.get("/"))
+
+        self.assertNotIn("primary_until", response.cookies)
+
+    @patch("core.db.middleware.time.time", return_value=1000)
+    def test_cookie_pins_request_to_primary(self, mock_time):
+        seen = []
+        middleware = PrimaryStickinessMiddleware(
+            lambda request: seen.append(routers.pinned_to_primary()) or
+            HttpResponse())
+        request = self.factory.get("/")
+        request.COOKIES["primary_until"] = "1005"
+
+        middleware(request)
+
+        self.assertEqual(seen, [True])
@@ -0,0 +1,86 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from core.utils import health
+from core.utils.health import CachedCheck
+
+
+class TestCachedCheck(SimpleTestCase):
+
+    @patch("core.utils.health.time.monotonic")
+    def test_result_is_cached_for_ttl(self, mock_monotonic):
+        check = MagicMock(return_value={"ok": True})
+        cached = CachedCheck("database", check, ttl=5)
+
+        mock_monotonic.return_value = 0
+        cached()
+        mock_monotonic.return_value = 4
+        cached()
+        mock_monotonic.return_value = 6
+        cached()
+
+        self.assertEqual(check.call_count, 2)
+
+    def test_failed_check_is_reported(self):
+        cached = CachedCheck("database", MagicMock(side_effect=Exception("x")),
+                             ttl=5)
+
+        self.assertEqual(cached(), {"ok": False, "error": "x"})
+
+
+class TestHealthEndpoints(SimpleTestCase):
+
+    def setUp(self):
+        for check in health.readiness_checks:
+            check.reset()
+
+    def test_healthz(self):
+        response = self.client.get(reverse("healthz"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"], {"status": "alive"})
+
+    @patch("core.utils.health.probe_database")
+    @patch("core.utils.health.cache")
+    def test_readyz_ready(self, mock_cache, mock_probe):
+        mock_cache.health.return_value = {"healthy": True, "state": "healthy"}
+
+        response = self.client.get(reverse("readyz"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["data"]["database"]["ok"])
+
+    @patch("core.utils.health.probe_database")
+    def test_readyz_database_down(self, mock_probe):
+        mock_probe.side_effect = Exception("connection refused")
+
+        response = self.client.get(reverse("readyz"))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(response.json()["details"]["database"]["ok"])
+
+    @patch("core.utils.health.probe_database")
+    @patch("core.utils.health.cache")
+    def test_degraded_cache_keeps_instance_ready(self, mock_cache,
+                                                 mock_probe):
+        mock_cache.health.return_value = {
+            "healthy": False,
+            "state": "degraded"
+        }
+
+        self.assertEqual(self.client.get(reverse("readyz")).status_code, 200)
+
+        for check in health.readiness_checks:
+            check.reset()
+        with override_settings(READINESS_REQUIRE_CACHE=True):
+            self.assertEqual(
+                self.client.get(reverse("readyz")).status_code, 503)
+
+    @patch("core.utils.health.probe_database")
+    def test_readyz_does_not_hit_database_on_every_probe(self, mock_probe):
+        for _ in range(5):
+            self.client.get(reverse("readyz"))
+
+        mock_probe.assert_called_once()
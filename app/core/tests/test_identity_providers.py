@@ -0,0 +1,127 @@
+import unittest
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from core.utils.identity_providers import (CognitoIdentityProvider,
+                                           InMemoryIdentityProvider,
+                                           get_identity_provider)
+
+
+class TestCognitoIdentityProvider(unittest.TestCase):
+
+    def setUp(self):
+        self.provider = CognitoIdentityProvider()
+
+    @patch("core.utils.identity_providers.cognito_util")
+    def test_delegates_to_cognito_util(self, mock_cognito_util):
+        mock_cognito_util.authenticate.return_value = "fake-id-token"
+
+        token = self.provider.authenticate("testuser", "testpass")
+        self.provider.register_user("testuser", "testpass",
+                                    "test@example.com")
+        self.provider.complete_password_reset("testuser", "newpass", "123456")
+
+        self.assertEqual(token, "fake-id-token")
+        mock_cognito_util.authenticate.assert_called_once_with(
+            "testuser", "testpass")
+        mock_cognito_util.register_user.assert_called_once_with(
+            "testuser", "testpass", "test@example.com")
+        mock_cognito_util.complete_password_reset.assert_called_once_with(
+            "testuser", "newpass", "123456")
+
+
+class TestInMemoryIdentityProvider(unittest.TestCase):
+
+    def setUp(self):
+        self.provider = InMemoryIdentityProvider(CONFIRMATION_CODE="654321")
+
+    def test_full_registration_and_login_flow(self):
+        self.provider.register_user("testuser", "testpass", "t@example.com")
+        self.provider.confirm_user_registration("testuser", "654321")
+
+        token = self.provider.authenticate("testuser", "testpass")
+
+        self.assertTrue(token)
+
+    def test_authenticate_requires_confirmation(self):
+        self.provider.register_user("testuser", "testpass", "t@example.com")
+
+        with self.assertRaises(Exception) as context:
+            self.provider.authenticate("testuser", "testpass")
+        self.assertIn("Authentication failed", str(context.exception))
+
+    def test_auto_confirm(self):
+        provider = InMemoryIdentityProvider(AUTO_CONFIRM=True)
+        provider.register_user("testuser", "testpass", "t@example.com")
+
+        self.assertTrue(provider.authenticate("testuser", "testpass"))
+
+    def test_wrong_password_fails(self):
+        self.provider.register_user("testuser", "testpass", "t@example.com")
+        self.provider.confirm_user_registration("testuser", "654321")
+
+        with self.assertRaises(Exception):
+            self.provider.authenticate("testuser", "wrongpass")
+
+    def test_duplicate_registration_fails(self):
+        self.provider.register_user("testuser", "testpass", "t@example.com")
+
+        with self.assertRaises(Exception) as context:
+            self.provider.register_user("testuser", "other", "o@example.com")
+        self.assertIn("Registration failed", str(context.exception))
+
+    def test_invalid_confirmation_code_fails(self):
+        self.provider.register_user("testuser", "testpass", "t@example.com")
+
+        with self.assertRaises(Exception) as context:
+            self.provider.confirm_user_registration("testuser", "000000")
+        self.assertIn("User confirmation failed", str(context.exception))
+
+    def test_password_reset_flow(self):
+        self.provider.register_user("testuser", "testpass", "t@example.com")
+        self.provider.confirm_user_registration("testuser", "654321")
+
+        self.provider.initiate_password_reset("testuser")
+        self.provider.complete_password_reset("testuser", "newpass", "654321")
+
+        self.assertTrue(self.provider.authenticate("testuser", "newpass"))
+
+    def test_error_rate_injects_failures(self):
+        provider = InMemoryIdentityProvider(ERROR_RATE=1)
+
+        with self.assertRaises(Exception) as context:
+            provider.register_user("testuser", "testpass", "t@example.com")
+        self.assertIn("Injected failure", str(context.exception))
+
+    @patch("core.utils.identity_providers.time.sleep")
+    def test_latency_is_applied(self, mock_sleep):
+        provider = InMemoryIdentityProvider(LATENCY_MS=50,
+                                            LATENCY_JITTER_MS=10,
+                                            SEED=1)
+
+        provider.register_user("testuser", "testpass", "t@example.com")
+
+        delay = mock_sleep.call_args[0][0]
+        self.assertGreaterEqual(delay, 0.05)
+        self.assertLessEqual(delay, 0.06)
+
+
+class TestGetIdentityProvider(SimpleTestCase):
+
+    def tearDown(self):
+        get_identity_provider.cache_clear()
+
+    @override_settings(
+        IDENTITY_PROVIDER_BACKEND=(
+            "core.utils.identity_providers.InMemoryIdentityProvider"),
+        IDENTITY_PROVIDER_OPTIONS={"CONFIRMATION_CODE": "1"},
+    )
+    def test_returns_configured_backend_once(self):
+        get_identity_provider.cache_clear()
+
+        provider = get_identity_provider()
+
+        self.assertIsInstance(provider, InMemoryIdentityProvider)
+        self.assertEqual(provider.confirmation_code, "1")
+        self.assertIs(get_identity_provider(), provider)
@@ -0,0 +1,83 @@
+import boto3
+from botocore.stub import Stubber
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from core.middleware import RequestTimingMiddleware
+from core.models import User
+from core.utils import instrumentation
+
+
+class TestInstrumentation(TestCase):
+
+    def test_nothing_is_recorded_outside_a_request(self):
+        instrumentation.record("db", 1.0)
+
+        token = instrumentation.start_request()
+        self.assertEqual(instrumentation.finish_request(token), {})
+
+    def test_record_adds_time_and_calls(self):
+        token = instrumentation.start_request()
+        instrumentation.record("db", 0.25)
+        instrumentation.record("db", 0.5)
+        with instrumentation.timed("redis"):
+            pass
+
+        timings = instrumentation.finish_request(token)
+
+        self.assertEqual(timings["db"], [0.75, 2])
+        self.assertEqual(timings["redis"][1], 1)
+
+    def test_server_timing_header(self):
+        header = instrumentation.server_timing({"db": [0.0123, 3]}, 0.05)
+
+        self.assertEqual(header,
+                         'db;dur=12.30;desc="3 calls", total;dur=50.00')
+
+    def test_boto3_calls_are_timed(self):
+        client = boto3.client("kms",
+                              region_name="us-east-1",
+                              aws_access_key_id="test",
+                              aws_secret_access_key="test")
+        instrumentation.instrument_boto3_client(client)
+        stubber = Stubber(client)
+        stubber.add_response("list_keys", {"Keys": []})
+        stubber.add_client_error("list_aliases", "AccessDeniedException")
+
+        token = instrumentation.start_request()
+        with stubber:
+            client.list_keys()
+            with self.assertRaises(client.exceptions.ClientError):
+                client.list_aliases()
+        timings = instrumentation.finish_request(token)
+
+        self.assertEqual(timings["kms"][1], 2)
+
+
+class TestRequestTimingMiddleware(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+        def view(request):
+            User.objects.count()
+            User.objects.filter(username="alice").exists()
+            return HttpResponse()
+
+        self.middleware = RequestTimingMiddleware(view)
+
+    @override_settings(REQUEST_TIMING_ENABLED=True)
+    def test_database_time_is_reported(self):
+        with self.assertLogs("core.middleware", level="INFO") as logs:
+            response = self.middleware(self.factory.get("/users"))
+
+        self.assertIn('db;dur=', response["Server-Timing"])
+        self.assertIn('desc="2 calls"', response["Server-Timing"])
+        self.assertEqual(logs.records[0].timings["db"]["calls"], 2)
+        self.assertFalse(instrumentation.active())
+
+    @override_settings(REQUEST_TIMING_ENABLED=False)
+    def test_disabled_adds_no_header(self):
+        response = self.middleware(self.factory.get("/users"))
+
+        self.assertNotIn("Server-Timing", response)
@@ -1,4 +1,5 @@
 import base64
+import os
 import unittest
 from unittest.mock import patch
 
@@ -9,6 +10,10 @@ import core.utils.kms_util as kms_util
 
 class TestKMSUtil(unittest.TestCase):
 
+    def setUp(self):
+        kms_util.clear_key_caches()
+
+    @patch("core.utils.kms_util.ENVELOPE_ENCRYPTION_ENABLED", False)
     @patch("core.utils.kms_util.kms_client")
     def test_encrypt_password_success(self, mock_kms_client):
         # Prepare the fake response for a successful encryption.
@@ -30,6 +35,7 @@ class TestKMSUtil(unittest.TestCase):
         mock_kms_client.encrypt.assert_called_with(
             KeyId=kms_key_id, Plaintext=password.encode("utf-8"))
 
+    @patch("core.utils.kms_util.ENVELOPE_ENCRYPTION_ENABLED", False)
     @patch("core.utils.kms_util.kms_client")
     def test_encrypt_password_no_ciphertext_blob(self, mock_kms_client):
         # Simulate a response that does not contain CiphertextBlob.
@@ -41,6 +47,7 @@ class TestKMSUtil(unittest.TestCase):
             kms_util.encrypt_password(password, kms_key_id)
         self.assertIn("Failed to encrypt password", str(context.exception))
 
+    @patch("core.utils.kms_util.ENVELOPE_ENCRYPTION_ENABLED", False)
     @patch("core.utils.kms_util.kms_client")
     def test_encrypt_password_client_error(self, mock_kms_client):
         # Simulate a ClientError being raised by kms_client.encrypt.
@@ -123,3 +130,159 @@ class TestKMSUtil(unittest.TestCase):
             kms_util.decrypt_password(encrypted_password, kms_key_id)
         self.assertIn("Failed to decrypt password", str(context.exception))
         self.assertIsNotNone(context.exception.__cause__)
+
+
+class TestKMSEnvelopeEncryption(unittest.TestCase):
+
+    def setUp(self):
+        kms_util.clear_key_caches()
+        self.kms_key_id = "fake-key-id"
+        self.data_key = os.urandom(32)
+        self.wrapped_key = b"wrapped-data-key"
+
+    def configure_kms(self, mock_kms_client):
+        mock_kms_client.generate_data_key.return_value = {
+            "Plaintext": self.data_key,
+            "CiphertextBlob": self.wrapped_key,
+        }
+        mock_kms_client.decrypt.return_value = {"Plaintext": self.data_key}
+
+    @patch("core.utils.kms_util.kms_client")
+    def test_envelope_round_trip(self, mock_kms_client):
+        self.configure_kms(mock_kms_client)
+
+        encrypted = kms_util.encrypt_password("my_password", self.kms_key_id)
+        kms_util.clear_key_caches()
+        decrypted = kms_util.decrypt_password(encrypted, self.kms_key_id)
+
+        self.assertTrue(encrypted.startswith(kms_util.ENVELOPE_PREFIX))
+        self.assertNotIn("my_password", encrypted)
+        self.assertEqual(decrypted, "my_password")
+        mock_kms_client.encrypt.assert_not_called()
+        mock_kms_client.decrypt.assert_called_once_with(
+            KeyId=self.kms_key_id, CiphertextBlob=self.wrapped_key)
+
+    @patch("core.utils.kms_util.kms_client")
+    def test_envelope_stores_wrapped_key(self, mock_kms_client):
+        self.configure_kms(mock_kms_client)
+
+        encrypted = kms_util.encrypt_password("my_password", self.kms_key_id)
+        wrapped_key, nonce, ciphertext = kms_util.unpack_envelope(encrypted)
+
+        self.assertEqual(wrapped_key, self.wrapped_key)
+        self.assertEqual(len(nonce), kms_util.NONCE_SIZE)
+        self.assertNotEqual(ciphertext, b"my_password")
+
+    @patch("core.utils.kms_util.kms_client")
+    def test_data_key_is_reused_until_max_uses(self, mock_kms_client):
+        self.configure_kms(mock_kms_client)
+        cache = kms_util.DataKeyCache(max_uses=2, max_age=300)
+
+        with patch("core.utils.kms_util.data_key_cache", cache):
+            for _ in range(3):
+                kms_util.encrypt_password("my_password", self.kms_key_id)
+
+        self.assertEqual(mock_kms_client.generate_data_key.call_count, 2)
+        mock_kms_client.generate_data_key.assert_called_with(
+            KeyId=self.kms_key_id, KeySpec="AES_256")
+
+    @patch("core.utils.kms_util.time.monotonic")
+    @patch("core.utils.kms_util.kms_client")
+    def test_data_key_expires_after_max_age(self, mock_kms_client,
+                                            mock_monotonic):
+        self.configure_kms(mock_kms_client)
+        cache = kms_util.DataKeyCache(max_uses=100, max_age=60)
+
+        mock_monotonic.return_value = 0
+        cache.get(self.kms_key_id)
+        mock_monotonic.return_value = 30
+        cache.get(self.kms_key_id)
+        mock_monotonic.return_value = 61
+        cache.get(self.kms_key_id)
+
+        self.assertEqual(mock_kms_client.generate_data_key.call_count, 2)
+
+    @patch("core.utils.kms_util.kms_client")
+    def test_decrypt_caches_keys_by_wrapped_key(self, mock_kms_client):
+        self.configure_kms(mock_kms_client)
+        first = kms_util.encrypt_password("first", self.kms_key_id)
+        second = kms_util.encrypt_password("second", self.kms_key_id)
+        kms_util.clear_key_caches()
+
+        self.assertEqual(kms_util.decrypt_password(first, self.kms_key_id),
+                         "first")
+        self.assertEqual(kms_util.decrypt_password(second, self.kms_key_id),
+                         "second")
+
+        mock_kms_client.decrypt.assert_called_once()
+
+    def test_decrypted_key_cache_is_bounded(self):
+        cache = kms_util.DecryptedKeyCache(max_size=2, max_age=300)
+
+        cache.set(b"a", b"key-a")
+        cache.set(b"b", b"key-b")
+        cache.get(b"a")
+        cache.set(b"c", b"key-c")
+
+        self.assertEqual(cache.get(b"a"), b"key-a")
+        self.assertIsNone(cache.get(b"b"))
+        self.assertEqual(cache.get(b"c"), b"key-c")
+
+    @patch("core.utils.kms_util.kms_client")
+    def test_tampered_envelope_fails(self, mock_kms_client):
+        self.configure_kms(mock_kms_client)
+        encrypted = kms_util.encrypt_password("my_password", self.kms_key_id)
+        wrapped_key, nonce, ciphertext = kms_util.unpack_envelope(encrypted)
+        tampered = kms_util.pack_envelope(wrapped_key, nonce,
+                                          bytes([ciphertext[0] ^ 1]) +
+                                          ciphertext[1:])
+
+        with self.assertRaises(Exception) as context:
+            kms_util.decrypt_password(tampered, self.kms_key_id)
+        self.assertIn("Failed to decrypt password", str(context.exception))
+
+
+class TestKMSReEncrypt(unittest.TestCase):
+
+    def setUp(self):
+        kms_util.clear_key_caches()
+
+    @patch("core.utils.kms_util.kms_client")
+    def test_reencrypt_envelope_rewraps_data_key_only(self, mock_kms_client):
+        envelope = kms_util.pack_envelope(b"old-wrapped", b"n" * 12,
+                                          b"ciphertext")
+        mock_kms_client.re_encrypt.return_value = {
+            "CiphertextBlob": b"new-wrapped"
+        }
+
+        rotated = kms_util.reencrypt_password(envelope, "new-key")
+
+        mock_kms_client.re_encrypt.assert_called_once_with(
+            CiphertextBlob=b"old-wrapped", DestinationKeyId="new-key")
+        self.assertEqual(kms_util.unpack_envelope(rotated),
+                         (b"new-wrapped", b"n" * 12, b"ciphertext"))
+
+    @patch("core.utils.kms_util.kms_client")
+    def test_reencrypt_legacy_ciphertext(self, mock_kms_client):
+        legacy = base64.b64encode(b"old-blob").decode("utf-8")
+        mock_kms_client.re_encrypt.return_value = {
+            "CiphertextBlob": b"new-blob"
+        }
+
+        rotated = kms_util.reencrypt_password(legacy, "new-key")
+
+        mock_kms_client.re_encrypt.assert_called_once_with(
+            CiphertextBlob=b"old-blob", DestinationKeyId="new-key")
+        self.assertEqual(rotated, base64.b64encode(b"new-blob").decode())
+
+    @patch("core.utils.kms_util.kms_client")
+    def test_reencrypt_client_error(self, mock_kms_client):
+        mock_kms_client.re_encrypt.side_effect = ClientError(
+            {"Error": {
+                "Code": "AccessDeniedException",
+                "Message": "Denied"
+            }}, "ReEncrypt")
+
+        with self.assertRaises(Exception) as context:
+            kms_util.reencrypt_blob(b"blob", "new-key")
+        self.assertIn("Failed to re-encrypt password", str(context.exception))
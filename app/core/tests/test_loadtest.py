@@ -0,0 +1,37 @@
+from django.test import SimpleTestCase
+
+from core.management.commands.loadtest import LoadTest, percentile, summarize
+
+
+class TestLoadTestReport(SimpleTestCase):
+
+    def test_percentile_is_nearest_rank(self):
+        values = [float(i) for i in range(1, 101)]
+
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([0.2], 95), 0.2)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_summarize(self):
+        summary = summarize({
+            "register": [0.1, 0.3, 0.2],
+            "get_user": []
+        }, {
+            "register": 1,
+            "authenticate": 2
+        }, 2.0)
+
+        self.assertEqual(set(summary), {"register", "authenticate"})
+        self.assertEqual(summary["register"]["requests"], 3)
+        self.assertEqual(summary["register"]["errors"], 1)
+        self.assertAlmostEqual(summary["register"]["rps"], 1.5)
+        self.assertAlmostEqual(summary["register"]["p50_ms"], 200)
+        self.assertAlmostEqual(summary["register"]["max_ms"], 300)
+        self.assertEqual(summary["authenticate"]["requests"], 0)
+
+    def test_base_url(self):
+        load_test = LoadTest("http://localhost:8011/prefix/", 1, 1)
+
+        self.assertEqual((load_test.host, load_test.port, load_test.prefix),
+                         ("localhost", 8011, "/prefix"))
@@ -3,11 +3,13 @@ import io
 import json
 import logging
 import unittest
+from unittest.mock import patch
 
 from pythonjsonlogger import jsonlogger
 
 # Import the function to test from your module.
-from core.utils.logger import get_logger
+from core.utils.logger import (LogPipeline, PipelineHandler, SamplingFilter,
+                               get_logger, log_pipeline, parse_sample_rates)
 
 
 class TestLoggerConfiguration(unittest.TestCase):
@@ -20,24 +22,24 @@ class TestLoggerConfiguration(unittest.TestCase):
         self.assertEqual(logger.level, logging.INFO)
 
     def test_handler_and_formatter_configuration(self):
-        """Test that the logger has a StreamHandler with JsonFormatter."""
+        """Test that the logger enqueues to the pipeline, whose listener
+        writes with a StreamHandler using JsonFormatter."""
         logger = get_logger("handler_test_logger")
         # Ensure that at least one handler is attached.
         self.assertGreater(len(logger.handlers), 0)
 
-        # Find at least one StreamHandler.
-        stream_handlers = [
+        pipeline_handlers = [
             handler for handler in logger.handlers
-            if isinstance(handler, logging.StreamHandler)
+            if isinstance(handler, PipelineHandler)
         ]
-        self.assertGreater(len(stream_handlers), 0,
-                           "No StreamHandler found in logger.handlers")
+        self.assertGreater(len(pipeline_handlers), 0,
+                           "No PipelineHandler found in logger.handlers")
 
         # Check that the formatter is an instance of jsonlogger.JsonFormatter.
-        for handler in stream_handlers:
-            self.assertIsNotNone(handler.formatter,
-                                 "Handler has no formatter set")
-            self.assertIsInstance(handler.formatter, jsonlogger.JsonFormatter)
+        stream_handler = log_pipeline.stream_handler
+        self.assertIsInstance(stream_handler, logging.StreamHandler)
+        self.assertIsInstance(stream_handler.formatter,
+                              jsonlogger.JsonFormatter)
 
     def test_logging_output_is_valid_json(self):
         """Test that logging an INFO message produces valid JSON output with
@@ -78,3 +80,63 @@ class TestLoggerConfiguration(unittest.TestCase):
         self.assertEqual(log_record["message"], test_message)
         self.assertEqual(log_record["levelname"], "INFO")
         self.assertEqual(log_record["name"], "json_output_test")
+
+
+class TestLogPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.pipeline = LogPipeline(maxsize=2)
+        self.pipeline.stream_handler.setStream(self.stream)
+        self.logger = logging.getLogger("pipeline_test_logger")
+        self.logger.handlers = [PipelineHandler(self.pipeline)]
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+
+    def tearDown(self):
+        self.pipeline.stop()
+
+    def test_records_are_written_by_the_listener(self):
+        self.logger.info("[Test] Hello %s", "world")
+        self.pipeline.stop()
+
+        record = json.loads(self.stream.getvalue())
+        self.assertEqual(record["message"], "[Test] Hello world")
+
+    def test_exception_is_rendered_before_enqueue(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            self.logger.error("[Test] Failed", exc_info=True)
+        self.pipeline.stop()
+
+        record = json.loads(self.stream.getvalue())
+        self.assertIn("ValueError: boom", record["exc_info"])
+
+    @patch("core.utils.logger.QueueListener")
+    def test_full_queue_drops_and_counts(self, mock_listener):
+        # The mocked listener never drains the queue.
+        for index in range(5):
+            self.logger.info("[Test] Record %s", index)
+
+        self.assertEqual(self.pipeline.stats()["dropped"], 3)
+        self.assertEqual(self.pipeline.stats()["queued"], 2)
+
+
+class TestSampling(unittest.TestCase):
+
+    def test_parse_sample_rates(self):
+        self.assertEqual(
+            parse_sample_rates("core.a=0.1, core.b=2,"), {
+                "core.a": 0.1,
+                "core.b": 1.0
+            })
+
+    def test_info_is_sampled_but_warnings_are_kept(self):
+        sampling = SamplingFilter(0.0)
+        info = logging.LogRecord("x", logging.INFO, "", 0, "m", None, None)
+        warning = logging.LogRecord("x", logging.WARNING, "", 0, "m", None,
+                                    None)
+
+        self.assertFalse(sampling.filter(info))
+        self.assertTrue(sampling.filter(warning))
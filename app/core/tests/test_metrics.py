@@ -0,0 +1,167 @@
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+from unittest.mock import MagicMock, patch
+
+import boto3
+from botocore.stub import Stubber
+from django.test import SimpleTestCase
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from core.utils import config_loader, metrics
+from core.utils.cache_util import ResilientCache
+
+
+APP_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestCacheKeyPrefix(SimpleTestCase):
+
+    def test_prefix_is_taken_from_the_key(self):
+        self.assertEqual(metrics.cache_key_prefix("user:alice"), "user")
+
+    def test_unbounded_keys_are_grouped(self):
+        self.assertEqual(metrics.cache_key_prefix("alice"), "other")
+        self.assertEqual(metrics.cache_key_prefix("12345:x"), "other")
+        self.assertEqual(metrics.cache_key_prefix("User@x:1"), "other")
+
+
+class TestMetrics(SimpleTestCase):
+
+    def test_cache_hits_and_misses_are_counted(self):
+        client = MagicMock()
+        client.get.side_effect = [b"cached", None]
+        cache = ResilientCache(client_factory=lambda: client)
+        cache._client = client
+        hits = sample("cache_operations_total",
+                      operation="get",
+                      prefix="user",
+                      result="hit")
+        misses = sample("cache_operations_total",
+                        operation="get",
+                        prefix="user",
+                        result="miss")
+
+        cache.get("user:alice")
+        cache.get("user:bob")
+
+        self.assertEqual(
+            sample("cache_operations_total",
+                   operation="get",
+                   prefix="user",
+                   result="hit"), hits + 1)
+        self.assertEqual(
+            sample("cache_operations_total",
+                   operation="get",
+                   prefix="user",
+                   result="miss"), misses + 1)
+
+    def test_repository_methods_are_timed(self):
+
+        class ExampleRepository:
+
+            @metrics.observe_repository
+            def find(self, id):
+                return id
+
+        self.assertEqual(ExampleRepository().find(7), 7)
+        self.assertEqual(
+            sample("repository_method_duration_seconds_count",
+                   repository="ExampleRepository",
+                   method="find"), 1)
+
+    def test_aws_calls_are_observed_per_operation(self):
+        client = boto3.client("ssm",
+                              region_name="us-east-1",
+                              aws_access_key_id="test",
+                              aws_secret_access_key="test")
+        metrics.instrument_boto3_client(client)
+        before = sample("aws_call_duration_seconds_count",
+                        service="ssm",
+                        operation="GetParameters",
+                        outcome="ok")
+
+        with Stubber(client) as stubber:
+            stubber.add_response("get_parameters", {"Parameters": []})
+            client.get_parameters(Names=["/a"])
+
+        self.assertEqual(
+            sample("aws_call_duration_seconds_count",
+                   service="ssm",
+                   operation="GetParameters",
+                   outcome="ok"), before + 1)
+
+    def test_startup_measurements_are_exported(self):
+        with patch.dict(config_loader.startup_metrics, {
+                "config_load_seconds": 0.25,
+                "config_source": "snapshot",
+                "startup_seconds": 1.5,
+        }):
+            metrics.record_startup()
+
+        self.assertEqual(sample("config_load_seconds", source="snapshot"),
+                         0.25)
+        self.assertEqual(sample("app_startup_seconds"), 1.5)
+
+    def test_metrics_endpoint_reports_views(self):
+        self.client.get(reverse("healthz"))
+
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            b'http_request_duration_seconds_count{method="GET",'
+            b'status="2xx",view="healthz"}', response.content)
+
+    def test_unknown_paths_share_one_label(self):
+        self.client.get("/no-such-page/12345")
+
+        content = self.client.get(reverse("metrics")).content
+
+        self.assertIn(b'view="unmatched"', content)
+        self.assertNotIn(b"12345", content)
+
+
+class TestStartupMetricsUnderGunicorn(SimpleTestCase):
+
+    def test_preloaded_startup_time_is_exported(self):
+        # Load the config and then the app as the gunicorn master does, and
+        # read the gauges back from the multiprocess files.
+        script = textwrap.dedent("""
+            import runpy
+
+            import django
+            from prometheus_client import CollectorRegistry, multiprocess
+
+            runpy.run_path("gunicorn.conf.py")
+            django.setup()
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            print(registry.get_sample_value("app_startup_seconds"))
+        """)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            env = dict(os.environ,
+                       DJANGO_SETTINGS_MODULE="app.settings",
+                       DJANGO_ENV="test",
+                       REDIS_URL=os.environ.get("REDIS_URL",
+                                                "redis://localhost:6379"),
+                       PROMETHEUS_MULTIPROC_DIR=os.path.join(
+                           tmp_dir, "prometheus"))
+            env.pop("PROMETHEUS_MULTIPROC_DIR_OWNER", None)
+            result = subprocess.run([sys.executable, "-c", script],
+                                    cwd=APP_DIR,
+                                    env=env,
+                                    capture_output=True,
+                                    text=True,
+                                    timeout=60)
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertGreater(float(result.stdout.splitlines()[-1]), 0)
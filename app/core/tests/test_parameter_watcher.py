@@ -0,0 +1,93 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from core.utils import ssm_util
+from core.utils.parameter_watcher import ParameterWatcher
+
+
+def records(values, version=1):
+    return {
+        name: {
+            "Name": name,
+            "Value": value,
+            "Version": version
+        }
+        for name, value in values.items()
+    }
+
+
+@patch("core.utils.parameter_watcher.ssm_util.fetch_parameter_records")
+class TestParameterWatcher(unittest.TestCase):
+
+    def setUp(self):
+        ssm_util.clear_parameter_cache()
+        ssm_util.cache_parameters({"/redis-url": "redis://a", "/key": "k1"})
+        self.watcher = ParameterWatcher(interval=60)
+
+    def tearDown(self):
+        ssm_util.clear_parameter_cache()
+
+    def test_unchanged_parameters_notify_nobody(self, mock_fetch):
+        mock_fetch.return_value = records({
+            "/redis-url": "redis://a",
+            "/key": "k1"
+        })
+        callback = MagicMock()
+        self.watcher.subscribe("/redis-url", callback)
+
+        self.assertEqual(self.watcher.check(), [])
+        callback.assert_not_called()
+
+    def test_new_version_is_swapped_in_and_notified(self, mock_fetch):
+        callback = MagicMock()
+        self.watcher.subscribe("/redis-url", callback)
+        mock_fetch.return_value = records({
+            "/redis-url": "redis://a",
+            "/key": "k1"
+        })
+        self.watcher.check()
+        mock_fetch.return_value = records(
+            {
+                "/redis-url": "redis://b",
+                "/key": "k1"
+            }, version=2)
+
+        self.assertEqual(self.watcher.check(), ["/key", "/redis-url"])
+
+        self.assertEqual(ssm_util.cached_parameters()["/redis-url"],
+                         "redis://b")
+        callback.assert_called_once_with("/redis-url", "redis://b")
+
+    def test_failing_subscriber_does_not_stop_others(self, mock_fetch):
+        mock_fetch.return_value = records({
+            "/redis-url": "redis://b",
+            "/key": "k1"
+        })
+        failing = MagicMock(side_effect=Exception("boom"))
+        other = MagicMock()
+        self.watcher.subscribe("/redis-url", failing)
+        self.watcher.subscribe("/redis-url", other)
+
+        self.watcher.check()
+
+        other.assert_called_once_with("/redis-url", "redis://b")
+
+    def test_nothing_cached_makes_no_calls(self, mock_fetch):
+        ssm_util.clear_parameter_cache()
+
+        self.assertEqual(self.watcher.check(), [])
+        mock_fetch.assert_not_called()
+
+    @patch("core.utils.parameter_watcher.random.uniform")
+    def test_polling_is_jittered(self, mock_uniform, mock_fetch):
+        mock_uniform.side_effect = lambda low, high: high
+
+        self.assertEqual(self.watcher._delay(first=True), 60)
+        self.assertEqual(self.watcher._delay(first=False), 72)
+
+    def test_disabled_watcher_does_not_start(self, mock_fetch):
+        watcher = ParameterWatcher(interval=0)
+
+        watcher.start()
+
+        self.assertIsNone(watcher._thread)
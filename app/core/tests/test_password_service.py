@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 # Import the PasswordService class.
 from core.services.password_service import PasswordService
@@ -8,7 +8,8 @@ from core.services.password_service import PasswordService
 class TestPasswordService(unittest.TestCase):
 
     def setUp(self):
-        self.service = PasswordService()
+        self.identity_provider = MagicMock()
+        self.service = PasswordService(self.identity_provider)
         self.username = "testuser"
         self.new_password = "newpass"
         self.confirmation_code = "123456"
@@ -59,10 +60,8 @@ class TestPasswordService(unittest.TestCase):
 
     # --- Tests for initiate_user_password_reset ---
 
-    @patch('core.services.password_service.initiate_password_reset')
     @patch('core.services.password_service.logger')
-    def test_initiate_user_password_reset_success(self, mock_logger,
-                                                  mock_initiate):
+    def test_initiate_user_password_reset_success(self, mock_logger):
         """
         Test that initiate_user_password_reset calls initiate_password_reset
         correctly.
@@ -71,18 +70,18 @@ class TestPasswordService(unittest.TestCase):
         self.service.initiate_user_password_reset(self.username)
         # Verify that initiate_password_reset was called with the correct
         # username.
-        mock_initiate.assert_called_once_with(self.username)
+        self.identity_provider.initiate_password_reset.assert_called_once_with(
+            self.username)
         self.assertTrue(mock_logger.info.called)
 
-    @patch('core.services.password_service.initiate_password_reset')
     @patch('core.services.password_service.logger')
-    def test_initiate_user_password_reset_failure(self, mock_logger,
-                                                  mock_initiate):
+    def test_initiate_user_password_reset_failure(self, mock_logger):
         """
         Test that initiate_user_password_reset raises an exception if the
         underlying call fails.
         """
-        mock_initiate.side_effect = Exception("Reset error")
+        self.identity_provider.initiate_password_reset.side_effect = (
+            Exception("Reset error"))
         with self.assertRaises(Exception) as context:
             self.service.initiate_user_password_reset(self.username)
         self.assertIn("Failed to initiate password reset",
@@ -91,10 +90,8 @@ class TestPasswordService(unittest.TestCase):
 
     # --- Tests for complete_user_password_reset ---
 
-    @patch('core.services.password_service.complete_password_reset')
     @patch('core.services.password_service.logger')
-    def test_complete_user_password_reset_success(self, mock_logger,
-                                                  mock_complete):
+    def test_complete_user_password_reset_success(self, mock_logger):
         """
         Test that complete_user_password_reset calls complete_password_reset
         correctly.
@@ -102,20 +99,18 @@ class TestPasswordService(unittest.TestCase):
         self.service.complete_user_password_reset(self.username,
                                                   self.confirmation_code,
                                                   self.new_password)
-        mock_complete.assert_called_once_with(self.username,
-                                              self.confirmation_code,
-                                              self.new_password)
+        self.identity_provider.complete_password_reset.assert_called_once_with(
+            self.username, self.confirmation_code, self.new_password)
         self.assertTrue(mock_logger.info.called)
 
-    @patch('core.services.password_service.complete_password_reset')
     @patch('core.services.password_service.logger')
-    def test_complete_user_password_reset_failure(self, mock_logger,
-                                                  mock_complete):
+    def test_complete_user_password_reset_failure(self, mock_logger):
         """
         Test that complete_user_password_reset raises an exception if the
         underlying call fails.
         """
-        mock_complete.side_effect = Exception("Complete error")
+        self.identity_provider.complete_password_reset.side_effect = (
+            Exception("Complete error"))
         with self.assertRaises(Exception) as context:
             self.service.complete_user_password_reset(self.username,
                                                       self.confirmation_code,
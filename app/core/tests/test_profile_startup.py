@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from core.management.commands.profile_startup import (aggregate, compare,
+                                                      parse_importtime)
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     django.utils
+import time:       200 |        300 |   django.conf
+import time:       400 |        700 | django
+import time:        50 |         50 |   core.utils
+import time:        25 |         75 | core
+"""
+
+
+class TestImportTimeParsing(SimpleTestCase):
+
+    def test_parse_importtime(self):
+        records = parse_importtime(IMPORTTIME_OUTPUT)
+
+        self.assertEqual(len(records), 5)
+        self.assertEqual(records[0].module, "django.utils")
+        self.assertEqual(records[0].depth, 2)
+        self.assertEqual(records[2].cumulative_us, 700)
+        self.assertEqual(records[2].depth, 0)
+
+    def test_aggregate_by_package_sums_self_time(self):
+        totals = aggregate(parse_importtime(IMPORTTIME_OUTPUT), "package")
+
+        self.assertEqual(totals, {"django": 700, "core": 75})
+
+    def test_aggregate_by_module_uses_cumulative_time(self):
+        totals = aggregate(parse_importtime(IMPORTTIME_OUTPUT), "module")
+
+        self.assertEqual(totals["django.conf"], 300)
+        self.assertEqual(totals["core"], 75)
+
+    def test_compare_orders_by_largest_change(self):
+        rows = compare({"django": 700, "boto3": 10}, {"django": 650})
+
+        self.assertEqual(rows[0]["name"], "django")
+        self.assertEqual(rows[0]["delta_us"], 50)
+        self.assertIsNone(rows[1]["baseline_us"])
+
+
+@patch("core.management.commands.profile_startup.Command.run_once",
+       return_value=IMPORTTIME_OUTPUT)
+class TestProfileStartupCommand(SimpleTestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "baseline.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_save_and_compare_baseline(self, mock_run_once):
+        call_command("profile_startup", runs=2, save=self.path,
+                     stdout=StringIO())
+        with open(self.path) as baseline_file:
+            saved = json.load(baseline_file)
+        self.assertEqual(saved["entries"]["<total>"], 775)
+
+        out = StringIO()
+        call_command("profile_startup", runs=1, baseline=self.path,
+                     fail_over=5, stdout=out)
+
+        self.assertIn("baseline", out.getvalue())
+        self.assertEqual(mock_run_once.call_count, 3)
+
+    def test_regression_over_threshold_fails(self, mock_run_once):
+        with open(self.path, "w") as baseline_file:
+            json.dump(
+                {
+                    "group": "package",
+                    "entries": {
+                        "<total>": 500
+                    }
+                }, baseline_file)
+
+        with self.assertRaises(CommandError):
+            call_command("profile_startup", runs=1, baseline=self.path,
+                         fail_over=10, stdout=StringIO())
@@ -0,0 +1,227 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+from unittest.mock import patch
+
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core import views
+from core.utils import profiling
+from core.utils.profiling import (Profile, ProfileStore, StackSampler,
+                                  profile_store)
+
+APP_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROFILING = override_settings(PROFILING_ENABLED=True,
+                              PROFILING_SECRET="secret",
+                              PROFILING_SAMPLE_RATE=0)
+
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def make_profile():
+    profile = Profile("abc", "GET", "/api/user/1/", 0.005)
+    outer = ("view", "/app/user/views.py", 10)
+    profile.stacks[(outer, ("query", "/app/core/db.py", 5))] = 3
+    profile.stacks[(outer, )] = 1
+    return profile
+
+
+@PROFILING
+class TestSignedHeader(SimpleTestCase):
+
+    def test_valid_token(self):
+        self.assertTrue(profiling.verify(profiling.sign(60)))
+
+    def test_expired_or_tampered_token(self):
+        expires, _, signature = profiling.sign(60).partition(".")
+
+        self.assertFalse(profiling.verify(profiling.sign(-10)))
+        self.assertFalse(profiling.verify(f"{int(expires) + 1}.{signature}"))
+        self.assertFalse(profiling.verify("garbage"))
+
+    def test_no_secret_disables_tokens(self):
+        token = profiling.sign(60)
+
+        with override_settings(PROFILING_SECRET=""):
+            self.assertFalse(profiling.verify(token))
+
+    @override_settings(PROFILING_SAMPLE_RATE=1.0,
+                       PROFILING_SAMPLE_PATHS=["/api/"])
+    def test_sampling_rule(self):
+        self.assertTrue(profiling.sampled("/api/user/1/"))
+        self.assertFalse(profiling.sampled("/healthz"))
+
+
+class TestProfile(SimpleTestCase):
+
+    def test_collapsed_stacks(self):
+        self.assertEqual(
+            make_profile().collapsed(),
+            "view (/app/user/views.py:10);query (/app/core/db.py:5) 3\n"
+            "view (/app/user/views.py:10) 1\n")
+
+    def test_speedscope(self):
+        document = make_profile().speedscope()
+
+        frames = [frame["name"] for frame in document["shared"]["frames"]]
+        sampled = document["profiles"][0]
+        self.assertEqual(frames, ["view", "query"])
+        self.assertEqual(sampled["samples"], [[0, 1], [0]])
+        self.assertEqual(sampled["weights"], [15.0, 5.0])
+        self.assertEqual(sampled["endValue"], 20.0)
+
+    def test_sampler_records_the_profiled_thread(self):
+        profile = Profile("busy", "GET", "/", 0.001)
+
+        with StackSampler(profile, threading.get_ident()):
+            busy(0.05)
+
+        self.assertTrue(profile.stacks)
+        self.assertTrue(
+            any(frame[0] == "busy" for stack in profile.stacks
+                for frame in stack))
+
+
+class TestProfileStore(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_store_is_bounded(self):
+        store = ProfileStore(self.directory, size=2)
+        for profile_id in ("a", "b", "c"):
+            store.add(Profile(profile_id, "GET", "/", 0.005))
+
+        self.assertIsNone(store.get("a"))
+        self.assertEqual([p["id"] for p in store.summaries()], ["c", "b"])
+
+    def test_profile_round_trips(self):
+        store = ProfileStore(self.directory, size=2)
+        profile = make_profile()
+        profile.status = 200
+        store.add(profile)
+
+        found = store.get("abc")
+
+        self.assertEqual(found.stacks, profile.stacks)
+        self.assertEqual(found.summary(), profile.summary())
+        self.assertEqual(found.collapsed(), profile.collapsed())
+
+    def test_id_is_not_a_path(self):
+        store = ProfileStore(self.directory, size=2)
+        store.add(Profile("../../escape", "GET", "/", 0.005))
+
+        self.assertEqual(len(os.listdir(self.directory)), 1)
+        self.assertEqual(store.get("../../escape").id, "../../escape")
+
+    def test_profile_of_another_process_is_found(self):
+        script = textwrap.dedent("""
+            from core.utils.profiling import Profile, profile_store
+
+            profile = Profile("other-worker", "GET", "/api/user/1/", 0.005)
+            profile.stacks[(("view", "/app/user/views.py", 10), )] = 4
+            profile.status = 200
+            profile_store.add(profile)
+        """)
+        env = dict(os.environ,
+                   DJANGO_SETTINGS_MODULE="app.settings",
+                   DJANGO_ENV="test",
+                   REDIS_URL=os.environ.get("REDIS_URL",
+                                            "redis://localhost:6379"),
+                   PROFILING_DIR=self.directory)
+        result = subprocess.run([sys.executable, "-c", script],
+                                cwd=APP_DIR,
+                                env=env,
+                                capture_output=True,
+                                text=True,
+                                timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        found = ProfileStore(self.directory, size=2).get("other-worker")
+
+        self.assertEqual(found.status, 200)
+        self.assertEqual(sum(found.stacks.values()), 4)
+
+
+@PROFILING
+class TestProfilingMiddleware(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = patch.object(profile_store, "directory", directory.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_unsigned_request_is_not_profiled(self):
+        response = self.client.get("/healthz", HTTP_X_PROFILE="1.forged")
+
+        self.assertNotIn(profiling.PROFILE_ID_HEADER, response)
+        self.assertEqual(profile_store.summaries(), [])
+
+    def test_signed_request_is_profiled_and_downloadable(self):
+        token = profiling.sign(60)
+
+        response = self.client.get("/healthz",
+                                   HTTP_X_PROFILE=token,
+                                   HTTP_X_REQUEST_ID="req-1")
+
+        self.assertEqual(response[profiling.PROFILE_ID_HEADER], "req-1")
+        self.assertEqual(profile_store.get("req-1").status, 200)
+
+        download = self.client.get("/admin/profiles/req-1",
+                                   HTTP_X_PROFILE=token)
+        self.assertEqual(download.status_code, 200)
+        self.assertEqual(json.loads(download.content)["profiles"][0]["type"],
+                         "sampled")
+
+        collapsed = self.client.get("/admin/profiles/req-1?format=collapsed",
+                                    HTTP_X_PROFILE=token)
+        self.assertEqual(collapsed["Content-Type"], "text/plain")
+
+    @override_settings(PROFILING_SAMPLE_RATE=1.0)
+    def test_sampled_request_is_profiled(self):
+        response = self.client.get("/healthz")
+
+        self.assertIn(profiling.PROFILE_ID_HEADER, response)
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled(self):
+        with patch.object(profiling, "profile_request") as profile_request:
+            self.client.get("/healthz", HTTP_X_PROFILE=profiling.sign(60))
+
+        profile_request.assert_not_called()
+
+
+@PROFILING
+class TestProfilesView(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_requires_staff_or_token(self):
+        request = self.factory.get("/admin/profiles")
+        request.user = AnonymousUser()
+
+        self.assertEqual(views.profiles(request).status_code, 403)
+
+    def test_unknown_profile(self):
+        request = self.factory.get("/admin/profiles/missing",
+                                   HTTP_X_PROFILE=profiling.sign(60))
+        request.user = AnonymousUser()
+
+        self.assertEqual(views.profile(request, "missing").status_code, 404)
@@ -0,0 +1,143 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.models import Todo, User
+from core.repositories.user_repository import UserRepository
+from core.tests.query_budgets import (QueryBudgetMixin, QueryBudgetReport,
+                                      QueryRecorder)
+from user.views import userService
+
+# Queries allowed per repository method and per endpoint. Raise a budget
+# only together with the change that needs the extra queries.
+REPOSITORY_BUDGETS = {
+    "create_entity": 1,
+    "find_entity_by_id": 1,
+    "find_user_by_username": 1,
+    "update_entity": 2,
+    "delete_entity": 3,
+    "get_all_entities": 1,
+    "get_entities_with_pagination": 2,
+}
+ENDPOINT_BUDGETS = {
+    "POST /api/user/authenticate/": 1,
+    "POST /api/user/password-reset/complete/": 3,
+}
+
+
+class TestRepositoryQueryBudgets(QueryBudgetMixin, TestCase):
+
+    def setUp(self):
+        self.repository = UserRepository()
+        self.user = User.objects.create(username="alice",
+                                        email="alice@example.com",
+                                        password="secret")
+        for i in range(3):
+            User.objects.create(username=f"user{i}",
+                                email=f"user{i}@example.com",
+                                password="secret")
+
+    def assertRepositoryBudget(self, method):
+        return self.assertQueryBudget(f"UserRepository.{method}",
+                                      REPOSITORY_BUDGETS[method])
+
+    def test_create_entity(self):
+        with self.assertRepositoryBudget("create_entity"):
+            self.repository.create_entity(
+                User(username="bob", email="bob@example.com"))
+
+    def test_find_entity_by_id(self):
+        with self.assertRepositoryBudget("find_entity_by_id"):
+            self.repository.find_entity_by_id(self.user.id)
+
+    def test_find_user_by_username(self):
+        with self.assertRepositoryBudget("find_user_by_username"):
+            self.repository.find_user_by_username("alice")
+
+    def test_update_entity(self):
+        with self.assertRepositoryBudget("update_entity"):
+            self.repository.update_entity(self.user.id, {"name": "Alice"})
+
+    def test_delete_entity(self):
+        with self.assertRepositoryBudget("delete_entity"):
+            self.repository.delete_entity(self.user.id)
+
+    def test_get_all_entities(self):
+        with self.assertRepositoryBudget("get_all_entities"):
+            self.repository.get_all_entities()
+
+    def test_get_entities_with_pagination(self):
+        with self.assertRepositoryBudget("get_entities_with_pagination"):
+            self.repository.get_entities_with_pagination(1, 2)
+
+
+class TestEndpointQueryBudgets(QueryBudgetMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        User.objects.create(username="alice",
+                            email="alice@example.com",
+                            password="secret")
+
+    def assertEndpointBudget(self, method, path, data):
+        name = f"{method} {path}"
+        with self.assertQueryBudget(name, ENDPOINT_BUDGETS[name]):
+            response = self.client.generic(method,
+                                           path,
+                                           data,
+                                           content_type="application/json")
+        self.assertEqual(response.status_code, 200, response.content)
+
+    @patch.object(userService.auth_service,
+                  "authenticate_user",
+                  return_value="token")
+    def test_authenticate(self, _):
+        self.assertEndpointBudget(
+            "POST", "/api/user/authenticate/",
+            '{"username": "alice", "password": "Secret123!"}')
+
+    @patch.object(userService.password_service,
+                  "get_password_encrypted",
+                  return_value="ciphertext")
+    @patch.object(userService.password_service,
+                  "complete_user_password_reset",
+                  return_value={})
+    def test_complete_password_reset(self, *_):
+        self.assertEndpointBudget(
+            "POST", "/api/user/password-reset/complete/",
+            '{"username": "alice", "newPassword": "NewSecret123!", '
+            '"confirmationCode": "123456"}')
+
+
+class TestNPlusOneDetection(QueryBudgetMixin, TestCase):
+
+    def setUp(self):
+        for i in range(3):
+            user = User.objects.create(username=f"user{i}",
+                                       email=f"user{i}@example.com")
+            Todo.objects.create(title="todo", description="", user=user)
+
+    def test_repeated_query_is_reported(self):
+        with QueryRecorder() as recorder:
+            [todo.user.username for todo in Todo.objects.all()]
+
+        repeated = recorder.repeated(max_repeats=1)
+        self.assertEqual(list(repeated.values()), [3])
+        self.assertIn('FROM "core_user"', next(iter(repeated)))
+
+    def test_select_related_stays_within_budget(self):
+        with self.assertQueryBudget("Todo listing with users", 1):
+            [
+                todo.user.username
+                for todo in Todo.objects.select_related("user")
+            ]
+
+    # Kept out of the shared report, which must only fail on real overruns.
+    @patch("core.tests.query_budgets.report", QueryBudgetReport())
+    def test_exceeded_budget_fails(self):
+        with self.assertRaises(AssertionError) as failure:
+            with self.assertQueryBudget("Todo listing", 1):
+                [todo.user.username for todo in Todo.objects.all()]
+
+        self.assertIn("possible N+1", str(failure.exception))
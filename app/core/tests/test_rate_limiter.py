@@ -0,0 +1,157 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.utils.cache_util import CACHE_SOCKET_TIMEOUT
+from core.utils.rate_limiter import RateLimiter, TokenBucket, get_client_ip
+
+TEST_RATE_LIMITS = {
+    "authenticate": {
+        "USERNAME_LIMIT": 5,
+        "USERNAME_WINDOW": 60,
+        "IP_LIMIT": 30,
+        "IP_WINDOW": 60,
+        "BUCKET_CAPACITY": 100,
+        "BUCKET_REFILL_RATE": 50,
+    }
+}
+
+
+@override_settings(RATE_LIMIT_ENABLED=True, RATE_LIMITS=TEST_RATE_LIMITS)
+class TestRateLimiter(SimpleTestCase):
+
+    def setUp(self):
+        self.redis_client = MagicMock()
+        self.script = MagicMock()
+        self.redis_client.register_script.return_value = self.script
+        self.limiter = RateLimiter(self.redis_client)
+
+    def test_check_allowed(self):
+        self.script.return_value = [1, 0, b""]
+
+        result = self.limiter.check("authenticate", "TestUser", "10.0.0.1")
+
+        self.assertTrue(result.allowed)
+        self.assertEqual(result.retry_after, 0)
+        _, kwargs = self.script.call_args
+        self.assertEqual(kwargs["keys"], [
+            "ratelimit:authenticate:user:testuser",
+            "ratelimit:authenticate:ip:10.0.0.1",
+            "ratelimit:authenticate:bucket",
+        ])
+        self.assertEqual(kwargs["args"][1:], [5, 60000, 30, 60000, 100, 50])
+
+    def test_check_rejected_rounds_retry_after_up(self):
+        self.script.return_value = [0, 1500, b"username"]
+
+        result = self.limiter.check("authenticate", "testuser", "10.0.0.1")
+
+        self.assertFalse(result.allowed)
+        self.assertEqual(result.retry_after, 2)
+        self.assertEqual(result.reason, "username")
+
+    def test_missing_username_disables_username_window(self):
+        self.script.return_value = [1, 0, b""]
+
+        self.limiter.check("authenticate", None, "10.0.0.1")
+
+        _, kwargs = self.script.call_args
+        self.assertEqual(kwargs["args"][1], 0)
+
+    def test_script_registered_once(self):
+        self.script.return_value = [1, 0, b""]
+
+        self.limiter.check("authenticate", "testuser", "10.0.0.1")
+        self.limiter.check("authenticate", "testuser", "10.0.0.1")
+
+        self.redis_client.register_script.assert_called_once()
+
+    def test_unknown_operation_is_allowed(self):
+        result = self.limiter.check("unknown", "testuser", "10.0.0.1")
+
+        self.assertTrue(result.allowed)
+        self.script.assert_not_called()
+
+    def test_redis_error_fails_open(self):
+        self.script.side_effect = Exception("Connection refused")
+
+        result = self.limiter.check("authenticate", "testuser", "10.0.0.1")
+
+        self.assertTrue(result.allowed)
+
+    @override_settings(RATE_LIMIT_ENABLED=False)
+    def test_disabled_skips_redis(self):
+        result = self.limiter.check("authenticate", "testuser", "10.0.0.1")
+
+        self.assertTrue(result.allowed)
+        self.redis_client.register_script.assert_not_called()
+
+
+class TestRateLimiterClient(SimpleTestCase):
+
+    @patch("core.utils.rate_limiter.get_redis_url",
+           return_value="redis://localhost:6379")
+    @patch("core.utils.rate_limiter.redis.Redis.from_url")
+    def test_client_has_socket_timeouts(self, mock_from_url, _):
+        RateLimiter()._get_script()
+
+        kwargs = mock_from_url.call_args.kwargs
+        self.assertEqual(kwargs["socket_timeout"], CACHE_SOCKET_TIMEOUT)
+        self.assertEqual(kwargs["socket_connect_timeout"],
+                         CACHE_SOCKET_TIMEOUT)
+
+
+class TestGetClientIp(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    @override_settings(RATE_LIMIT_TRUST_X_FORWARDED_FOR=False)
+    def test_uses_remote_addr_by_default(self):
+        request = self.factory.get("/",
+                                   REMOTE_ADDR="10.0.0.1",
+                                   HTTP_X_FORWARDED_FOR="1.2.3.4")
+        self.assertEqual(get_client_ip(request), "10.0.0.1")
+
+    @override_settings(RATE_LIMIT_TRUST_X_FORWARDED_FOR=True,
+                       RATE_LIMIT_TRUSTED_PROXY_HOPS=1)
+    def test_uses_address_appended_by_the_proxy(self):
+        request = self.factory.get("/",
+                                   REMOTE_ADDR="10.0.0.1",
+                                   HTTP_X_FORWARDED_FOR="1.2.3.4")
+        self.assertEqual(get_client_ip(request), "1.2.3.4")
+
+    @override_settings(RATE_LIMIT_TRUST_X_FORWARDED_FOR=True,
+                       RATE_LIMIT_TRUSTED_PROXY_HOPS=1)
+    def test_spoofed_forwarded_entries_are_ignored(self):
+        request = self.factory.get(
+            "/",
+            REMOTE_ADDR="10.0.0.1",
+            HTTP_X_FORWARDED_FOR="6.6.6.6, 7.7.7.7, 1.2.3.4")
+        self.assertEqual(get_client_ip(request), "1.2.3.4")
+
+    @override_settings(RATE_LIMIT_TRUST_X_FORWARDED_FOR=True,
+                       RATE_LIMIT_TRUSTED_PROXY_HOPS=2)
+    def test_counts_trusted_hops_from_the_right(self):
+        request = self.factory.get(
+            "/",
+            REMOTE_ADDR="10.0.0.1",
+            HTTP_X_FORWARDED_FOR="6.6.6.6, 1.2.3.4, 10.0.0.2")
+        self.assertEqual(get_client_ip(request), "1.2.3.4")
+
+
+class TestTokenBucket(SimpleTestCase):
+
+    @patch("core.utils.rate_limiter.time.sleep")
+    @patch("core.utils.rate_limiter.time.monotonic")
+    def test_acquire_waits_for_refill(self, mock_monotonic, mock_sleep):
+        mock_monotonic.return_value = 0
+        bucket = TokenBucket(rate=2, capacity=1)
+
+        bucket.acquire()
+        mock_sleep.side_effect = lambda seconds: setattr(
+            mock_monotonic, "return_value", mock_monotonic.return_value +
+            seconds)
+        bucket.acquire()
+
+        mock_sleep.assert_called_once_with(0.5)
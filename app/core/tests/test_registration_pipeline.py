@@ -0,0 +1,139 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from core.services.registration_pipeline import (RegistrationPipeline,
+                                                 RegistrationPipelineError,
+                                                 RegistrationStep)
+
+
+def sleeping(seconds, result=None):
+
+    def action():
+        time.sleep(seconds)
+        return result
+
+    return action
+
+
+def failing(seconds=0):
+
+    def action():
+        time.sleep(seconds)
+        raise Exception("step failed")
+
+    return action
+
+
+class TestRegistrationPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.pipeline = RegistrationPipeline(max_workers=4, deadline=2)
+
+    def test_steps_run_concurrently(self):
+        start = time.perf_counter()
+
+        result = self.pipeline.run(
+            [
+                RegistrationStep("signup", sleeping(0.2, "signed-up")),
+                RegistrationStep("encrypt", sleeping(0.2, "ciphertext")),
+            ],
+            lambda results: results,
+        )
+
+        elapsed = time.perf_counter() - start
+        self.assertEqual(result, {
+            "signup": "signed-up",
+            "encrypt": "ciphertext"
+        })
+        self.assertLess(elapsed, 0.35)
+
+    def test_failed_step_compensates_successful_steps(self):
+        compensate = MagicMock()
+
+        with self.assertRaises(RegistrationPipelineError) as context:
+            self.pipeline.run(
+                [
+                    RegistrationStep("signup", sleeping(0, "signed-up"),
+                                     compensate),
+                    RegistrationStep("encrypt", failing(0.05)),
+                ],
+                lambda results: results,
+            )
+
+        compensate.assert_called_once_with("signed-up")
+        report = context.exception.report
+        self.assertEqual(report.failed_step, "encrypt")
+        self.assertEqual(report.compensations, [{
+            "step": "signup",
+            "deferred": False,
+            "status": "succeeded"
+        }])
+
+    def test_failed_step_is_not_compensated(self):
+        compensate = MagicMock()
+
+        with self.assertRaises(RegistrationPipelineError):
+            self.pipeline.run(
+                [RegistrationStep("signup", failing(), compensate)],
+                lambda results: results,
+            )
+
+        compensate.assert_not_called()
+
+    def test_finalize_failure_compensates_all_steps(self):
+        compensate = MagicMock()
+
+        def finalize(results):
+            raise Exception("insert failed")
+
+        with self.assertRaises(RegistrationPipelineError) as context:
+            self.pipeline.run(
+                [RegistrationStep("signup", sleeping(0, "ok"), compensate)],
+                finalize,
+            )
+
+        compensate.assert_called_once_with("ok")
+        self.assertEqual(context.exception.report.failed_step, "finalize")
+
+    def test_deadline_defers_compensation_until_step_finishes(self):
+        pipeline = RegistrationPipeline(max_workers=4, deadline=0.05)
+        compensated = threading.Event()
+
+        with self.assertRaises(RegistrationPipelineError) as context:
+            pipeline.run(
+                [
+                    RegistrationStep("signup", sleeping(0.2, "late"),
+                                     lambda _: compensated.set()),
+                ],
+                lambda results: results,
+            )
+
+        self.assertIn("deadline", str(context.exception))
+        self.assertFalse(compensated.is_set())
+        self.assertTrue(compensated.wait(1))
+        report = context.exception.report
+        for _ in range(100):
+            if report.compensations:
+                break
+            time.sleep(0.01)
+        self.assertTrue(report.compensations[0]["deferred"])
+
+    def test_failed_compensation_is_recorded(self):
+
+        def compensate(result):
+            raise Exception("delete failed")
+
+        with self.assertRaises(RegistrationPipelineError) as context:
+            self.pipeline.run(
+                [
+                    RegistrationStep("signup", sleeping(0, "ok"), compensate),
+                    RegistrationStep("encrypt", failing(0.05)),
+                ],
+                lambda results: results,
+            )
+
+        record = context.exception.report.compensations[0]
+        self.assertEqual(record["status"], "failed")
+        self.assertEqual(record["error"], "delete failed")
@@ -0,0 +1,201 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+from prometheus_client import REGISTRY
+
+from core.db import routers
+from core.models import User
+from core.services.async_user_service import AsyncUserService
+from core.services.request_coalescing import (AsyncRequestCoalescer,
+                                              RequestCoalescer)
+from core.services.user_service import UserService
+
+
+def coalesced(operation, role):
+    return REGISTRY.get_sample_value("coalesced_calls_total", {
+        "operation": operation,
+        "role": role
+    }) or 0
+
+
+def callers_seen(operation):
+    return coalesced(operation, "leader") + coalesced(operation, "follower")
+
+
+class TestRequestCoalescer(SimpleTestCase):
+
+    def run_concurrently(self, coalescer, fn, callers=4):
+        """Start ``callers`` calls and release the leader once all wait."""
+        release = threading.Event()
+        calls = []
+        seen = callers_seen(coalescer.operation)
+
+        def leader_fn():
+            calls.append(1)
+            release.wait(5)
+            return fn()
+
+        with ThreadPoolExecutor(max_workers=callers) as executor:
+            futures = [
+                executor.submit(coalescer.call, "key", leader_fn)
+                for _ in range(callers)
+            ]
+            while callers_seen(coalescer.operation) < seen + callers:
+                time.sleep(0.001)
+            release.set()
+        return calls, futures
+
+    def test_concurrent_calls_share_one_call(self):
+        coalescer = RequestCoalescer("test_share")
+        user = User(id=1, username="alice")
+
+        calls, futures = self.run_concurrently(coalescer, lambda: user)
+
+        results = [future.result() for future in futures]
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result.username == "alice" for result in results))
+        # Followers get copies of the leader's instance.
+        self.assertEqual(sum(result is user for result in results), 1)
+        self.assertEqual(coalesced("test_share", "follower"), 3)
+
+    def test_exception_reaches_every_caller(self):
+        coalescer = RequestCoalescer("test_error")
+
+        def fail():
+            raise ValueError("boom")
+
+        calls, futures = self.run_concurrently(coalescer, fail)
+
+        self.assertEqual(len(calls), 1)
+        for future in futures:
+            with self.assertRaises(ValueError):
+                future.result()
+
+    def test_sequential_calls_are_not_cached(self):
+        coalescer = RequestCoalescer("test_sequential")
+        results = iter([1, 2])
+
+        self.assertEqual(coalescer.call("key", lambda: next(results)), 1)
+        self.assertEqual(coalescer.call("key", lambda: next(results)), 2)
+
+    def test_caller_pinned_to_the_primary_runs_its_own_call(self):
+        coalescer = RequestCoalescer("test_pinned")
+        release = threading.Event()
+
+        def replica_read():
+            release.wait(5)
+            return "stale"
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(coalescer.call, "key", replica_read)
+            while coalesced("test_pinned", "leader") < 1:
+                time.sleep(0.001)
+            routers.pin_to_primary()
+            self.addCleanup(routers.reset_stickiness)
+
+            self.assertEqual(coalescer.call("key", lambda: "fresh"), "fresh")
+            release.set()
+
+        self.assertEqual(leader.result(), "stale")
+        self.assertEqual(coalesced("test_pinned", "follower"), 0)
+
+    @override_settings(REQUEST_COALESCING_ENABLED=False)
+    def test_disabled(self):
+        coalescer = RequestCoalescer("test_disabled")
+
+        coalescer.call("key", lambda: None)
+
+        self.assertEqual(coalesced("test_disabled", "leader"), 0)
+
+
+class TestAsyncRequestCoalescer(SimpleTestCase):
+
+    async def test_concurrent_calls_share_one_call(self):
+        coalescer = AsyncRequestCoalescer("test_async_share")
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return User(id=1, username="alice")
+
+        results = await asyncio.gather(
+            *(coalescer.call("key", fetch) for _ in range(5)))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual({result.username for result in results}, {"alice"})
+        self.assertEqual(len({id(result) for result in results}), 5)
+        self.assertEqual(coalesced("test_async_share", "follower"), 4)
+
+        await coalescer.call("key", fetch)
+        self.assertEqual(len(calls), 2)
+
+    async def test_cancelled_follower_does_not_cancel_the_call(self):
+        coalescer = AsyncRequestCoalescer("test_async_cancel")
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return "value"
+
+        leader = asyncio.ensure_future(coalescer.call("key", fetch))
+        follower = asyncio.ensure_future(coalescer.call("key", fetch))
+        await asyncio.sleep(0)
+        follower.cancel()
+
+        self.assertEqual(await leader, "value")
+
+    async def test_caller_that_wrote_runs_its_own_call(self):
+        coalescer = AsyncRequestCoalescer("test_async_pinned")
+
+        async def replica_read():
+            await asyncio.sleep(0.01)
+            return "stale"
+
+        async def read_after_write():
+            routers.pin_to_primary()
+            return await coalescer.call("key", fresh_read)
+
+        async def fresh_read():
+            return "fresh"
+
+        results = await asyncio.gather(coalescer.call("key", replica_read),
+                                       read_after_write())
+
+        self.assertEqual(results, ["stale", "fresh"])
+        self.assertEqual(coalesced("test_async_pinned", "follower"), 0)
+
+
+class TestUserServiceCoalescing(SimpleTestCase):
+
+    def test_find_by_id_goes_through_the_coalescer(self):
+        with patch.object(UserService.find_by_id_coalescer,
+                          "call",
+                          return_value="user") as call:
+            self.assertEqual(UserService().find_by_id(7), "user")
+
+        self.assertEqual(call.call_args[0][0], (7, None))
+
+    async def test_async_find_user_by_username(self):
+        service = AsyncUserService(UserService())
+        started = []
+
+        async def find(username, cache_model):
+            started.append(username)
+            await asyncio.sleep(0.01)
+            return User(username=username)
+
+        with patch.object(AsyncUserService.user_repository,
+                          "find_user_by_username",
+                          side_effect=find):
+            results = await asyncio.gather(
+                service.find_user_by_username("alice"),
+                service.find_user_by_username("alice"),
+                service.find_user_by_username("bob"))
+
+        self.assertEqual(started, ["alice", "bob"])
+        self.assertEqual([user.username for user in results],
+                         ["alice", "alice", "bob"])
@@ -0,0 +1,163 @@
+import base64
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from core.management.commands.rotate_password_keys import Command
+from core.models import User
+from core.utils import kms_util
+
+
+def fake_re_encrypt(CiphertextBlob, DestinationKeyId):
+    return {"CiphertextBlob": DestinationKeyId.encode() + b":" + CiphertextBlob}
+
+
+@patch("core.utils.kms_util.kms_client")
+class TestRotatePasswordKeysCommand(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.checkpoint = os.path.join(self.tmp_dir.name, "checkpoint.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def create_user(self, username, password):
+        return User.objects.create(username=username,
+                                   email=f"{username}@example.com",
+                                   password=password)
+
+    def rotate(self, **options):
+        call_command("rotate_password_keys",
+                     key_id="new-key",
+                     checkpoint=self.checkpoint,
+                     rate=1000,
+                     stdout=StringIO(),
+                     **options)
+
+    def test_rotates_envelope_and_legacy_passwords(self, mock_kms_client):
+        mock_kms_client.re_encrypt.side_effect = fake_re_encrypt
+        envelope = kms_util.pack_envelope(b"wrapped", b"n" * 12, b"ct")
+        legacy = base64.b64encode(b"blob").decode()
+        first = self.create_user("first", envelope)
+        second = self.create_user("second", legacy)
+
+        self.rotate(batch_size=1)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(kms_util.unpack_envelope(first.password)[0],
+                         b"new-key:wrapped")
+        self.assertEqual(base64.b64decode(second.password), b"new-key:blob")
+        with open(self.checkpoint) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        self.assertEqual(checkpoint["last_id"], second.pk)
+        self.assertEqual(checkpoint["rotated"], 2)
+
+    def test_shared_data_key_is_reencrypted_once(self, mock_kms_client):
+        mock_kms_client.re_encrypt.side_effect = fake_re_encrypt
+        for index in range(3):
+            self.create_user(
+                f"user{index}",
+                kms_util.pack_envelope(b"shared", b"n" * 12, b"ct"))
+
+        self.rotate()
+
+        mock_kms_client.re_encrypt.assert_called_once_with(
+            CiphertextBlob=b"shared", DestinationKeyId="new-key")
+        self.assertEqual(User.objects.filter(password__startswith="env1:")
+                         .count(), 3)
+
+    def test_resumes_from_checkpoint(self, mock_kms_client):
+        mock_kms_client.re_encrypt.side_effect = fake_re_encrypt
+        done = self.create_user("done", base64.b64encode(b"a").decode())
+        pending = self.create_user("pending", base64.b64encode(b"b").decode())
+        with open(self.checkpoint, "w") as checkpoint_file:
+            json.dump(
+                {
+                    "key_id": "new-key",
+                    "last_id": done.pk,
+                    "rotated": 1,
+                    "failed_ids": []
+                }, checkpoint_file)
+
+        self.rotate()
+
+        mock_kms_client.re_encrypt.assert_called_once_with(
+            CiphertextBlob=b"b", DestinationKeyId="new-key")
+        pending.refresh_from_db()
+        self.assertEqual(base64.b64decode(pending.password), b"new-key:b")
+
+    def test_checkpoint_for_other_key_is_ignored(self, mock_kms_client):
+        mock_kms_client.re_encrypt.side_effect = fake_re_encrypt
+        self.create_user("user", base64.b64encode(b"a").decode())
+        with open(self.checkpoint, "w") as checkpoint_file:
+            json.dump({"key_id": "old-key", "last_id": 10**6}, checkpoint_file)
+
+        self.rotate()
+
+        mock_kms_client.re_encrypt.assert_called_once()
+
+    def test_failed_passwords_are_reported(self, mock_kms_client):
+        mock_kms_client.re_encrypt.side_effect = Exception("throttled")
+        user = self.create_user("user", base64.b64encode(b"a").decode())
+
+        with self.assertRaises(CommandError):
+            self.rotate()
+
+        user.refresh_from_db()
+        self.assertEqual(user.password, base64.b64encode(b"a").decode())
+        with open(self.checkpoint) as checkpoint_file:
+            self.assertEqual(json.load(checkpoint_file)["failed_ids"],
+                             [user.pk])
+
+    def test_password_changed_during_rotation_is_kept(self, mock_kms_client):
+        mock_kms_client.re_encrypt.side_effect = fake_re_encrypt
+        user = self.create_user("user", base64.b64encode(b"a").decode())
+        rotate_batch = Command.rotate_batch
+
+        def reset_during_rotation(command, *args):
+            result = rotate_batch(command, *args)
+            # A password reset commits while the batch is re-encrypted.
+            User.objects.filter(pk=user.pk).update(password="reset")
+            return result
+
+        with patch.object(Command, "rotate_batch", reset_during_rotation):
+            self.rotate()
+
+        user.refresh_from_db()
+        self.assertEqual(user.password, "reset")
+        with open(self.checkpoint) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        self.assertEqual((checkpoint["rotated"], checkpoint["changed"]),
+                         (0, 1))
+
+    def test_failed_passwords_are_retried_on_resume(self, mock_kms_client):
+        mock_kms_client.re_encrypt.side_effect = fake_re_encrypt
+        failed = self.create_user("failed", base64.b64encode(b"a").decode())
+        done = self.create_user("done", base64.b64encode(b"b").decode())
+        with open(self.checkpoint, "w") as checkpoint_file:
+            json.dump(
+                {
+                    "key_id": "new-key",
+                    "last_id": done.pk,
+                    "rotated": 1,
+                    "failed_ids": [failed.pk]
+                }, checkpoint_file)
+
+        self.rotate()
+
+        mock_kms_client.re_encrypt.assert_called_once_with(
+            CiphertextBlob=b"a", DestinationKeyId="new-key")
+        failed.refresh_from_db()
+        self.assertEqual(base64.b64decode(failed.password), b"new-key:a")
+        with open(self.checkpoint) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        self.assertEqual((checkpoint["rotated"], checkpoint["failed_ids"]),
+                         (2, []))
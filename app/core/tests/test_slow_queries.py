@@ -0,0 +1,123 @@
+from unittest.mock import Mock, patch
+
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.test import (RequestFactory, SimpleTestCase, TestCase,
+                         override_settings)
+
+from core import views
+from core.db import query_hooks
+from core.db.slow_queries import (SlowQueryLog, normalize_sql, params_shape,
+                                  slow_query_log)
+from core.middleware import RequestTimingMiddleware
+from core.models import User
+from core.repositories.user_repository import UserRepository
+
+
+class TestNormalization(SimpleTestCase):
+
+    def test_literals_and_in_lists_are_replaced(self):
+        self.assertEqual(
+            normalize_sql("SELECT *  FROM t WHERE a = 'x''y' AND b = 42\n"
+                          "AND c IN (%s, %s, %s) LIMIT 10"),
+            "SELECT * FROM t WHERE a = ? AND b = ? AND c IN (...) LIMIT ?")
+
+    def test_params_shape_has_no_values(self):
+        self.assertEqual(params_shape(("alice", 3), False), "(str, int)")
+        self.assertEqual(params_shape([("a", 1), ("b", 2)], True),
+                         "2 x (str, int)")
+
+
+class TestSlowQueryLog(TestCase):
+
+    def setUp(self):
+        # Any measurable duration counts as slow.
+        self.log = SlowQueryLog(threshold_ms=1e-6, size=2, explain=True)
+
+    def test_records_call_site_and_explains_each_fingerprint_once(self):
+        with patch.object(self.log, "_submit") as submit, \
+                connection.execute_wrapper(self.log.wrapper):
+            UserRepository().find_user_by_username("alice")
+            UserRepository().find_user_by_username("bob")
+
+        entry = self.log.entries()[0]
+        self.assertIn("WHERE", entry["sql"])
+        self.assertNotIn("alice", str(entry))
+        self.assertEqual(entry["params"], "(str)")
+        self.assertEqual(entry["repository_method"],
+                         "UserRepository.find_user_by_username")
+        self.assertTrue(entry["stack"][-1].startswith(
+            "core/repositories/user_repository.py:"))
+        submit.assert_called_once()
+
+        self.log.capture_plan(*submit.call_args.args[1:])
+        self.assertTrue(self.log.entries()[0]["plan"])
+
+    def test_ring_buffer_keeps_the_newest_entries(self):
+        with patch.object(self.log, "_submit"), \
+                connection.execute_wrapper(self.log.wrapper):
+            for _ in range(3):
+                User.objects.count()
+            User.objects.filter(username="alice").exists()
+
+        entries = self.log.entries()
+        self.assertEqual(len(entries), 2)
+        self.assertIn("WHERE", entries[0]["sql"])
+
+    def test_disabled_with_a_zero_threshold(self):
+        log = SlowQueryLog(threshold_ms=0)
+        with connection.execute_wrapper(log.wrapper):
+            User.objects.count()
+
+        self.assertEqual(log.entries(), [])
+
+
+class TestInstall(TestCase):
+
+    def setUp(self):
+        wrappers = connection.execute_wrappers
+        self.addCleanup(setattr, connection, "execute_wrappers", wrappers)
+        connection.execute_wrappers = []
+
+    @override_settings(REQUEST_TIMING_ENABLED=True)
+    def test_connection_opened_during_a_request_keeps_the_hook(self):
+
+        def view(request):
+            # A new connection, as with CONN_MAX_AGE=0 or a reconnect.
+            connection.execute_wrappers.remove(slow_query_log.wrapper)
+            connection_created.send(sender=type(connection),
+                                    connection=connection)
+            User.objects.count()
+            return HttpResponse()
+
+        connection_created.send(sender=type(connection),
+                                connection=connection)
+        middleware = RequestTimingMiddleware(view)
+        for _ in range(3):
+            middleware(RequestFactory().get("/users"))
+
+        self.assertEqual(connection.execute_wrappers,
+                         [slow_query_log.wrapper, query_hooks.dispatch])
+
+
+class TestSlowQueriesView(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_requires_staff(self):
+        request = self.factory.get("/admin/slow-queries")
+        request.user = AnonymousUser()
+
+        self.assertEqual(views.slow_queries(request).status_code, 403)
+
+    def test_lists_entries_for_staff(self):
+        request = self.factory.get("/admin/slow-queries")
+        request.user = Mock(is_staff=True)
+
+        with patch.object(slow_query_log, "entries", return_value=[]):
+            response = views.slow_queries(request)
+
+        self.assertEqual(response.status_code, 200)
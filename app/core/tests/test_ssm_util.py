@@ -1,10 +1,11 @@
 import os
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 from botocore.exceptions import ClientError
 
-from core.utils.ssm_util import get_cached_parameter
+from core.utils.ssm_util import (clear_parameter_cache, fetch_parameters,
+                                 get_cached_parameter, get_parameters)
 
 
 class TestGetCachedParameter(unittest.TestCase):
@@ -13,6 +14,7 @@ class TestGetCachedParameter(unittest.TestCase):
         # Save current environment variables so we can restore them
         # after tests.
         self.orig_env = dict(os.environ)
+        clear_parameter_cache()
 
     def tearDown(self):
         # Restore environment variables.
@@ -35,29 +37,26 @@ class TestGetCachedParameter(unittest.TestCase):
         self.assertIn("Environment variable 'MISSING_PARAM' is not set",
                       str(context.exception))
 
-    @patch("core.utils.ssm_util.boto3.client")
-    def test_production_fetches_parameter_from_ssm(self, mock_boto_client):
+    @patch("core.utils.ssm_util.ssm_client")
+    def test_production_fetches_parameter_from_ssm(self, fake_ssm):
         # For production, ensure DJANGO_ENV is not set to local or test.
         os.environ.pop("DJANGO_ENV", None)
-        fake_ssm = MagicMock()
         fake_ssm.get_parameter.return_value = {
             "Parameter": {
                 "Value": "prod_value"
             }
         }
-        mock_boto_client.return_value = fake_ssm
 
         result = get_cached_parameter("TEST_PARAM")
         self.assertEqual(result, "prod_value")
         fake_ssm.get_parameter.assert_called_once_with(Name="TEST_PARAM",
                                                        WithDecryption=True)
 
-    @patch("core.utils.ssm_util.boto3.client")
+    @patch("core.utils.ssm_util.ssm_client")
     def test_production_ssm_client_error_raises_exception(
-            self, mock_boto_client):
+            self, fake_ssm):
         # For production, ensure DJANGO_ENV is not set to local or test.
         os.environ.pop("DJANGO_ENV", None)
-        fake_ssm = MagicMock()
         error_response = {
             "Error": {
                 "Code": "UnrecognizedClientException",
@@ -66,9 +65,83 @@ class TestGetCachedParameter(unittest.TestCase):
         }
         fake_ssm.get_parameter.side_effect = ClientError(
             error_response, "GetParameter")
-        mock_boto_client.return_value = fake_ssm
 
         with self.assertRaises(Exception) as context:
             get_cached_parameter("TEST_PARAM")
         self.assertIn("Could not fetch parameter: TEST_PARAM",
                       str(context.exception))
+
+    @patch("core.utils.ssm_util.ssm_client")
+    def test_production_caches_parameter(self, fake_ssm):
+        os.environ.pop("DJANGO_ENV", None)
+        fake_ssm.get_parameter.return_value = {
+            "Parameter": {
+                "Value": "prod_value"
+            }
+        }
+
+        get_cached_parameter("TEST_PARAM")
+        result = get_cached_parameter("TEST_PARAM")
+
+        self.assertEqual(result, "prod_value")
+        fake_ssm.get_parameter.assert_called_once()
+
+
+class TestGetParameters(unittest.TestCase):
+
+    def setUp(self):
+        self.orig_env = dict(os.environ)
+        clear_parameter_cache()
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.orig_env)
+
+    def test_local_environment_reads_env(self):
+        os.environ["DJANGO_ENV"] = "test"
+        os.environ["PARAM_A"] = "a"
+        os.environ["PARAM_B"] = "b"
+
+        self.assertEqual(fetch_parameters(["PARAM_A", "PARAM_B"]), {
+            "PARAM_A": "a",
+            "PARAM_B": "b"
+        })
+
+    def test_local_environment_missing_variables_raise(self):
+        os.environ["DJANGO_ENV"] = "test"
+        os.environ.pop("MISSING_PARAM", None)
+
+        with self.assertRaises(Exception) as context:
+            fetch_parameters(["MISSING_PARAM"])
+        self.assertIn("MISSING_PARAM", str(context.exception))
+
+    @patch("core.utils.ssm_util.ssm_client")
+    def test_production_batches_and_caches(self, fake_ssm):
+        os.environ.pop("DJANGO_ENV", None)
+        fake_ssm.get_parameters.side_effect = lambda Names, WithDecryption: {
+            "Parameters": [{
+                "Name": name,
+                "Value": f"value-{name}"
+            } for name in Names],
+            "InvalidParameters": [],
+        }
+        names = [f"/param/{index}" for index in range(15)]
+
+        values = get_parameters(names)
+
+        self.assertEqual(len(values), 15)
+        self.assertEqual(fake_ssm.get_parameters.call_count, 2)
+        self.assertEqual(get_cached_parameter("/param/3"), "value-/param/3")
+        fake_ssm.get_parameter.assert_not_called()
+
+    @patch("core.utils.ssm_util.ssm_client")
+    def test_production_invalid_parameters_raise(self, fake_ssm):
+        os.environ.pop("DJANGO_ENV", None)
+        fake_ssm.get_parameters.return_value = {
+            "Parameters": [],
+            "InvalidParameters": ["/missing"],
+        }
+
+        with self.assertRaises(Exception) as context:
+            fetch_parameters(["/missing"])
+        self.assertIn("/missing", str(context.exception))
@@ -0,0 +1,179 @@
+import json
+import os
+import sys
+import tempfile
+from unittest.mock import Mock, patch
+
+import boto3
+from botocore.stub import Stubber
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import \
+    InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import (ALWAYS_OFF, ALWAYS_ON,
+                                              ParentBased)
+from opentelemetry.trace import SpanKind
+
+from core.middleware import TracingMiddleware
+from core.models import User
+from core.utils import tracing
+from core.utils.instrumentation import timed
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+def traceparent(sampled=True):
+    return f"00-{TRACE_ID}-00f067aa0ba902b7-{'01' if sampled else '00'}"
+
+
+class TracingTestMixin:
+    sampler = ALWAYS_ON
+
+    def setUp(self):
+        super().setUp()
+        self.exporter = InMemorySpanExporter()
+        provider = TracerProvider(sampler=self.sampler)
+        provider.add_span_processor(SimpleSpanProcessor(self.exporter))
+        tracing.configure(provider)
+        self.tracer = provider.get_tracer("test")
+
+    def tearDown(self):
+        tracing.configure(None)
+        super().tearDown()
+
+    def span_names(self):
+        return [span.name for span in self.exporter.get_finished_spans()]
+
+
+class Service:
+
+    @tracing.traced
+    def run(self):
+        with timed("redis", "GET"):
+            pass
+        return "done"
+
+
+class TestSpans(TracingTestMixin, SimpleTestCase):
+
+    def test_nothing_is_traced_outside_a_trace(self):
+        self.assertEqual(Service().run(), "done")
+        with tracing.span("orphan"):
+            pass
+
+        self.assertEqual(self.span_names(), [])
+
+    def test_child_spans_share_the_request_trace(self):
+        with self.tracer.start_as_current_span("request"):
+            Service().run()
+
+        spans = {span.name: span for span in self.exporter.get_finished_spans()}
+        self.assertEqual(set(spans), {"request", "Service.run", "redis GET"})
+        self.assertEqual(len({span.context.trace_id
+                              for span in spans.values()}), 1)
+        self.assertEqual(spans["redis GET"].parent.span_id,
+                         spans["Service.run"].context.span_id)
+        self.assertEqual(spans["redis GET"].kind, SpanKind.CLIENT)
+
+    def test_boto3_calls_are_traced(self):
+        client = boto3.client("kms",
+                              region_name="us-east-1",
+                              aws_access_key_id="test",
+                              aws_secret_access_key="test")
+        tracing.instrument_boto3_client(client)
+        stubber = Stubber(client)
+        stubber.add_response("list_keys", {"Keys": []})
+        stubber.add_client_error("list_aliases", "AccessDeniedException")
+
+        with self.tracer.start_as_current_span("request"), stubber:
+            client.list_keys()
+            with self.assertRaises(client.exceptions.ClientError):
+                client.list_aliases()
+
+        spans = {span.name: span for span in self.exporter.get_finished_spans()}
+        self.assertTrue(spans["kms.ListKeys"].status.is_ok)
+        self.assertFalse(spans["kms.ListAliases"].status.is_ok)
+        self.assertEqual(spans["kms.ListAliases"].attributes["rpc.method"],
+                         "ListAliases")
+
+    def test_trace_context_is_injected_into_aws_requests(self):
+
+        class Request:
+            headers = {}
+
+        with self.tracer.start_as_current_span("request") as span:
+            tracing._inject_trace_context(Request())
+
+        self.assertIn(format(span.get_span_context().trace_id, "032x"),
+                      Request.headers["traceparent"])
+
+    def test_file_exporter_writes_json_lines(self):
+        with self.tracer.start_as_current_span("request"):
+            pass
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "spans.jsonl")
+            tracing.JsonLinesSpanExporter(path).export(
+                self.exporter.get_finished_spans())
+            with open(path) as file:
+                lines = file.readlines()
+
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["name"], "request")
+
+    def test_otlp_without_the_exporter_package_falls_back_to_a_file(self):
+        settings = Mock(TRACING_FILE_PATH="spans.jsonl")
+        with patch.dict(sys.modules, {
+                "opentelemetry.exporter.otlp.proto.http.trace_exporter": None
+        }), self.assertLogs("core.utils.tracing", level="WARNING"):
+            exporter = tracing.build_exporter("otlp", settings)
+
+        self.assertIsInstance(exporter, tracing.JsonLinesSpanExporter)
+        self.assertEqual(exporter.path, "spans.jsonl")
+
+    def test_unknown_exporter(self):
+        with self.assertRaises(ValueError):
+            tracing.build_exporter("zipkin", None)
+
+
+class TestTracingMiddleware(TracingTestMixin, TestCase):
+    sampler = ParentBased(ALWAYS_OFF)
+
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+
+        def view(request):
+            User.objects.filter(username="alice").exists()
+            return HttpResponse()
+
+        self.middleware = TracingMiddleware(view)
+
+    def test_continues_a_sampled_caller_trace(self):
+        response = self.middleware(
+            self.factory.get("/user/1", HTTP_TRACEPARENT=traceparent()))
+
+        self.assertEqual(response.status_code, 200)
+        spans = {span.name: span for span in self.exporter.get_finished_spans()}
+        self.assertEqual(set(spans), {"GET", "SELECT"})
+        self.assertEqual(format(spans["GET"].context.trace_id, "032x"),
+                         TRACE_ID)
+        self.assertEqual(spans["GET"].kind, SpanKind.SERVER)
+        self.assertEqual(spans["SELECT"].attributes["db.system"], "sqlite")
+
+    def test_follows_the_caller_sampling_decision(self):
+        self.middleware(
+            self.factory.get("/user/1",
+                             HTTP_TRACEPARENT=traceparent(sampled=False)))
+        self.middleware(self.factory.get("/user/1"))
+
+        self.assertEqual(self.span_names(), [])
+
+    def test_disabled_without_a_provider(self):
+        tracing.configure(None)
+
+        self.middleware(
+            self.factory.get("/user/1", HTTP_TRACEPARENT=traceparent()))
+
+        self.assertEqual(self.span_names(), [])
@@ -1,14 +1,16 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 # Import the PasswordService class.
 from core.services.password_service import PasswordService
+from core.services.user_service import UserService
 
 
 class TestPasswordService(unittest.TestCase):
 
     def setUp(self):
-        self.service = PasswordService()
+        self.identity_provider = MagicMock()
+        self.service = PasswordService(self.identity_provider)
         self.username = "testuser"
         self.new_password = "newpass"
         self.confirmation_code = "123456"
@@ -59,10 +61,8 @@ class TestPasswordService(unittest.TestCase):
 
     # --- Tests for initiate_user_password_reset ---
 
-    @patch('core.services.password_service.initiate_password_reset')
     @patch('core.services.password_service.logger')
-    def test_initiate_user_password_reset_success(self, mock_logger,
-                                                  mock_initiate):
+    def test_initiate_user_password_reset_success(self, mock_logger):
         """
         Test that initiate_user_password_reset calls initiate_password_reset
         correctly.
@@ -71,18 +71,18 @@ class TestPasswordService(unittest.TestCase):
         self.service.initiate_user_password_reset(self.username)
         # Verify that initiate_password_reset was called with the correct
         # username.
-        mock_initiate.assert_called_once_with(self.username)
+        self.identity_provider.initiate_password_reset.assert_called_once_with(
+            self.username)
         self.assertTrue(mock_logger.info.called)
 
-    @patch('core.services.password_service.initiate_password_reset')
     @patch('core.services.password_service.logger')
-    def test_initiate_user_password_reset_failure(self, mock_logger,
-                                                  mock_initiate):
+    def test_initiate_user_password_reset_failure(self, mock_logger):
         """
         Test that initiate_user_password_reset raises an exception if the
         underlying call fails.
         """
-        mock_initiate.side_effect = Exception("Reset error")
+        self.identity_provider.initiate_password_reset.side_effect = (
+            Exception("Reset error"))
         with self.assertRaises(Exception) as context:
             self.service.initiate_user_password_reset(self.username)
         self.assertIn("Failed to initiate password reset",
@@ -91,10 +91,8 @@ class TestPasswordService(unittest.TestCase):
 
     # --- Tests for complete_user_password_reset ---
 
-    @patch('core.services.password_service.complete_password_reset')
     @patch('core.services.password_service.logger')
-    def test_complete_user_password_reset_success(self, mock_logger,
-                                                  mock_complete):
+    def test_complete_user_password_reset_success(self, mock_logger):
         """
         Test that complete_user_password_reset calls complete_password_reset
         correctly.
@@ -102,20 +100,18 @@ class TestPasswordService(unittest.TestCase):
         self.service.complete_user_password_reset(self.username,
                                                   self.confirmation_code,
                                                   self.new_password)
-        mock_complete.assert_called_once_with(self.username,
-                                              self.confirmation_code,
-                                              self.new_password)
+        self.identity_provider.complete_password_reset.assert_called_once_with(
+            self.username, self.confirmation_code, self.new_password)
         self.assertTrue(mock_logger.info.called)
 
-    @patch('core.services.password_service.complete_password_reset')
     @patch('core.services.password_service.logger')
-    def test_complete_user_password_reset_failure(self, mock_logger,
-                                                  mock_complete):
+    def test_complete_user_password_reset_failure(self, mock_logger):
         """
         Test that complete_user_password_reset raises an exception if the
         underlying call fails.
         """
-        mock_complete.side_effect = Exception("Complete error")
+        self.identity_provider.complete_password_reset.side_effect = (
+            Exception("Complete error"))
         with self.assertRaises(Exception) as context:
             self.service.complete_user_password_reset(self.username,
                                                       self.confirmation_code,
@@ -123,3 +119,58 @@ class TestPasswordService(unittest.TestCase):
         self.assertIn("Failed to complete password reset",
                       str(context.exception))
         mock_logger.error.assert_called()
+
+
+class TestUserServiceSave(unittest.TestCase):
+
+    def setUp(self):
+        self.service = UserService()
+        self.service.auth_service = MagicMock()
+        self.service.password_service = MagicMock()
+        self.service.password_service.get_password_encrypted.return_value = (
+            "encrypted-pass")
+        self.entity = {
+            "username": "testuser",
+            "password": "testpass",
+            "email": "test@example.com",
+        }
+
+    @patch('core.services.user_service.UserService.user_repository')
+    def test_save_runs_remote_steps_and_creates_user(self, mock_repository):
+        mock_repository.create_entity.side_effect = lambda user, _: user
+
+        user = self.service.save(self.entity)
+
+        self.assertEqual(user.username, "testuser")
+        self.assertEqual(user.password, "encrypted-pass")
+        auth_service = self.service.auth_service
+        auth_service.register_user.assert_called_once_with(
+            "testuser", "testpass", "test@example.com")
+        auth_service.rollback_user_registration.assert_not_called()
+
+    @patch('core.services.user_service.UserService.user_repository')
+    def test_save_rolls_back_identity_user_when_encryption_fails(
+            self, mock_repository):
+        self.service.password_service.get_password_encrypted.side_effect = (
+            Exception("KMS unavailable"))
+
+        with self.assertRaises(Exception) as context:
+            self.service.save(self.entity)
+
+        self.assertIn("Registration failed", str(context.exception))
+        auth_service = self.service.auth_service
+        auth_service.rollback_user_registration.assert_called_once_with(
+            "testuser")
+        mock_repository.create_entity.assert_not_called()
+
+    @patch('core.services.user_service.UserService.user_repository')
+    def test_save_rolls_back_identity_user_when_insert_fails(
+            self, mock_repository):
+        mock_repository.create_entity.return_value = None
+
+        with self.assertRaises(Exception):
+            self.service.save(self.entity)
+
+        auth_service = self.service.auth_service
+        auth_service.rollback_user_registration.assert_called_once_with(
+            "testuser")
@@ -0,0 +1,61 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.utils import OperationalError
+from django.test import SimpleTestCase
+
+COMMAND = "core.management.commands.wait_for_db"
+
+
+@patch(f"{COMMAND}.time.sleep")
+@patch(f"{COMMAND}.probe_parameters")
+@patch(f"{COMMAND}.probe_redis")
+@patch(f"{COMMAND}.probe_database")
+class TestWaitForDbCommand(SimpleTestCase):
+
+    def test_all_dependencies_ready(self, mock_db, mock_redis, mock_params,
+                                    mock_sleep):
+        out = StringIO()
+
+        call_command("wait_for_db", stdout=out)
+
+        mock_db.assert_called_once()
+        mock_redis.assert_called_once()
+        mock_params.assert_called_once()
+        mock_sleep.assert_not_called()
+        self.assertIn("All dependencies available!", out.getvalue())
+
+    def test_retries_with_growing_backoff(self, mock_db, mock_redis,
+                                          mock_params, mock_sleep):
+        mock_db.side_effect = [OperationalError] * 3 + [None]
+
+        with patch(f"{COMMAND}.random.uniform",
+                   side_effect=lambda low, high: high):
+            call_command("wait_for_db", backoff_base=0.1, stdout=StringIO())
+
+        self.assertEqual(mock_db.call_count, 4)
+        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        self.assertEqual(delays, [0.1, 0.2, 0.4])
+
+    def test_deadline_reports_unavailable_dependency(self, mock_db,
+                                                     mock_redis, mock_params,
+                                                     mock_sleep):
+        mock_redis.side_effect = ConnectionError("refused")
+
+        with self.assertRaises(CommandError) as context:
+            call_command("wait_for_db", deadline=0, stdout=StringIO())
+
+        self.assertIn("Redis", str(context.exception))
+        self.assertNotIn("DB", str(context.exception))
+
+    def test_skipped_dependencies_are_not_probed(self, mock_db, mock_redis,
+                                                 mock_params, mock_sleep):
+        call_command("wait_for_db",
+                     skip=["redis", "parameters"],
+                     stdout=StringIO())
+
+        mock_db.assert_called_once()
+        mock_redis.assert_not_called()
+        mock_params.assert_not_called()
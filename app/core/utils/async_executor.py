@@ -0,0 +1,64 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+
+class BlockingExecutor:
+    """
+    Runs blocking calls (the ORM, boto3, the synchronous Redis clients)
+    from async code on a bounded pool of ``max_workers`` threads, so they
+    neither block the event loop nor queue behind each other on the single
+    thread that ``sync_to_async`` uses by default.
+
+    Each pool thread keeps its own database connection between calls, as a
+    request thread would; connections past CONN_MAX_AGE or left unusable
+    are closed before and after every call.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="async-blocking")
+            return self._executor
+
+    @staticmethod
+    def _call(fn: Callable[..., Any], args, kwargs) -> Any:
+        close_old_connections()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        return await sync_to_async(self._call,
+                                   thread_sensitive=False,
+                                   executor=self._get_executor())(fn, args,
+                                                                  kwargs)
+
+    def reset(self) -> None:
+        """
+        Forget the pool. Called in forked worker processes, which do not
+        inherit the parent's threads.
+        """
+        self._lock = threading.Lock()
+        self._executor = None
+
+
+# Process-wide executor used by the async repositories and views.
+blocking_executor = BlockingExecutor(settings.ASYNC_BLOCKING_MAX_WORKERS)
+
+
+async def run_blocking(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Await ``fn(*args, **kwargs)`` run on ``blocking_executor``."""
+    return await blocking_executor.run(fn, *args, **kwargs)
@@ -0,0 +1,79 @@
+import os
+import threading
+import weakref
+from typing import Any, Optional
+
+from core.utils import instrumentation, metrics, tracing
+from core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_lazy_clients: "weakref.WeakSet[LazyClient]" = weakref.WeakSet()
+
+
+def endpoint_url(service_name: str) -> Optional[str]:
+    """
+    Endpoint override for a service, e.g. a local stub server, from
+    AWS_ENDPOINT_URL_<SERVICE> (``cognito-idp`` reads
+    AWS_ENDPOINT_URL_COGNITO_IDP) or AWS_ENDPOINT_URL for every service.
+    """
+    service = service_name.upper().replace("-", "_")
+    return (os.environ.get(f"AWS_ENDPOINT_URL_{service}")
+            or os.environ.get("AWS_ENDPOINT_URL"))
+
+
+class LazyClient:
+    """
+    Proxy for a boto3 client that imports boto3 and builds the client on
+    first attribute access. Importing boto3 and loading the service model
+    costs well over 100ms, which process startup no longer pays for modules
+    that never make an AWS call.
+    """
+
+    def __init__(self, service_name: str, **client_kwargs: Any) -> None:
+        self.service_name = service_name
+        self.client_kwargs = client_kwargs
+        self._client: Optional[Any] = None
+        self._lock = threading.Lock()
+        _lazy_clients.add(self)
+
+    def get_client(self) -> Any:
+        client = self._client
+        if client is None:
+            with self._lock:
+                if self._client is None:
+                    import boto3
+
+                    logger.info("[LazyClient] Creating %s client",
+                                self.service_name)
+                    kwargs = dict(self.client_kwargs)
+                    url = endpoint_url(self.service_name)
+                    if url:
+                        kwargs.setdefault("endpoint_url", url)
+                    self._client = boto3.client(self.service_name, **kwargs)
+                    instrumentation.instrument_boto3_client(self._client)
+                    metrics.instrument_boto3_client(self._client)
+                    tracing.instrument_boto3_client(self._client)
+                client = self._client
+        return client
+
+    def reset(self) -> None:
+        """Drop the client so the next call builds a new one."""
+        with self._lock:
+            self._client = None
+
+    def __getattr__(self, name: str) -> Any:
+        # Introspection (mock, copy, inspect) must not build the client.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.get_client(), name)
+
+
+def reset_clients() -> None:
+    """
+    Drop every lazily built client. boto3 clients are not safe to share
+    across fork, so forked workers call this before serving requests.
+    """
+    for client in list(_lazy_clients):
+        client._lock = threading.Lock()
+        client._client = None
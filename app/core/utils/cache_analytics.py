@@ -0,0 +1,155 @@
+"""
+Key-space analytics for the repository cache.
+
+A sample of cache operations (CACHE_ANALYTICS_SAMPLE_RATE) is counted in a
+count-min sketch, which estimates the access count of any key in fixed
+memory, and the keys with the highest estimates are kept as the hot keys.
+Counts are halved every CACHE_ANALYTICS_WINDOW samples so the hot keys
+follow recent traffic. Sampled values also feed the cache_value_bytes
+histogram, and sampled hits ask Redis for the key's remaining TTL for the
+cache_ttl_at_read_seconds histogram, which together show whether a
+CacheModel.expiration is longer than the keys are actually read for.
+"""
+
+import os
+import random
+import threading
+from typing import Any, Dict, List, Optional
+
+from redis import RedisError
+
+from core.utils.metrics import observe_cache_ttl, observe_cache_value
+
+CACHE_ANALYTICS_SAMPLE_RATE = float(
+    os.environ.get("CACHE_ANALYTICS_SAMPLE_RATE", 0.01))
+CACHE_ANALYTICS_TOP_K = int(os.environ.get("CACHE_ANALYTICS_TOP_K", 20))
+CACHE_ANALYTICS_WINDOW = int(os.environ.get("CACHE_ANALYTICS_WINDOW", 100000))
+# Sketch dimensions: estimates exceed the true count by at most
+# e / width of all samples with probability 1 - e ** -depth.
+CACHE_ANALYTICS_SKETCH_WIDTH = 2048
+CACHE_ANALYTICS_SKETCH_DEPTH = 4
+
+
+class CountMinSketch:
+    """Approximate counts of keys in ``depth`` rows of ``width`` counters."""
+
+    def __init__(self, width: int, depth: int) -> None:
+        self.width = width
+        self.depth = depth
+        self.rows = [[0] * width for _ in range(depth)]
+
+    def _indexes(self, key: str):
+        return (hash((row, key)) % self.width for row in range(self.depth))
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Count ``key`` and return its new estimate."""
+        estimate = None
+        for row, index in zip(self.rows, self._indexes(key)):
+            row[index] += count
+            if estimate is None or row[index] < estimate:
+                estimate = row[index]
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        return min(
+            row[index] for row, index in zip(self.rows, self._indexes(key)))
+
+    def halve(self) -> None:
+        for row in self.rows:
+            row[:] = [count // 2 for count in row]
+
+
+class KeySpaceAnalytics:
+    """
+    Samples cache operations into a CountMinSketch and keeps the ``top_k``
+    keys with the highest estimates. An operation that is not sampled costs
+    one call to ``random.random``.
+    """
+
+    def __init__(self,
+                 sample_rate: float = CACHE_ANALYTICS_SAMPLE_RATE,
+                 top_k: int = CACHE_ANALYTICS_TOP_K,
+                 window: int = CACHE_ANALYTICS_WINDOW,
+                 width: int = CACHE_ANALYTICS_SKETCH_WIDTH,
+                 depth: int = CACHE_ANALYTICS_SKETCH_DEPTH) -> None:
+        self.sample_rate = sample_rate
+        self.top_k = top_k
+        self.window = window
+        self.width = width
+        self.depth = depth
+        self.reset()
+
+    def sampled(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            estimate = self._sketch.add(key)
+            self.samples += 1
+            if key in self._top or len(self._top) < self.top_k:
+                self._top[key] = estimate
+            else:
+                coldest = min(self._top, key=self._top.get)
+                if estimate > self._top[coldest]:
+                    del self._top[coldest]
+                    self._top[key] = estimate
+            if self.samples % self.window == 0:
+                self._sketch.halve()
+                self._top = {
+                    key: count // 2
+                    for key, count in self._top.items() if count > 1
+                }
+
+    def record_read(self, key: str, value: Optional[bytes], client) -> None:
+        """
+        Sample a GET of ``key``; ``value`` is None on a miss. Sampled hits
+        cost one extra TTL round trip on ``client``.
+        """
+        if not self.sampled():
+            return
+        self._count(key)
+        if value is None:
+            return
+        observe_cache_value("get", key, len(value))
+        try:
+            ttl = client.ttl(key)
+        except (RedisError, OSError):
+            return
+        # -1: no expiry, -2: expired since the read.
+        if isinstance(ttl, int) and ttl >= 0:
+            observe_cache_ttl(key, ttl)
+
+    def record_write(self, key: str, value: Any) -> None:
+        if not self.sampled():
+            return
+        self._count(key)
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        observe_cache_value("set", key, len(value))
+
+    def hot_keys(self) -> List[Dict[str, Any]]:
+        """The hot keys, hottest first, with their estimated sample count."""
+        with self._lock:
+            top = sorted(self._top.items(), key=lambda item: -item[1])
+        return [{"key": key, "estimated_samples": count} for key, count in top]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "sample_rate": self.sample_rate,
+            "samples": self.samples,
+            "hot_keys": self.hot_keys(),
+        }
+
+    def reset(self) -> None:
+        """
+        Start over with empty counts. Also called in forked worker
+        processes, which must not count with the parent's lock.
+        """
+        self._lock = threading.Lock()
+        self._sketch = CountMinSketch(self.width, self.depth)
+        self._top: Dict[str, int] = {}
+        self.samples = 0
+
+
+# Process-wide analytics fed by core.utils.cache_util.cache.
+key_space_analytics = KeySpaceAnalytics()
@@ -1,13 +1,38 @@
+import asyncio
 import os
-from typing import Optional
+import random
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Optional
 
 import redis.asyncio as redis
+from redis import Redis as SyncRedis
+from redis import RedisError
 
+from core.utils.async_executor import run_blocking
+from core.utils.cache_analytics import KeySpaceAnalytics, key_space_analytics
+from core.utils.instrumentation import timed
 from core.utils.logger import get_logger
+from core.utils.metrics import record_cache
 from core.utils.ssm_util import get_cached_parameter
 
 logger = get_logger(__name__)
 
+# Client side timeouts for the synchronous cache used by the repositories.
+# They are deliberately short: a slow cache must not be slower than the
+# database it sits in front of.
+CACHE_SOCKET_TIMEOUT = float(os.environ.get("CACHE_SOCKET_TIMEOUT", 0.25))
+CACHE_RECONNECT_BACKOFF_BASE = float(
+    os.environ.get("CACHE_RECONNECT_BACKOFF_BASE", 0.5))
+CACHE_RECONNECT_BACKOFF_MAX = float(
+    os.environ.get("CACHE_RECONNECT_BACKOFF_MAX", 30))
+# Keys deleted while the cache is degraded are remembered, up to this many,
+# and deleted again once the connection is healthy so that no stale entry
+# outlives an invalidation that happened during an outage.
+CACHE_PENDING_DELETES_MAX = int(
+    os.environ.get("CACHE_PENDING_DELETES_MAX", 10000))
+
 
 class Cache:
     """
@@ -24,7 +49,9 @@ class Cache:
         try:
             await self.client.set(key, value, ex=ttl)
         except Exception as e:
-            logger.error(f"Redis set error for key '{key}': {e}",
+            logger.error("Redis set error for key '%s': %s",
+                         key,
+                         e,
                          exc_info=True)
             raise
 
@@ -36,7 +63,9 @@ class Cache:
             value = await self.client.get(key)
             return value.decode("utf-8") if value is not None else None
         except Exception as e:
-            logger.error(f"Redis get error for key '{key}': {e}",
+            logger.error("Redis get error for key '%s': %s",
+                         key,
+                         e,
                          exc_info=True)
             raise
 
@@ -47,49 +76,295 @@ class Cache:
         try:
             await self.client.delete(key)
         except Exception as e:
-            logger.error(f"Redis delete error for key '{key}': {e}",
+            logger.error("Redis delete error for key '%s': %s",
+                         key,
+                         e,
                          exc_info=True)
             raise
 
 
+def get_redis_url() -> str:
+    """
+    Resolve the Redis URL from SSM (for production) or directly from an
+    environment variable (for local/test).
+    """
+    env = os.environ.get("DJANGO_ENV", "").lower()
+    if env in ["local", "test"]:
+        redis_url = os.environ.get("REDIS_URL")
+        if not redis_url:
+            raise Exception("Environment variable 'REDIS_URL' is not set")
+        logger.info("[init_cache] Using local Redis URL: %s", redis_url)
+        return redis_url
+    # Retrieve the Redis URL using the SSM parameter name provided in
+    # the environment variable REDIS_URL_SSM_NAME.
+    param_name = os.environ["REDIS_URL_SSM_NAME"]
+    redis_url = get_cached_parameter(param_name)
+    logger.info("[init_cache] Fetched Redis URL from SSM for parameter: %s",
+                param_name)
+    return redis_url
+
+
 async def init_cache() -> Cache:
     """
-    Initialize the Redis client using the URL from SSM (for production) or
-    directly from an environment variable (for local/test) and return a Cache
-    instance.
+    Initialize the Redis client using the URL returned by get_redis_url and
+    return a Cache instance.
     """
     try:
-        env = os.environ.get("DJANGO_ENV", "").lower()
-        if env in ["local", "test"]:
-            redis_url = os.environ.get("REDIS_URL")
-            if not redis_url:
-                raise Exception("Environment variable 'REDIS_URL' is not set")
-            logger.info(f"[init_cache] Using local Redis URL: {redis_url}")
-        else:
-            # Retrieve the Redis URL using the SSM parameter name provided in
-            # the environment variable REDIS_URL_SSM_NAME.
-            param_name = os.environ["REDIS_URL_SSM_NAME"]
-            redis_url = get_cached_parameter(param_name)
-            logger.info(
-                f"[init_cache] Fetched Redis URL from SSM for parameter: "
-                f"{param_name}")
+        redis_url = await run_blocking(get_redis_url)
         client = redis.Redis.from_url(redis_url)
         # Optionally, check the connection with a PING.
         await client.ping()
         logger.info("Redis client initialized successfully")
         return Cache(client)
     except Exception as e:
-        logger.error(f"Failed to initialize Redis client: {e}", exc_info=True)
+        logger.error("Failed to initialize Redis client: %s", e, exc_info=True)
         raise Exception(f"Failed to initialize Redis client: {e}") from e
 
 
-# Global variable for the cache instance
-cache: Cache = None  # type: ignore
+# One async Cache per event loop; redis.asyncio connections belong to the
+# loop that opened them.
+_async_caches: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Cache]" = (
+    weakref.WeakKeyDictionary())
+_async_cache_retry_at = 0.0
+
+
+async def get_async_cache() -> Optional[Cache]:
+    """
+    The async Cache of the running event loop, connected on first use with
+    the same timeouts as the synchronous cache. Returns None while Redis is
+    unreachable, trying again at most every CACHE_RECONNECT_BACKOFF_MAX
+    seconds, so callers fall back to the database. The URL may come from
+    SSM, so it is resolved on the blocking executor.
+    """
+    global _async_cache_retry_at
+    loop = asyncio.get_running_loop()
+    cache_instance = _async_caches.get(loop)
+    if cache_instance is not None:
+        return cache_instance
+    if time.monotonic() < _async_cache_retry_at:
+        return None
+    try:
+        client = redis.Redis.from_url(
+            await run_blocking(get_redis_url),
+            socket_timeout=CACHE_SOCKET_TIMEOUT,
+            socket_connect_timeout=CACHE_SOCKET_TIMEOUT)
+        await client.ping()
+    except Exception as error:
+        _async_cache_retry_at = (time.monotonic() +
+                                 CACHE_RECONNECT_BACKOFF_MAX)
+        logger.warning("[get_async_cache] Redis unavailable (%s)", error)
+        return None
+    return _async_caches.setdefault(loop, Cache(client))
+
+
+class CacheState:
+    CONNECTING = "connecting"
+    HEALTHY = "healthy"
+    DEGRADED = "degraded"
 
 
-async def _initialize_cache():
+def _default_client_factory() -> SyncRedis:
+    return SyncRedis.from_url(get_redis_url(),
+                              socket_timeout=CACHE_SOCKET_TIMEOUT,
+                              socket_connect_timeout=CACHE_SOCKET_TIMEOUT)
+
+
+class ResilientCache:
     """
-    Asynchronously initialize the global cache.
+    Synchronous Redis cache used by the repositories.
+
+    The connection is opened lazily, in a background thread, the first time
+    the cache is used. Until it is healthy, and whenever an operation fails,
+    the cache behaves as a pass-through no-op: reads miss and writes are
+    dropped, so callers fall back to the database instead of failing. A
+    failed operation moves the cache to ``degraded`` and starts reconnecting
+    with exponential backoff and full jitter.
+
+    Reads and writes are sampled into ``analytics`` (see
+    core.utils.cache_analytics).
     """
-    global cache
-    cache = await init_cache()
+
+    def __init__(self,
+                 client_factory: Optional[Callable[[], Any]] = None,
+                 backoff_base: float = CACHE_RECONNECT_BACKOFF_BASE,
+                 backoff_max: float = CACHE_RECONNECT_BACKOFF_MAX,
+                 analytics: Optional[KeySpaceAnalytics] = None) -> None:
+        self.client_factory = client_factory or _default_client_factory
+        self.analytics = analytics or key_space_analytics
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.state: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.state_changed_at = time.monotonic()
+        self._client = None
+        self._connector: Optional[threading.Thread] = None
+        self._pending_deletes: Dict[str, None] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def _set_state(self, state: str, error: Optional[BaseException] = None):
+        if error is not None:
+            self.last_error = str(error)
+        if state != self.state:
+            logger.warning("[ResilientCache] Cache state %s -> %s", self.state,
+                           state)
+            self.state = state
+            self.state_changed_at = time.monotonic()
+
+    def connect(self) -> None:
+        """Start connecting in the background if not already doing so."""
+        with self._lock:
+            if self._connector is not None and self._connector.is_alive():
+                return
+            if self.state is None:
+                self._set_state(CacheState.CONNECTING)
+            self._connector = threading.Thread(target=self._connect_loop,
+                                               name="cache-connect",
+                                               daemon=True)
+            self._connector.start()
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(
+            0, min(self.backoff_max, self.backoff_base * (2**attempt)))
+
+    def _connect_loop(self) -> None:
+        attempt = 0
+        while not self._stopped.is_set():
+            try:
+                client = self.client_factory()
+                client.ping()
+                with self._lock:
+                    self._client = client
+                    self._set_state(CacheState.HEALTHY)
+                self._replay_pending_deletes(client)
+                return
+            except Exception as error:
+                with self._lock:
+                    self._client = None
+                    self._set_state(CacheState.DEGRADED, error)
+                delay = self._backoff(attempt)
+                logger.warning(
+                    "[ResilientCache] Redis unavailable (%s), retrying in "
+                    "%.2fs", error, delay)
+                attempt += 1
+                self._stopped.wait(delay)
+
+    def _replay_pending_deletes(self, client) -> None:
+        with self._lock:
+            keys = list(self._pending_deletes)
+        if keys:
+            client.delete(*keys)
+            with self._lock:
+                for key in keys:
+                    self._pending_deletes.pop(key, None)
+            logger.info("[ResilientCache] Replayed %s pending deletes",
+                        len(keys))
+
+    def _get_client(self):
+        client = self._client
+        if client is None:
+            self.connect()
+        return client
+
+    def _failed(self, operation: str, key: str, error: Exception) -> None:
+        logger.warning("[ResilientCache] Redis %s failed for key '%s': %s",
+                       operation, key, error)
+        with self._lock:
+            self._client = None
+            self._set_state(CacheState.DEGRADED, error)
+        self.connect()
+
+    def get(self, key: str) -> Optional[str]:
+        client = self._get_client()
+        if client is None:
+            record_cache("get", key, "unavailable")
+            return None
+        try:
+            with timed("redis", "GET"):
+                value = client.get(key)
+        except (RedisError, OSError) as error:
+            record_cache("get", key, "error")
+            self._failed("get", key, error)
+            return None
+        self.analytics.record_read(key, value, client)
+        if value is None:
+            record_cache("get", key, "miss")
+            return None
+        record_cache("get", key, "hit")
+        return value.decode("utf-8")
+
+    def set(self, key: str, value: str, timeout: Optional[int] = None) -> None:
+        client = self._get_client()
+        if client is None:
+            record_cache("set", key, "unavailable")
+            return
+        try:
+            with timed("redis", "SET"):
+                client.set(key, value, ex=timeout)
+            record_cache("set", key, "ok")
+            self.analytics.record_write(key, value)
+        except (RedisError, OSError) as error:
+            record_cache("set", key, "error")
+            self._failed("set", key, error)
+
+    def delete(self, key: str) -> None:
+        client = self._get_client()
+        if client is not None:
+            try:
+                with timed("redis", "DEL"):
+                    client.delete(key)
+                record_cache("delete", key, "ok")
+                return
+            except (RedisError, OSError) as error:
+                record_cache("delete", key, "error")
+                self._failed("delete", key, error)
+        else:
+            record_cache("delete", key, "unavailable")
+        with self._lock:
+            if len(self._pending_deletes) < CACHE_PENDING_DELETES_MAX:
+                self._pending_deletes[key] = None
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "healthy": self.state == CacheState.HEALTHY,
+            "last_error": self.last_error,
+            "seconds_in_state": time.monotonic() - self.state_changed_at,
+        }
+
+    def reconnect(self) -> None:
+        """
+        Build a new client (e.g. after the Redis URL changed) and swap it in
+        once it answers a PING. The current client keeps serving until then.
+        """
+        try:
+            client = self.client_factory()
+            client.ping()
+        except Exception as error:
+            self._failed("reconnect", "", error)
+            return
+        with self._lock:
+            previous, self._client = self._client, client
+            self._set_state(CacheState.HEALTHY)
+        if previous is not None:
+            previous.close()
+        logger.info("[ResilientCache] Reconnected with a new client")
+
+    def reset(self) -> None:
+        """
+        Forget the current connection and connector thread. Called in
+        forked worker processes, which must not share the parent's socket
+        and do not inherit its threads.
+        """
+        self._lock = threading.Lock()
+        self._client = None
+        self._connector = None
+        self.state = None
+        self.state_changed_at = time.monotonic()
+
+    def close(self) -> None:
+        self._stopped.set()
+
+
+# Process-wide cache used by the repositories and services.
+cache = ResilientCache()
@@ -1,15 +1,14 @@
 import os
 
-import boto3
-
+from core.utils.aws_clients import LazyClient
 from core.utils.logger import get_logger
 from core.utils.ssm_util import get_cached_parameter
 
 logger = get_logger(__name__)
 
-cognito_client = boto3.client("cognito-idp",
-                              region_name=os.environ.get(
-                                  "AWS_REGION", "us-east-1"))
+cognito_client = LazyClient("cognito-idp",
+                            region_name=os.environ.get("AWS_REGION",
+                                                       "us-east-1"))
 
 
 def authenticate(username: str, password: str) -> str:
@@ -23,7 +22,7 @@ def authenticate(username: str, password: str) -> str:
         CLIENT_ID = get_cached_parameter(
             get_cached_parameter(CLIENT_ID_SSM_PATH))
 
-        logger.info(f"[CognitoService] Authenticating user: {username}")
+        logger.info("[CognitoService] Authenticating user: %s", username)
         user_pool_id = get_cached_parameter("/myapp/cognito/user-pool-id")
         response = cognito_client.admin_initiate_auth(
             UserPoolId=user_pool_id,
@@ -34,17 +33,16 @@ def authenticate(username: str, password: str) -> str:
                 "PASSWORD": password
             },
         )
-        logger.info(
-            f"[CognitoService] User authenticated successfully: {username}")
+        logger.info("[CognitoService] User authenticated successfully: %s",
+                    username)
         auth_result = response.get("AuthenticationResult")
         if auth_result is None:
             raise Exception("Authentication failed: no result")
         return auth_result.get("IdToken")
     except Exception as error:
-        logger.error(
-            f"[CognitoService] Authentication failed for user: {username}",
-            exc_info=True,
-        )
+        logger.error("[CognitoService] Authentication failed for user: %s",
+                     username,
+                     exc_info=True)
         raise Exception("Authentication failed") from error
 
 
@@ -58,7 +56,7 @@ def register_user(username: str, password: str, email: str) -> dict:
 
         CLIENT_ID = get_cached_parameter(
             get_cached_parameter(CLIENT_ID_SSM_PATH))
-        logger.info(f"[CognitoService] Registering user: {username}")
+        logger.info("[CognitoService] Registering user: %s", username)
         cognito_client.sign_up(
             ClientId=CLIENT_ID,
             Username=username,
@@ -68,14 +66,13 @@ def register_user(username: str, password: str, email: str) -> dict:
                 "Value": email
             }],
         )
-        logger.info(
-            f"[CognitoService] User registered successfully: {username}")
+        logger.info("[CognitoService] User registered successfully: %s",
+                    username)
         return {"message": "User registered successfully"}
     except Exception as error:
-        logger.error(
-            f"[CognitoService] Registration failed for user: {username}",
-            exc_info=True,
-        )
+        logger.error("[CognitoService] Registration failed for user: %s",
+                     username,
+                     exc_info=True)
         raise Exception("Registration failed") from error
 
 
@@ -89,22 +86,21 @@ def confirm_user_registration(username: str, confirmation_code: str) -> dict:
 
         CLIENT_ID = get_cached_parameter(
             get_cached_parameter(CLIENT_ID_SSM_PATH))
-        logger.info(
-            f"[CognitoService] Confirming registration for user: {username}")
+        logger.info("[CognitoService] Confirming registration for user: %s",
+                    username)
         cognito_client.confirm_sign_up(
             ClientId=CLIENT_ID,
             Username=username,
             ConfirmationCode=confirmation_code,
         )
         logger.info(
-            f"[CognitoService] User registration confirmed successfully: "
-            f"{username}")
+            "[CognitoService] User registration confirmed successfully: %s",
+            username)
         return {"message": "User confirmed successfully"}
     except Exception as error:
-        logger.error(
-            f"[CognitoService] Confirmation failed for user: {username}",
-            exc_info=True,
-        )
+        logger.error("[CognitoService] Confirmation failed for user: %s",
+                     username,
+                     exc_info=True)
         raise Exception("User confirmation failed") from error
 
 
@@ -118,25 +114,24 @@ def initiate_password_reset(username: str) -> dict:
 
         CLIENT_ID = get_cached_parameter(
             get_cached_parameter(CLIENT_ID_SSM_PATH))
-        logger.info(
-            f"[CognitoService] Initiating password reset for user: {username}")
+        logger.info("[CognitoService] Initiating password reset for user: %s",
+                    username)
         cognito_client.forgot_password(
             ClientId=CLIENT_ID,
             Username=username,
         )
         logger.info(
-            f"[CognitoService] Password reset initiated successfully for "
-            f"user: {username}")
+            "[CognitoService] Password reset initiated successfully for "
+            "user: %s", username)
         return {
             "message":
             ("Password reset initiated. Check your email for the code.")
         }
     except Exception as error:
         logger.error(
-            f"[CognitoService] Failed to initiate password reset for user: "
-            f"{username}",
-            exc_info=True,
-        )
+            "[CognitoService] Failed to initiate password reset for user: %s",
+            username,
+            exc_info=True)
         raise Exception("Password reset initiation failed") from error
 
 
@@ -151,8 +146,8 @@ def complete_password_reset(username: str, new_password: str,
 
         CLIENT_ID = get_cached_parameter(
             get_cached_parameter(CLIENT_ID_SSM_PATH))
-        logger.info(
-            f"[CognitoService] Completing password reset for user: {username}")
+        logger.info("[CognitoService] Completing password reset for user: %s",
+                    username)
         cognito_client.confirm_forgot_password(
             ClientId=CLIENT_ID,
             Username=username,
@@ -160,13 +155,30 @@ def complete_password_reset(username: str, new_password: str,
             ConfirmationCode=confirmation_code,
         )
         logger.info(
-            f"[CognitoService] Password reset completed successfully for "
-            f"user: {username}")
+            "[CognitoService] Password reset completed successfully for "
+            "user: %s", username)
         return {"message": "Password reset successfully"}
     except Exception as error:
         logger.error(
-            f"[CognitoService] Failed to complete password reset for user: "
-            f"{username}",
-            exc_info=True,
-        )
+            "[CognitoService] Failed to complete password reset for user: %s",
+            username,
+            exc_info=True)
         raise Exception("Password reset failed") from error
+
+
+def delete_user(username: str) -> dict:
+    """Delete a user from the Cognito user pool."""
+    try:
+        logger.info("[CognitoService] Deleting user: %s", username)
+        user_pool_id = get_cached_parameter("/myapp/cognito/user-pool-id")
+        cognito_client.admin_delete_user(
+            UserPoolId=user_pool_id,
+            Username=username,
+        )
+        logger.info("[CognitoService] User deleted successfully: %s", username)
+        return {"message": "User deleted successfully"}
+    except Exception as error:
+        logger.error("[CognitoService] Failed to delete user: %s",
+                     username,
+                     exc_info=True)
+        raise Exception("User deletion failed") from error
@@ -0,0 +1,173 @@
+import base64
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from core.utils import ssm_util
+from core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# The last good parameter values are kept in a local snapshot encrypted with
+# AES-GCM so a restart does not have to wait on SSM. The snapshot is only
+# used when both a path and a base64 encoded 256 bit key are configured.
+SNAPSHOT_PATH = os.environ.get("CONFIG_SNAPSHOT_PATH")
+SNAPSHOT_KEY = os.environ.get("CONFIG_SNAPSHOT_KEY")
+SNAPSHOT_AAD = b"config-snapshot-v1"
+NONCE_SIZE = 12
+
+# Startup measurements, exported as gauges by core.utils.metrics once the app
+# is ready. The settings module imports this one first, so startup is timed
+# from here.
+startup_metrics: Dict[str, object] = {}
+_imported_at = time.perf_counter()
+
+
+def record_ready() -> None:
+    """Note how long startup took, from loading the settings until now."""
+    elapsed = time.perf_counter() - _imported_at
+    startup_metrics["startup_seconds"] = elapsed
+    logger.info("[ConfigLoader] App ready %.3fs after loading the settings",
+                elapsed,
+                extra={
+                    "metric": "startup_seconds",
+                    "value": elapsed
+                })
+
+
+class ConfigSnapshot:
+    """Encrypted on-disk copy of the last good parameter values."""
+
+    def __init__(self, path: str, key: bytes) -> None:
+        self.path = path
+        self.aesgcm = AESGCM(key)
+
+    def read(self) -> Optional[Dict[str, str]]:
+        try:
+            with open(self.path, "rb") as snapshot_file:
+                blob = snapshot_file.read()
+            plaintext = self.aesgcm.decrypt(blob[:NONCE_SIZE],
+                                            blob[NONCE_SIZE:], SNAPSHOT_AAD)
+            return json.loads(plaintext)["values"]
+        except FileNotFoundError:
+            return None
+        except (InvalidTag, ValueError, KeyError, OSError):
+            logger.warning("[ConfigSnapshot] Ignoring unreadable snapshot %s",
+                           self.path,
+                           exc_info=True)
+            return None
+
+    def write(self, values: Dict[str, str]) -> None:
+        nonce = os.urandom(NONCE_SIZE)
+        plaintext = json.dumps({
+            "values": values,
+            "saved_at": time.time()
+        }).encode("utf-8")
+        blob = nonce + self.aesgcm.encrypt(nonce, plaintext, SNAPSHOT_AAD)
+        tmp_path = f"{self.path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as snapshot_file:
+            snapshot_file.write(blob)
+        os.replace(tmp_path, self.path)
+
+
+class ConfigLoader:
+    """
+    Resolves every required parameter in one concurrent batch. When a
+    snapshot is configured and holds all the names, the process boots from
+    it and the values are revalidated against SSM in a background thread.
+    """
+
+    def __init__(self,
+                 names: Iterable[str],
+                 snapshot: Optional[ConfigSnapshot] = None) -> None:
+        self.names: List[str] = [name for name in names if name]
+        self.snapshot = snapshot
+        self.revalidation: Optional[threading.Thread] = None
+
+    def load(self) -> Dict[str, str]:
+        started = time.perf_counter()
+        values = self._load_snapshot()
+        source = "snapshot"
+        if values is None:
+            values = ssm_util.get_parameters(self.names)
+            source = "ssm"
+            self._save_snapshot(values)
+        else:
+            ssm_util.cache_parameters(values)
+            self.revalidation = threading.Thread(target=self.revalidate,
+                                                 args=(values, ),
+                                                 name="config-revalidate",
+                                                 daemon=True)
+            self.revalidation.start()
+
+        elapsed = time.perf_counter() - started
+        startup_metrics["config_load_seconds"] = elapsed
+        startup_metrics["config_source"] = source
+        logger.info("[ConfigLoader] Loaded %s parameters from %s in %.3fs",
+                    len(values),
+                    source,
+                    elapsed,
+                    extra={
+                        "metric": "config_load_seconds",
+                        "value": elapsed,
+                        "source": source
+                    })
+        return values
+
+    def revalidate(self, booted_values: Dict[str, str]) -> None:
+        """
+        Fetch the parameters from SSM and refresh the cache and snapshot.
+        Values that changed since the snapshot was written are logged; they
+        apply to lookups made from now on.
+        """
+        try:
+            values = ssm_util.get_parameters(self.names)
+        except Exception:
+            logger.warning(
+                "[ConfigLoader] Revalidation failed, keeping snapshot values",
+                exc_info=True)
+            return
+        changed = sorted(name for name in values
+                         if values[name] != booted_values.get(name))
+        if changed:
+            logger.warning(
+                "[ConfigLoader] Parameters changed since the snapshot: %s",
+                changed)
+        self._save_snapshot(values)
+
+    def _load_snapshot(self) -> Optional[Dict[str, str]]:
+        if self.snapshot is None:
+            return None
+        values = self.snapshot.read()
+        if values is None or any(name not in values for name in self.names):
+            return None
+        return {name: values[name] for name in self.names}
+
+    def _save_snapshot(self, values: Dict[str, str]) -> None:
+        if self.snapshot is None:
+            return
+        try:
+            self.snapshot.write(values)
+        except OSError:
+            logger.warning("[ConfigLoader] Could not write config snapshot",
+                           exc_info=True)
+
+
+def get_snapshot() -> Optional[ConfigSnapshot]:
+    if not SNAPSHOT_PATH or not SNAPSHOT_KEY:
+        return None
+    return ConfigSnapshot(SNAPSHOT_PATH, base64.b64decode(SNAPSHOT_KEY))
+
+
+def load_parameters(names: Iterable[Optional[str]]) -> Dict[str, str]:
+    """
+    Resolve the given parameter names, skipping unset (None) names, using
+    the snapshot configured by CONFIG_SNAPSHOT_PATH and CONFIG_SNAPSHOT_KEY.
+    """
+    return ConfigLoader(names, get_snapshot()).load()
@@ -0,0 +1,123 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections
+from redis import Redis as SyncRedis
+
+from core.db.pool import pool_stats
+from core.utils import config_loader, ssm_util
+from core.utils.cache_util import CACHE_SOCKET_TIMEOUT, cache, get_redis_url
+from core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def probe_database(alias: str = "default") -> None:
+    """Open (or reuse) a connection and run a trivial query."""
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def probe_redis() -> None:
+    client = SyncRedis.from_url(get_redis_url(),
+                                socket_timeout=CACHE_SOCKET_TIMEOUT,
+                                socket_connect_timeout=CACHE_SOCKET_TIMEOUT)
+    try:
+        client.ping()
+    finally:
+        client.close()
+
+
+def probe_parameters() -> None:
+    """Resolve the startup parameters directly from the parameter store."""
+    ssm_util.fetch_parameters(settings.REQUIRED_PARAMETERS)
+
+
+class CachedCheck:
+    """
+    Wraps a health check so it runs at most once per ``ttl`` seconds per
+    process. While one thread refreshes an expired result, other callers get
+    the previous result instead of piling onto the dependency.
+    """
+
+    def __init__(self, name: str, check: Callable[[], Dict[str, Any]],
+                 ttl: float) -> None:
+        self.name = name
+        self.check = check
+        self.ttl = ttl
+        self._result: Optional[Dict[str, Any]] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self) -> Dict[str, Any]:
+        if self._result is not None and time.monotonic() < self._expires_at:
+            return self._result
+        if not self._lock.acquire(blocking=self._result is None):
+            return self._result
+        try:
+            if self._result is None or time.monotonic() >= self._expires_at:
+                try:
+                    self._result = self.check()
+                except Exception as error:
+                    logger.warning("[Health] Check %s failed: %s", self.name,
+                                   error)
+                    self._result = {"ok": False, "error": str(error)}
+                self._expires_at = time.monotonic() + self.ttl
+            return self._result
+        finally:
+            self._lock.release()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._result = None
+            self._expires_at = 0.0
+
+
+def check_database() -> Dict[str, Any]:
+    started = time.perf_counter()
+    probe_database()
+    result = {
+        "ok": True,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
+    pool = pool_stats().get("default")
+    if pool is not None:
+        result["pool"] = {
+            key: pool[key]
+            for key in ("max_size", "in_use", "idle", "utilization",
+                        "timeouts", "wait_seconds_avg")
+        }
+    return result
+
+
+def check_cache() -> Dict[str, Any]:
+    # The cache falls back to the database when degraded, so by default an
+    # unhealthy cache does not take the instance out of rotation.
+    health = cache.health()
+    return {
+        "ok": health["healthy"] or not settings.READINESS_REQUIRE_CACHE,
+        "state": health["state"],
+    }
+
+
+def check_config() -> Dict[str, Any]:
+    source = config_loader.startup_metrics.get("config_source")
+    return {
+        "ok": not settings.REQUIRED_PARAMETERS or source is not None,
+        "source": source,
+    }
+
+
+readiness_checks = [
+    CachedCheck("database", check_database,
+                settings.HEALTH_CHECK_CACHE_SECONDS),
+    CachedCheck("cache", check_cache, settings.HEALTH_CHECK_CACHE_SECONDS),
+    CachedCheck("config", check_config, settings.HEALTH_CHECK_CACHE_SECONDS),
+]
+
+
+def readiness() -> Tuple[bool, Dict[str, Dict[str, Any]]]:
+    results = {check.name: check() for check in readiness_checks}
+    return all(result["ok"] for result in results.values()), results
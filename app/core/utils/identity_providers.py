@@ -0,0 +1,168 @@
+import hashlib
+import random
+import secrets
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from core.services.identity_provider_methods import IIdentityProvider
+from core.utils import cognito_util
+from core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CognitoIdentityProvider(IIdentityProvider):
+    """
+    Identity provider backed by AWS Cognito. This is the default backend.
+    """
+
+    def __init__(self, **options: Any) -> None:
+        self.options = options
+
+    def register_user(self, username: str, password: str,
+                      email: str) -> Dict[str, Any]:
+        return cognito_util.register_user(username, password, email)
+
+    def confirm_user_registration(self, username: str,
+                                  confirmation_code: str) -> Dict[str, Any]:
+        return cognito_util.confirm_user_registration(username,
+                                                      confirmation_code)
+
+    def authenticate(self, username: str, password: str) -> str:
+        return cognito_util.authenticate(username, password)
+
+    def initiate_password_reset(self, username: str) -> Dict[str, Any]:
+        return cognito_util.initiate_password_reset(username)
+
+    def complete_password_reset(self, username: str, new_password: str,
+                                confirmation_code: str) -> Dict[str, Any]:
+        return cognito_util.complete_password_reset(username, new_password,
+                                                    confirmation_code)
+
+    def delete_user(self, username: str) -> Dict[str, Any]:
+        return cognito_util.delete_user(username)
+
+
+class InMemoryIdentityProvider(IIdentityProvider):
+    """
+    Process-local identity provider intended for load testing. It mimics
+    the Cognito flows without any network calls and can inject artificial
+    latency and failures so that the rest of the stack can be measured in
+    isolation.
+
+    Supported options:
+        LATENCY_MS: mean latency added to every call.
+        LATENCY_JITTER_MS: uniform jitter added on top of LATENCY_MS.
+        ERROR_RATE: probability (0..1) that a call fails.
+        CONFIRMATION_CODE: code accepted for confirmations and resets.
+        AUTO_CONFIRM: mark users as confirmed on registration.
+        SEED: seed for the latency and error generator.
+    """
+
+    def __init__(self, **options: Any) -> None:
+        self.latency = float(options.get("LATENCY_MS", 0)) / 1000
+        self.jitter = float(options.get("LATENCY_JITTER_MS", 0)) / 1000
+        self.error_rate = float(options.get("ERROR_RATE", 0))
+        self.confirmation_code = str(
+            options.get("CONFIRMATION_CODE", "123456"))
+        self.auto_confirm = bool(options.get("AUTO_CONFIRM", False))
+        self._random = random.Random(options.get("SEED"))
+        self._users: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _hash_password(password: str) -> str:
+        return hashlib.sha256(password.encode("utf-8")).hexdigest()
+
+    def _simulate(self, operation: str) -> None:
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            raise Exception(
+                f"[InMemoryIdentityProvider] Injected failure in {operation}")
+
+    def _get_user(self, username: str) -> Dict[str, Any]:
+        user = self._users.get(username)
+        if user is None:
+            raise Exception(f"User {username} does not exist")
+        return user
+
+    def register_user(self, username: str, password: str,
+                      email: str) -> Dict[str, Any]:
+        self._simulate("register_user")
+        with self._lock:
+            if username in self._users:
+                raise Exception("Registration failed")
+            self._users[username] = {
+                "email": email,
+                "password": self._hash_password(password),
+                "confirmed": self.auto_confirm,
+            }
+        return {"message": "User registered successfully"}
+
+    def confirm_user_registration(self, username: str,
+                                  confirmation_code: str) -> Dict[str, Any]:
+        self._simulate("confirm_user_registration")
+        with self._lock:
+            user = self._get_user(username)
+            if confirmation_code != self.confirmation_code:
+                raise Exception("User confirmation failed")
+            user["confirmed"] = True
+        return {"message": "User confirmed successfully"}
+
+    def authenticate(self, username: str, password: str) -> str:
+        self._simulate("authenticate")
+        with self._lock:
+            user = self._users.get(username)
+            if (user is None or not user["confirmed"]
+                    or user["password"] != self._hash_password(password)):
+                raise Exception("Authentication failed")
+        return secrets.token_urlsafe(32)
+
+    def initiate_password_reset(self, username: str) -> Dict[str, Any]:
+        self._simulate("initiate_password_reset")
+        with self._lock:
+            self._get_user(username)
+        return {
+            "message":
+            ("Password reset initiated. Check your email for the code.")
+        }
+
+    def complete_password_reset(self, username: str, new_password: str,
+                                confirmation_code: str) -> Dict[str, Any]:
+        self._simulate("complete_password_reset")
+        with self._lock:
+            user = self._get_user(username)
+            if confirmation_code != self.confirmation_code:
+                raise Exception("Password reset failed")
+            user["password"] = self._hash_password(new_password)
+        return {"message": "Password reset successfully"}
+
+    def delete_user(self, username: str) -> Dict[str, Any]:
+        self._simulate("delete_user")
+        with self._lock:
+            self._get_user(username)
+            del self._users[username]
+        return {"message": "User deleted successfully"}
+
+
+@lru_cache(maxsize=None)
+def get_identity_provider(
+        backend: Optional[str] = None) -> IIdentityProvider:
+    """
+    Return the process-wide identity provider configured by
+    IDENTITY_PROVIDER_BACKEND and IDENTITY_PROVIDER_OPTIONS.
+    """
+    backend = backend or settings.IDENTITY_PROVIDER_BACKEND
+    provider_class = import_string(backend)
+    logger.info("[IdentityProvider] Using identity provider backend: %s",
+                backend)
+    return provider_class(**settings.IDENTITY_PROVIDER_OPTIONS)
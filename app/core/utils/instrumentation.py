@@ -0,0 +1,129 @@
+"""
+Per-request time and call counts for each external dependency.
+
+Timings are only collected between ``start_request`` and ``finish_request``
+(see core.middleware.RequestTimingMiddleware). Outside of that window every
+hook returns after a single context variable lookup, so instrumented code
+pays well under a microsecond per call when timing is disabled.
+
+``timed`` blocks given an operation name are also traced as client spans
+(see core.utils.tracing).
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from opentelemetry.trace import SpanKind
+
+from core.utils import tracing
+
+# dependency -> [total seconds, calls] for the current request.
+_timings: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar(
+    "timings", default=None)
+
+# botocore service names reported under a shorter dependency name.
+AWS_DEPENDENCIES = {"cognito-idp": "cognito"}
+
+
+def start_request():
+    return _timings.set({})
+
+
+def finish_request(token) -> Dict[str, List[float]]:
+    timings = _timings.get() or {}
+    _timings.reset(token)
+    return timings
+
+
+def record(dependency: str, seconds: float) -> None:
+    timings = _timings.get()
+    if timings is None:
+        return
+    entry = timings.get(dependency)
+    if entry is None:
+        timings[dependency] = [seconds, 1]
+    else:
+        entry[0] += seconds
+        entry[1] += 1
+
+
+def active() -> bool:
+    return _timings.get() is not None
+
+
+class timed:
+    """
+    Context manager recording the time spent in its block against
+    ``dependency`` and, within a sampled trace, running it in a span named
+    after ``operation``::
+
+        with timed("redis", "GET"):
+            client.get(key)
+    """
+
+    __slots__ = ("dependency", "operation", "started", "span")
+
+    def __init__(self, dependency: str, operation: str = "") -> None:
+        self.dependency = dependency
+        self.operation = operation
+        self.span = None
+
+    def __enter__(self) -> None:
+        if self.operation and tracing.recording():
+            self.span = tracing.span(f"{self.dependency} {self.operation}",
+                                     SpanKind.CLIENT, {
+                                         "db.system": self.dependency,
+                                         "db.operation": self.operation,
+                                     })
+            self.span.__enter__()
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        record(self.dependency, time.perf_counter() - self.started)
+        if self.span is not None:
+            self.span.__exit__(*exc_info)
+
+
+def database_wrapper(execute, sql, params, many, context):
+    """``connection.execute_wrapper`` hook timing every query."""
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record("db", time.perf_counter() - started)
+
+
+def _after_aws_call(context: Dict[str, Any], **kwargs) -> None:
+    started = context.pop("instrumentation_started", None)
+    if started is not None:
+        record(context["instrumentation_service"],
+               time.perf_counter() - started)
+
+
+def instrument_boto3_client(client) -> None:
+    """Time every API call made by a boto3 client."""
+    service = client.meta.service_model.service_name
+    dependency = AWS_DEPENDENCIES.get(service, service)
+
+    def before_call(context, **kwargs):
+        if active():
+            context["instrumentation_service"] = dependency
+            context["instrumentation_started"] = time.perf_counter()
+
+    # Registered first at full depth so the timer starts even when another
+    # before-call handler (e.g. botocore's Stubber) supplies the response.
+    events = client.meta.events
+    events.register_first("before-call.*.*", before_call)
+    events.register("after-call.*.*", _after_aws_call)
+    events.register("after-call-error.*.*", _after_aws_call)
+
+
+def server_timing(timings: Dict[str, List[float]], total: float) -> str:
+    """Format timings as a Server-Timing header value (durations in ms)."""
+    metrics = [
+        f'{name};dur={seconds * 1000:.2f};desc="{int(calls)} calls"'
+        for name, (seconds, calls) in sorted(timings.items())
+    ]
+    metrics.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(metrics)
@@ -1,28 +1,198 @@
 import base64
 import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
 
-import boto3
 from botocore.exceptions import ClientError
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
+from core.utils.aws_clients import LazyClient
 from core.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 region = os.environ.get("AWS_REGION", "us-east-1")
-kms_client = boto3.client("kms", region_name=region)
+kms_client = LazyClient("kms", region_name=region)
+
+# Envelope encryption settings. Passwords are encrypted locally with AES-GCM
+# under a data key generated by KMS; the KMS-wrapped data key is stored
+# alongside the ciphertext. Ciphertexts without ENVELOPE_PREFIX are legacy
+# values encrypted directly with KMS Encrypt and are still decrypted.
+ENVELOPE_PREFIX = "env1:"
+ENVELOPE_ENCRYPTION_ENABLED = os.environ.get("KMS_ENVELOPE_ENCRYPTION",
+                                             "true").lower() == "true"
+DATA_KEY_MAX_USES = int(os.environ.get("KMS_DATA_KEY_MAX_USES", 1000))
+DATA_KEY_MAX_AGE_SECONDS = float(
+    os.environ.get("KMS_DATA_KEY_MAX_AGE_SECONDS", 300))
+DECRYPTED_KEY_CACHE_SIZE = int(
+    os.environ.get("KMS_DECRYPTED_KEY_CACHE_SIZE", 1000))
+
+NONCE_SIZE = 12
+
+
+class DataKeyCache:
+    """
+    Caches one data key per KMS key id for encryption. A key is replaced
+    once it has been used ``max_uses`` times or is older than ``max_age``
+    seconds, which bounds how much data a single key protects.
+    """
+
+    def __init__(self, max_uses: int, max_age: float) -> None:
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self._keys = {}
+        self._lock = threading.Lock()
+
+    def get(self, kms_key_id: str) -> Tuple[bytes, bytes]:
+        """
+        Return a ``(plaintext_key, wrapped_key)`` pair for the KMS key id,
+        generating a new data key when needed.
+        """
+        with self._lock:
+            entry = self._keys.get(kms_key_id)
+            now = time.monotonic()
+            if (entry is None or entry["uses"] >= self.max_uses
+                    or now - entry["created"] >= self.max_age):
+                response = kms_client.generate_data_key(KeyId=kms_key_id,
+                                                        KeySpec="AES_256")
+                plaintext_key = response.get("Plaintext")
+                wrapped_key = response.get("CiphertextBlob")
+                if not plaintext_key or not wrapped_key:
+                    logger.error(
+                        "Failed to generate data key: incomplete response")
+                    raise Exception("Failed to generate data key")
+                entry = {
+                    "plaintext": plaintext_key,
+                    "wrapped": wrapped_key,
+                    "created": now,
+                    "uses": 0,
+                }
+                self._keys[kms_key_id] = entry
+            entry["uses"] += 1
+            return entry["plaintext"], entry["wrapped"]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys.clear()
+
+
+class DecryptedKeyCache:
+    """
+    Bounded LRU cache of plaintext data keys keyed by their wrapped form, so
+    that decrypting many passwords protected by the same data key costs a
+    single KMS Decrypt call.
+    """
+
+    def __init__(self, max_size: int, max_age: float) -> None:
+        self.max_size = max_size
+        self.max_age = max_age
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, wrapped_key: bytes) -> Optional[bytes]:
+        with self._lock:
+            entry = self._keys.get(wrapped_key)
+            if entry is None:
+                return None
+            plaintext_key, created = entry
+            if time.monotonic() - created >= self.max_age:
+                del self._keys[wrapped_key]
+                return None
+            self._keys.move_to_end(wrapped_key)
+            return plaintext_key
+
+    def set(self, wrapped_key: bytes, plaintext_key: bytes) -> None:
+        with self._lock:
+            self._keys[wrapped_key] = (plaintext_key, time.monotonic())
+            self._keys.move_to_end(wrapped_key)
+            while len(self._keys) > self.max_size:
+                self._keys.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys.clear()
+
+
+data_key_cache = DataKeyCache(DATA_KEY_MAX_USES, DATA_KEY_MAX_AGE_SECONDS)
+decrypted_key_cache = DecryptedKeyCache(DECRYPTED_KEY_CACHE_SIZE,
+                                        DATA_KEY_MAX_AGE_SECONDS)
+
+
+def clear_key_caches() -> None:
+    """
+    Drop every cached data key, e.g. after the KMS key id has changed.
+    """
+    data_key_cache.clear()
+    decrypted_key_cache.clear()
+
+
+def is_envelope_ciphertext(encrypted_password: str) -> bool:
+    return encrypted_password.startswith(ENVELOPE_PREFIX)
+
+
+def pack_envelope(wrapped_key: bytes, nonce: bytes, ciphertext: bytes) -> str:
+    payload = (struct.pack(">H", len(wrapped_key)) + wrapped_key + nonce +
+               ciphertext)
+    return ENVELOPE_PREFIX + base64.b64encode(payload).decode("utf-8")
+
+
+def unpack_envelope(encrypted_password: str) -> Tuple[bytes, bytes, bytes]:
+    """
+    Split an envelope ciphertext into ``(wrapped_key, nonce, ciphertext)``.
+    """
+    payload = base64.b64decode(encrypted_password[len(ENVELOPE_PREFIX):])
+    (key_length, ) = struct.unpack(">H", payload[:2])
+    wrapped_key = payload[2:2 + key_length]
+    nonce = payload[2 + key_length:2 + key_length + NONCE_SIZE]
+    ciphertext = payload[2 + key_length + NONCE_SIZE:]
+    return wrapped_key, nonce, ciphertext
+
+
+def _encrypt_password_envelope(password: str, kms_key_id: str) -> str:
+    plaintext_key, wrapped_key = data_key_cache.get(kms_key_id)
+    nonce = os.urandom(NONCE_SIZE)
+    ciphertext = AESGCM(plaintext_key).encrypt(
+        nonce, password.encode("utf-8"), ENVELOPE_PREFIX.encode("utf-8"))
+    return pack_envelope(wrapped_key, nonce, ciphertext)
+
+
+def _decrypt_password_envelope(encrypted_password: str,
+                               kms_key_id: str) -> str:
+    wrapped_key, nonce, ciphertext = unpack_envelope(encrypted_password)
+    plaintext_key = decrypted_key_cache.get(wrapped_key)
+    if plaintext_key is None:
+        response = kms_client.decrypt(KeyId=kms_key_id,
+                                      CiphertextBlob=wrapped_key)
+        plaintext_key = response.get("Plaintext")
+        if not plaintext_key:
+            logger.error("Failed to decrypt data key: No Plaintext returned")
+            raise Exception("Failed to decrypt password")
+        decrypted_key_cache.set(wrapped_key, plaintext_key)
+    plaintext = AESGCM(plaintext_key).decrypt(nonce, ciphertext,
+                                              ENVELOPE_PREFIX.encode("utf-8"))
+    return plaintext.decode("utf-8")
 
 
 def encrypt_password(password: str, kms_key_id: str) -> str:
     """
-    Encrypt the given password using AWS KMS and return it as a base64
-    encoded string.
+    Encrypt the given password and return it as a string. By default the
+    password is envelope encrypted with a cached KMS data key; setting
+    KMS_ENVELOPE_ENCRYPTION=false falls back to a direct KMS Encrypt call.
 
     :param password: The plaintext password.
     :param kms_key_id: The AWS KMS Key ID to use for encryption.
-    :return: The encrypted password as a base64 encoded string.
+    :return: The encrypted password as a prefixed envelope or a base64
+             encoded KMS ciphertext.
     :raises Exception: If encryption fails.
     """
     try:
+        if ENVELOPE_ENCRYPTION_ENABLED:
+            return _encrypt_password_envelope(password, kms_key_id)
+
         response = kms_client.encrypt(KeyId=kms_key_id,
                                       Plaintext=password.encode("utf-8"))
 
@@ -37,26 +207,26 @@ def encrypt_password(password: str, kms_key_id: str) -> str:
         return encrypted_password
 
     except ClientError as error:
-        logger.error(f"Error encrypting password: {error}", exc_info=True)
+        logger.error("Error encrypting password: %s", error, exc_info=True)
         raise Exception("Failed to encrypt password") from error
 
 
 def decrypt_password(encrypted_password: str, kms_key_id: str) -> str:
     """
-    Decrypt the given encrypted password (base64 encoded) using AWS KMS
-    and return the plaintext.
+    Decrypt the given encrypted password and return the plaintext. Both
+    envelope ciphertexts and legacy direct KMS ciphertexts are supported.
 
-    :param encrypted_password: The encrypted password as a base64
-                               encoded string.
+    :param encrypted_password: The encrypted password as returned by
+                               encrypt_password.
     :param kms_key_id: The AWS KMS Key ID used for decryption.
     :return: The decrypted plaintext password.
     :raises Exception: If decryption fails.
     """
-    # Decode the base64 encoded encrypted password to get the
-    # ciphertext blob.
-    # ciphertext blob.
-
     try:
+        if is_envelope_ciphertext(encrypted_password):
+            return _decrypt_password_envelope(encrypted_password, kms_key_id)
+
+        # Legacy value: the base64 decoded string is a KMS ciphertext blob.
         ciphertext_blob = base64.b64decode(encrypted_password)
 
         response = kms_client.decrypt(KeyId=kms_key_id,
@@ -69,6 +239,52 @@ def decrypt_password(encrypted_password: str, kms_key_id: str) -> str:
 
         return plaintext.decode("utf-8")
 
-    except ClientError as error:
-        logger.error(f"Error decrypting password: {error}", exc_info=True)
+    except (ClientError, InvalidTag) as error:
+        logger.error("Error decrypting password: %s", error, exc_info=True)
         raise Exception("Failed to decrypt password") from error
+
+
+def reencrypt_blob(ciphertext_blob: bytes, destination_key_id: str) -> bytes:
+    """
+    Re-encrypt a KMS ciphertext blob under the destination key with KMS
+    ReEncrypt. The plaintext never leaves KMS.
+
+    :raises Exception: If re-encryption fails.
+    """
+    try:
+        response = kms_client.re_encrypt(CiphertextBlob=ciphertext_blob,
+                                         DestinationKeyId=destination_key_id)
+        new_blob = response.get("CiphertextBlob")
+        if not new_blob:
+            logger.error("Failed to re-encrypt: No CiphertextBlob returned")
+            raise Exception("Failed to re-encrypt password")
+        return new_blob
+    except ClientError as error:
+        logger.error("Error re-encrypting password: %s", error, exc_info=True)
+        raise Exception("Failed to re-encrypt password") from error
+
+
+def rewrap_envelope(encrypted_password: str, wrapped_key: bytes) -> str:
+    """
+    Return the envelope ciphertext with its wrapped data key replaced. The
+    AES-GCM payload is unchanged because the data key itself is unchanged.
+    """
+    _, nonce, ciphertext = unpack_envelope(encrypted_password)
+    return pack_envelope(wrapped_key, nonce, ciphertext)
+
+
+def reencrypt_password(encrypted_password: str,
+                       destination_key_id: str) -> str:
+    """
+    Re-encrypt a stored password under the destination KMS key. Envelope
+    ciphertexts only have their wrapped data key re-encrypted; legacy
+    ciphertexts are re-encrypted as a whole.
+    """
+    if is_envelope_ciphertext(encrypted_password):
+        wrapped_key, _, _ = unpack_envelope(encrypted_password)
+        return rewrap_envelope(
+            encrypted_password,
+            reencrypt_blob(wrapped_key, destination_key_id))
+    new_blob = reencrypt_blob(base64.b64decode(encrypted_password),
+                              destination_key_id)
+    return base64.b64encode(new_blob).decode("utf-8")
@@ -1,27 +1,152 @@
+import atexit
 import logging
+import os
+import queue
+import random
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict
 
 from pythonjsonlogger import jsonlogger
 
+# Records are handed to a background thread that does the JSON encoding and
+# the write, so request threads only pay for an enqueue. The queue is
+# bounded; when it is full new records are dropped and counted instead of
+# blocking the request. Set LOG_ASYNC=false to log synchronously.
+LOG_ASYNC = os.environ.get("LOG_ASYNC", "true").lower() == "true"
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", 10000))
+
+# Fraction of INFO and DEBUG records kept per logger, for example
+# "core.services.user_service=0.1,core.utils.cognito_util=0.25". Warnings
+# and errors are never sampled.
+LOG_SAMPLE_RATES = os.environ.get("LOG_SAMPLE_RATES", "")
+
+LOG_FORMAT = "%(asctime)s %(name)s %(levelname)s %(message)s"
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    rates = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, rate = item.partition("=")
+        rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a random ``rate`` fraction of the records below WARNING."""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or random.random() < self.rate:
+            return True
+        log_pipeline.count("sampled_out")
+        return False
+
+
+class LogPipeline:
+    """
+    Process-wide bounded queue drained by a QueueListener thread writing to
+    stderr. The listener is (re)started lazily, including after a fork.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.stream_handler = logging.StreamHandler()
+        self.stream_handler.setFormatter(
+            jsonlogger.JsonFormatter(fmt=LOG_FORMAT))
+        self.counters = {"dropped": 0, "sampled_out": 0}
+        self._lock = threading.Lock()
+        self._pid = None
+        self.queue = None
+        self.listener = None
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # After a fork the parent's listener thread is gone; records
+            # still queued belong to the parent and are discarded.
+            # Unbounded so that stop() can always enqueue the listener's
+            # sentinel; enqueue() enforces maxsize.
+            self.queue = queue.Queue()
+            self.listener = QueueListener(self.queue,
+                                          self.stream_handler,
+                                          respect_handler_level=True)
+            self.listener.start()
+            self._pid = os.getpid()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self._pid != os.getpid():
+            self._start()
+        if self.queue.qsize() >= self.maxsize:
+            self.count("dropped")
+            return
+        self.queue.put_nowait(record)
+
+    def count(self, counter: str) -> None:
+        # Unlocked: an occasional lost increment is acceptable for a metric
+        # and keeps the logging hot path cheap.
+        self.counters[counter] += 1
+
+    def stats(self) -> Dict[str, int]:
+        stats = dict(self.counters)
+        stats["queued"] = self.queue.qsize() if self.queue else 0
+        return stats
+
+    def stop(self) -> None:
+        """Flush the queued records. Registered to run at exit."""
+        with self._lock:
+            if self.listener is not None and self._pid == os.getpid():
+                self.listener.stop()
+            self._pid = None
+
+
+class PipelineHandler(QueueHandler):
+    """QueueHandler feeding the shared, non-blocking LogPipeline."""
+
+    def __init__(self, pipeline: LogPipeline) -> None:
+        super().__init__(None)
+        self.pipeline = pipeline
+        self.formatter = pipeline.stream_handler.formatter
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merging the %-style args and the JSON encoding are left to the
+        # listener thread. Only a traceback is rendered here, while its
+        # frames are still current.
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.pipeline.enqueue(record)
+
+
+log_pipeline = LogPipeline(LOG_QUEUE_SIZE)
+atexit.register(log_pipeline.stop)
+
+_sample_rates = parse_sample_rates(LOG_SAMPLE_RATES)
+
 
 def get_logger(name=__name__):
     """
     Returns a logger configured with JSON formatting.
-    This logger outputs to the console and can be extended
-    to include additional handlers (like file handlers).
+    Records are written by a background thread (see LogPipeline) unless
+    LOG_ASYNC is false, and INFO records are sampled per LOG_SAMPLE_RATES.
     """
     logger = logging.getLogger(name)
     if not logger.handlers:  # Prevent adding handlers multiple times
-        # Console handler
-        console_handler = logging.StreamHandler()
-        formatter = jsonlogger.JsonFormatter(
-            fmt="%(asctime)s %(name)s %(levelname)s %(message)s")
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
-
-        # Optionally, add more handlers here (for example, a file handler)
-        # file_handler = logging.FileHandler('logs/combined.log')
-        # file_handler.setFormatter(formatter)
-        # logger.addHandler(file_handler)
+        if LOG_ASYNC:
+            handler = PipelineHandler(log_pipeline)
+        else:
+            handler = logging.StreamHandler()
+            handler.setFormatter(jsonlogger.JsonFormatter(fmt=LOG_FORMAT))
+        logger.addHandler(handler)
+        if name in _sample_rates:
+            logger.addFilter(SamplingFilter(_sample_rates[name]))
 
         logger.setLevel(logging.INFO)
     return logger
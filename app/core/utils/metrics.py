@@ -0,0 +1,228 @@
+"""
+Prometheus metrics.
+
+Under gunicorn every worker writes its samples to PROMETHEUS_MULTIPROC_DIR
+(set up by gunicorn.conf.py) and /metrics aggregates the files of all
+workers. Without that variable metrics are kept in process.
+
+Labels only take values from bounded sets (view names, repository method
+names, cache key prefixes, AWS operations) and never raw ids or usernames.
+"""
+
+import functools
+import os
+import re
+import time
+from typing import Any, Callable, Dict
+
+from prometheus_client import (REGISTRY, CollectorRegistry, Counter, Gauge,
+                               Histogram, generate_latest, multiprocess)
+
+from core.db.pool import pool_stats
+from core.utils import config_loader, tracing
+from core.utils.logger import log_pipeline
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by view.",
+    ["view", "method", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REPOSITORY_DURATION = Histogram(
+    "repository_method_duration_seconds",
+    "Duration of repository methods, including cache lookups.",
+    ["repository", "method"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+CACHE_OPERATIONS = Counter(
+    "cache_operations_total",
+    "Cache operations by key prefix and result.",
+    ["operation", "prefix", "result"],
+)
+COALESCED_CALLS = Counter(
+    "coalesced_calls_total",
+    "Reads that ran their own call (leader) or shared a concurrent "
+    "identical one (follower). The coalescing ratio is the follower share.",
+    ["operation", "role"],
+)
+CACHE_VALUE_BYTES = Histogram(
+    "cache_value_bytes",
+    "Size of sampled cache values read or written, by key prefix.",
+    ["operation", "prefix"],
+    buckets=(64, 256, 1024, 4096, 16384, 65536, 262144, 1048576),
+)
+CACHE_TTL_AT_READ = Histogram(
+    "cache_ttl_at_read_seconds",
+    "Remaining time to live of sampled cache hits, by key prefix.",
+    ["prefix"],
+    buckets=(1, 10, 60, 300, 900, 1800, 3600, 7200, 21600, 86400),
+)
+CONFIG_LOAD = Gauge(
+    "config_load_seconds",
+    "Time taken to resolve the startup parameters, by source.",
+    ["source"],
+    multiprocess_mode="max",
+)
+STARTUP = Gauge(
+    "app_startup_seconds",
+    "Time from loading the settings to the app being ready.",
+    multiprocess_mode="max",
+)
+AWS_CALL_LATENCY = Histogram(
+    "aws_call_duration_seconds",
+    "Latency of AWS API calls.",
+    ["service", "operation", "outcome"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_POOL = Gauge(
+    "db_pool_connections",
+    "Database pool connections by state, summed over live workers.",
+    ["alias", "state"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAIT = Gauge(
+    "db_pool_wait_seconds_average",
+    "Average wait for a pooled connection per worker.",
+    ["alias"],
+    multiprocess_mode="liveall",
+)
+DB_POOL_TIMEOUTS = Gauge(
+    "db_pool_timeouts",
+    "Pool acquisitions that timed out, summed over live workers.",
+    ["alias"],
+    multiprocess_mode="livesum",
+)
+LOG_RECORDS = Gauge(
+    "log_records",
+    "Log records dropped on a full queue, sampled out, or still queued.",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+
+# Cache keys look like "<prefix>:<id>"; anything else is reported as other.
+_PREFIX_PATTERN = re.compile(r"^[a-z][a-z_-]{0,31}$")
+
+
+def cache_key_prefix(key: str) -> str:
+    prefix, separator, _ = key.partition(":")
+    if separator and _PREFIX_PATTERN.match(prefix):
+        return prefix
+    return "other"
+
+
+def record_cache(operation: str, key: str, result: str) -> None:
+    CACHE_OPERATIONS.labels(operation, cache_key_prefix(key), result).inc()
+
+
+def record_coalescing(operation: str, role: str) -> None:
+    COALESCED_CALLS.labels(operation, role).inc()
+
+
+def observe_cache_value(operation: str, key: str, size: int) -> None:
+    CACHE_VALUE_BYTES.labels(operation, cache_key_prefix(key)).observe(size)
+
+
+def observe_cache_ttl(key: str, ttl: int) -> None:
+    CACHE_TTL_AT_READ.labels(cache_key_prefix(key)).observe(ttl)
+
+
+def observe_request(view: str, method: str, status: int,
+                    seconds: float) -> None:
+    REQUEST_LATENCY.labels(view, method, f"{status // 100}xx").observe(seconds)
+
+
+def observe_repository(method: Callable) -> Callable:
+    """
+    Decorator timing a repository method, labelled by class and name, and
+    tracing it as a span named ``Class.method``.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            with tracing.span(f"{type(self).__name__}.{method.__name__}"):
+                return method(self, *args, **kwargs)
+        finally:
+            REPOSITORY_DURATION.labels(
+                type(self).__name__,
+                method.__name__).observe(time.perf_counter() - started)
+
+    return wrapper
+
+
+def observe_async_repository(method: Callable) -> Callable:
+    """``observe_repository`` for coroutine methods."""
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            with tracing.span(f"{type(self).__name__}.{method.__name__}"):
+                return await method(self, *args, **kwargs)
+        finally:
+            REPOSITORY_DURATION.labels(
+                type(self).__name__,
+                method.__name__).observe(time.perf_counter() - started)
+
+    return wrapper
+
+
+def record_process_stats() -> None:
+    """Copy this worker's pool and log pipeline counters into gauges."""
+    for state, value in log_pipeline.stats().items():
+        LOG_RECORDS.labels(state).set(value)
+    for alias, stats in pool_stats().items():
+        DB_POOL.labels(alias, "in_use").set(stats["in_use"])
+        DB_POOL.labels(alias, "idle").set(stats["idle"])
+        DB_POOL.labels(alias, "max").set(stats["max_size"])
+        DB_POOL_WAIT.labels(alias).set(stats["wait_seconds_avg"])
+        DB_POOL_TIMEOUTS.labels(alias).set(stats["timeouts"])
+
+
+def record_startup() -> None:
+    """Copy the config_loader startup measurements into gauges."""
+    startup = config_loader.startup_metrics
+    if "config_load_seconds" in startup:
+        CONFIG_LOAD.labels(startup["config_source"]).set(
+            startup["config_load_seconds"])
+    if "startup_seconds" in startup:
+        STARTUP.set(startup["startup_seconds"])
+
+
+def _after_aws_call(context: Dict[str, Any],
+                    http_response=None,
+                    **kwargs) -> None:
+    started = context.pop("metrics_started", None)
+    if started is None:
+        return
+    service, operation = context["metrics_operation"]
+    failed = http_response is None or http_response.status_code >= 300
+    AWS_CALL_LATENCY.labels(service, operation,
+                            "error" if failed else "ok").observe(
+                                time.perf_counter() - started)
+
+
+def instrument_boto3_client(client) -> None:
+    """Observe the latency of every API call made by a boto3 client."""
+    service = client.meta.service_model.service_name
+
+    def before_call(context, model, **kwargs):
+        # Kept in the context because after-call-error carries no model.
+        context["metrics_operation"] = (service, model.name)
+        context["metrics_started"] = time.perf_counter()
+
+    events = client.meta.events
+    events.register_first("before-call.*.*", before_call)
+    events.register("after-call.*.*", _after_aws_call)
+    events.register("after-call-error.*.*", _after_aws_call)
+
+
+def render() -> bytes:
+    """The current metrics in the Prometheus text format."""
+    record_process_stats()
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
@@ -0,0 +1,124 @@
+import random
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+
+from core.utils import ssm_util
+from core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+Subscriber = Callable[[str, str], None]
+
+
+class ParameterWatcher:
+    """
+    Polls SSM in the background for new versions of the parameters held in
+    the process cache and swaps them in without a restart.
+
+    Every check fetches all watched parameters with batched GetParameters
+    calls. Changed values replace the cached ones in a single update, so
+    readers never see a mix of old and new values from one rotation, and
+    then each subscriber of a changed name is called with its new value.
+
+    The first check runs after a random fraction of the interval and later
+    ones after the interval +/- ``jitter``, so the workers of a fleet spread
+    their calls instead of polling SSM in lockstep.
+    """
+
+    def __init__(self, interval: float, jitter: float = 0.2) -> None:
+        self.interval = interval
+        self.jitter = jitter
+        self._versions: Dict[str, int] = {}
+        self._subscribers: Dict[str, List[Subscriber]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, name: str, callback: Subscriber) -> None:
+        """Call ``callback(name, new_value)`` whenever ``name`` changes."""
+        with self._lock:
+            self._subscribers[name].append(callback)
+
+    def check(self) -> List[str]:
+        """Fetch the watched parameters once and apply any changes."""
+        current = ssm_util.cached_parameters()
+        if not current:
+            return []
+        records = ssm_util.fetch_parameter_records(current)
+
+        changed: Dict[str, str] = {}
+        with self._lock:
+            for name, record in records.items():
+                version = record.get("Version")
+                known = self._versions.get(name)
+                if ((known is not None and version != known)
+                        or record["Value"] != current.get(name)):
+                    changed[name] = record["Value"]
+                self._versions[name] = version
+        if not changed:
+            return []
+
+        ssm_util.cache_parameters(changed)
+        logger.warning("[ParameterWatcher] Parameters changed: %s",
+                       sorted(changed))
+        for name, value in changed.items():
+            with self._lock:
+                subscribers = list(self._subscribers.get(name, []))
+            for callback in subscribers:
+                try:
+                    callback(name, value)
+                except Exception:
+                    logger.error(
+                        "[ParameterWatcher] Subscriber %s failed for %s",
+                        getattr(callback, "__qualname__", callback),
+                        name,
+                        exc_info=True)
+        return sorted(changed)
+
+    def _delay(self, first: bool) -> float:
+        if first:
+            return random.uniform(0, self.interval)
+        return self.interval * random.uniform(1 - self.jitter,
+                                              1 + self.jitter)
+
+    def _run(self) -> None:
+        first = True
+        while not self._stopped.wait(self._delay(first)):
+            first = False
+            try:
+                self.check()
+            except Exception:
+                logger.warning("[ParameterWatcher] Check failed",
+                               exc_info=True)
+
+    def start(self) -> None:
+        """Start polling in a daemon thread unless disabled or running."""
+        if self.interval <= 0:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run,
+                                            name="parameter-watcher",
+                                            daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def reset(self) -> None:
+        """
+        Forget the polling thread. Called in forked worker processes, which
+        do not inherit the parent's threads.
+        """
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+
+# Process-wide watcher, started by CoreConfig.ready.
+parameter_watcher = ParameterWatcher(settings.PARAMETER_WATCH_SECONDS,
+                                     settings.PARAMETER_WATCH_JITTER)
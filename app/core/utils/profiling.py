@@ -0,0 +1,331 @@
+import contextlib
+import hashlib
+import hmac
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+from core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+REQUEST_ID_HEADER = "X-Request-Id"
+MAX_STACK_DEPTH = 128
+
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+# (function, file, first line) of one frame; stacks are outermost first.
+Frame = Tuple[str, str, int]
+
+
+def _signature(expires: int) -> str:
+    return hmac.new(settings.PROFILING_SECRET.encode("utf-8"),
+                    str(expires).encode("ascii"), hashlib.sha256).hexdigest()
+
+
+def sign(ttl: float) -> str:
+    """A profiling header value valid for ``ttl`` seconds."""
+    expires = int(time.time() + ttl)
+    return f"{expires}.{_signature(expires)}"
+
+
+def verify(token: Optional[str]) -> bool:
+    """
+    Whether ``token`` was made by ``sign`` with this deployment's secret and
+    has not expired. Always false without a PROFILING_SECRET.
+    """
+    if not token or not settings.PROFILING_SECRET:
+        return False
+    expires, _, signature = token.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _signature(int(expires)))
+
+
+def sampled(path: str) -> bool:
+    """Whether the sampling rule selects a request for ``path``."""
+    rate = settings.PROFILING_SAMPLE_RATE
+    if rate <= 0:
+        return False
+    prefixes = settings.PROFILING_SAMPLE_PATHS
+    if prefixes and not path.startswith(tuple(prefixes)):
+        return False
+    return random.random() < rate
+
+
+def _label(frame: Frame) -> str:
+    name, filename, line = frame
+    if filename.startswith(_APP_ROOT):
+        filename = os.path.relpath(filename, _APP_ROOT)
+    return f"{name} ({filename}:{line})"
+
+
+class Profile:
+    """The stack samples of one request."""
+
+    def __init__(self, profile_id: str, method: str, path: str,
+                 interval: float) -> None:
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.interval = interval
+        self.started_at = time.time()
+        self.duration = 0.0
+        self.status: Optional[int] = None
+        self.stacks: "Counter[Tuple[Frame, ...]]" = Counter()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 2),
+            "samples": sum(self.stacks.values()),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "interval": self.interval,
+            "started_at": self.started_at,
+            "duration": self.duration,
+            "status": self.status,
+            "stacks": [[stack, count] for stack, count in self.stacks.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Profile":
+        profile = cls(data["id"], data["method"], data["path"],
+                      data["interval"])
+        profile.started_at = data["started_at"]
+        profile.duration = data["duration"]
+        profile.status = data["status"]
+        for stack, count in data["stacks"]:
+            profile.stacks[tuple(tuple(frame) for frame in stack)] = count
+        return profile
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed stack format, one stack per line."""
+        return "".join(f"{';'.join(_label(f) for f in stack)} {count}\n"
+                       for stack, count in self.stacks.most_common())
+
+    def speedscope(self) -> Dict[str, Any]:
+        """A speedscope file (https://www.speedscope.app) holding one
+        sampled profile, weighted in milliseconds."""
+        frames: List[Dict[str, Any]] = []
+        indexes: Dict[Frame, int] = {}
+        samples, weights = [], []
+        for stack, count in self.stacks.items():
+            sample = []
+            for frame in stack:
+                if frame not in indexes:
+                    indexes[frame] = len(frames)
+                    frames.append({
+                        "name": frame[0],
+                        "file": frame[1],
+                        "line": frame[2]
+                    })
+                sample.append(indexes[frame])
+            samples.append(sample)
+            weights.append(round(count * self.interval * 1000, 3))
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{self.method} {self.path}",
+            "exporter": "user-service",
+            "activeProfileIndex": 0,
+            "shared": {
+                "frames": frames
+            },
+            "profiles": [{
+                "type": "sampled",
+                "name": f"{self.method} {self.path} ({self.id})",
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+
+class StackSampler:
+    """
+    Samples the stack of one thread every ``interval`` seconds from a
+    background thread. The sampler only runs when the thread releases the
+    GIL, at the latest every ``sys.getswitchinterval()`` (5ms by default),
+    so shorter intervals do not give more samples from CPU-bound code.
+    """
+
+    def __init__(self, profile: Profile, thread_id: int) -> None:
+        self.profile = profile
+        self.thread_id = thread_id
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run,
+                                        name="request-profiler",
+                                        daemon=True)
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        stack: List[Frame] = []
+        while frame is not None and len(stack) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        if stack:
+            stack.reverse()
+            self.profile.stacks[tuple(stack)] += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.profile.interval):
+            self._sample()
+
+    def __enter__(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+class ProfileStore:
+    """
+    The last ``size`` profiles of every worker process, one JSON file each
+    in ``directory``, so that whichever worker serves /admin/profiles finds
+    them. Failing to write a profile is logged and never fails the request.
+    """
+
+    def __init__(self, directory: str, size: int) -> None:
+        self.directory = directory
+        self.size = size
+
+    def _path(self, profile_id: str) -> str:
+        # Ids come from the X-Request-Id header, so never use them as names.
+        digest = hashlib.sha256(profile_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest[:32]}.json")
+
+    def _paths(self) -> List[str]:
+        """The stored profile files, newest first."""
+        try:
+            entries = [
+                entry for entry in os.scandir(self.directory)
+                if entry.name.endswith(".json")
+            ]
+        except FileNotFoundError:
+            return []
+        mtimes = {}
+        for entry in entries:
+            with contextlib.suppress(FileNotFoundError):
+                mtimes[entry.path] = entry.stat().st_mtime_ns
+        return sorted(mtimes, key=mtimes.get, reverse=True)
+
+    def _load(self, path: str) -> Optional[Profile]:
+        try:
+            with open(path) as f:
+                return Profile.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("[ProfileStore] Unreadable profile %s: %s", path,
+                           e)
+            return None
+
+    def add(self, profile: Profile) -> None:
+        path = self._path(profile.id)
+        # Written aside and renamed so readers never see a partial file.
+        partial = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(partial, "w") as f:
+                json.dump(profile.to_dict(), f)
+            os.replace(partial, path)
+            for stale in self._paths()[self.size:]:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(stale)
+        except OSError as e:
+            logger.warning("[ProfileStore] Could not store profile %s: %s",
+                           profile.id, e)
+            with contextlib.suppress(OSError):
+                os.remove(partial)
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        profile = self._load(self._path(profile_id))
+        if profile is None or profile.id != profile_id:
+            return None
+        return profile
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        """The stored profiles, newest first."""
+        profiles = (self._load(path) for path in self._paths())
+        return [profile.summary() for profile in profiles if profile]
+
+    def clear(self) -> None:
+        for path in self._paths():
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
+
+@contextlib.contextmanager
+def _profiling(request) -> Iterator[Profile]:
+    profile_id = (request.headers.get(REQUEST_ID_HEADER)
+                  or uuid.uuid4().hex)[:64]
+    profile = Profile(profile_id, request.method, request.path,
+                      settings.PROFILING_INTERVAL_MS / 1000)
+    started = time.perf_counter()
+    try:
+        with StackSampler(profile, threading.get_ident()):
+            yield profile
+    finally:
+        profile.duration = time.perf_counter() - started
+        profile_store.add(profile)
+
+
+def _profiled_response(profile: Profile, request, response):
+    response[PROFILE_ID_HEADER] = profile.id
+    logger.info("[Profiling] %s %s profiled as %s (%d samples)",
+                request.method, request.path, profile.id,
+                sum(profile.stacks.values()))
+    return response
+
+
+def profile_request(request, get_response):
+    """
+    Serve ``request`` under a StackSampler and store its profile, keyed by
+    the caller's X-Request-Id or a new id, which is returned in the
+    X-Profile-Id header.
+    """
+    with _profiling(request) as profile:
+        response = get_response(request)
+        profile.status = response.status_code
+    return _profiled_response(profile, request, response)
+
+
+async def aprofile_request(request, get_response):
+    """
+    profile_request for an async ``get_response``. The sampled thread is
+    the event loop's, so the profile also shows the other requests it ran
+    meanwhile, and not the blocking calls made on executor threads.
+    """
+    with _profiling(request) as profile:
+        response = await get_response(request)
+        profile.status = response.status_code
+    return _profiled_response(profile, request, response)
+
+
+# Store shared by the worker processes, served by core.views.profiles.
+profile_store = ProfileStore(settings.PROFILING_DIR,
+                             settings.PROFILING_STORE_SIZE)
@@ -0,0 +1,237 @@
+import math
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+import redis
+from django.conf import settings
+
+from core.utils.cache_util import CACHE_SOCKET_TIMEOUT, get_redis_url
+from core.utils.instrumentation import timed
+from core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# A single atomic check covering the per-username and per-IP sliding windows
+# and the global token bucket that sits in front of a Cognito operation.
+#
+# KEYS[1] - sorted set holding the username window
+# KEYS[2] - sorted set holding the client IP window
+# KEYS[3] - hash holding the token bucket state
+# ARGV[1] - unique member for this attempt
+# ARGV[2] - username limit (0 disables the window)
+# ARGV[3] - username window in milliseconds
+# ARGV[4] - IP limit (0 disables the window)
+# ARGV[5] - IP window in milliseconds
+# ARGV[6] - bucket capacity (0 disables the bucket)
+# ARGV[7] - bucket refill rate in tokens per second
+#
+# Returns {allowed, retry_after_ms, reason}. Attempts are only recorded when
+# every check passes, so rejected requests never extend a lockout.
+SLIDING_WINDOW_TOKEN_BUCKET_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local member = ARGV[1]
+
+local function window_retry(key, limit, window)
+    if limit <= 0 then
+        return 0
+    end
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    local count = redis.call('ZCARD', key)
+    if count < limit then
+        return 0
+    end
+    local index = count - limit
+    local entry = redis.call('ZRANGE', key, index, index, 'WITHSCORES')
+    return math.max(1, tonumber(entry[2]) + window - now)
+end
+
+local user_limit = tonumber(ARGV[2])
+local user_window = tonumber(ARGV[3])
+local ip_limit = tonumber(ARGV[4])
+local ip_window = tonumber(ARGV[5])
+local capacity = tonumber(ARGV[6])
+local refill_rate = tonumber(ARGV[7]) / 1000
+
+local user_retry = window_retry(KEYS[1], user_limit, user_window)
+if user_retry > 0 then
+    return {0, user_retry, 'username'}
+end
+local ip_retry = window_retry(KEYS[2], ip_limit, ip_window)
+if ip_retry > 0 then
+    return {0, ip_retry, 'ip'}
+end
+
+local tokens = capacity
+if capacity > 0 then
+    local state = redis.call('HMGET', KEYS[3], 'tokens', 'ts')
+    if state[1] then
+        local elapsed = math.max(0, now - tonumber(state[2]))
+        tokens = math.min(capacity, tonumber(state[1]) + elapsed * refill_rate)
+    end
+    if tokens < 1 then
+        return {0, math.ceil((1 - tokens) / refill_rate), 'global'}
+    end
+end
+
+if user_limit > 0 then
+    redis.call('ZADD', KEYS[1], now, member)
+    redis.call('PEXPIRE', KEYS[1], user_window)
+end
+if ip_limit > 0 then
+    redis.call('ZADD', KEYS[2], now, member)
+    redis.call('PEXPIRE', KEYS[2], ip_window)
+end
+if capacity > 0 then
+    redis.call('HSET', KEYS[3], 'tokens', tostring(tokens - 1), 'ts', now)
+    redis.call('PEXPIRE', KEYS[3], math.ceil(capacity / refill_rate))
+end
+return {1, 0, ''}
+"""
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    retry_after: int = 0
+    reason: str = ""
+
+
+class RateLimiter:
+    """
+    Redis backed rate limiter guarding the endpoints that call Cognito.
+
+    Limits are configured per operation in ``settings.RATE_LIMITS``. When
+    Redis is unreachable the limiter fails open so that an outage of the
+    cache never takes authentication down with it.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None) -> None:
+        self._client = client
+        self._script = None
+        self._lock = threading.Lock()
+
+    def _get_script(self):
+        if self._script is None:
+            with self._lock:
+                if self._script is None:
+                    if self._client is None:
+                        # Bounded like the cache client, so an unreachable
+                        # Redis fails open quickly instead of blocking.
+                        self._client = redis.Redis.from_url(
+                            get_redis_url(),
+                            socket_timeout=CACHE_SOCKET_TIMEOUT,
+                            socket_connect_timeout=CACHE_SOCKET_TIMEOUT)
+                    self._script = self._client.register_script(
+                        SLIDING_WINDOW_TOKEN_BUCKET_SCRIPT)
+        return self._script
+
+    def reset(self) -> None:
+        """Drop the Redis client so the next check connects again."""
+        with self._lock:
+            self._client = None
+            self._script = None
+
+    def check(self, operation: str, username: Optional[str],
+              ip: Optional[str]) -> RateLimitResult:
+        """
+        Record an attempt for the given operation and return whether it is
+        allowed. ``retry_after`` is expressed in whole seconds.
+        """
+        if not settings.RATE_LIMIT_ENABLED:
+            return RateLimitResult(allowed=True)
+        limits = settings.RATE_LIMITS.get(operation)
+        if not limits:
+            return RateLimitResult(allowed=True)
+
+        username_limit = limits.get("USERNAME_LIMIT", 0) if username else 0
+        ip_limit = limits.get("IP_LIMIT", 0) if ip else 0
+        prefix = f"ratelimit:{operation}"
+        keys = [
+            f"{prefix}:user:{(username or '').lower()}",
+            f"{prefix}:ip:{ip or ''}",
+            f"{prefix}:bucket",
+        ]
+        args = [
+            uuid.uuid4().hex,
+            username_limit,
+            int(limits.get("USERNAME_WINDOW", 0) * 1000),
+            ip_limit,
+            int(limits.get("IP_WINDOW", 0) * 1000),
+            limits.get("BUCKET_CAPACITY", 0),
+            limits.get("BUCKET_REFILL_RATE", 0),
+        ]
+        try:
+            with timed("redis", "EVALSHA"):
+                allowed, retry_after_ms, reason = self._get_script()(
+                    keys=keys, args=args)
+        except Exception:
+            logger.warning(
+                "[RateLimiter] Rate limit check failed for operation %s, "
+                "allowing request",
+                operation,
+                exc_info=True,
+            )
+            return RateLimitResult(allowed=True)
+
+        if isinstance(reason, bytes):
+            reason = reason.decode("utf-8")
+        if int(allowed):
+            return RateLimitResult(allowed=True)
+        return RateLimitResult(
+            allowed=False,
+            retry_after=max(1, math.ceil(int(retry_after_ms) / 1000)),
+            reason=reason,
+        )
+
+
+class TokenBucket:
+    """
+    In-process, thread-safe token bucket used to keep background jobs under
+    an AWS request quota. ``acquire`` blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def get_client_ip(request) -> Optional[str]:
+    """
+    Return the client IP address for the request. X-Forwarded-For is only
+    honoured when the app is configured to sit behind a trusted proxy, and
+    only the entry appended by the outermost trusted proxy is used, as the
+    client controls the entries before it.
+    """
+    if settings.RATE_LIMIT_TRUST_X_FORWARDED_FOR:
+        forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
+        if forwarded_for:
+            addresses = [
+                address.strip() for address in forwarded_for.split(",")
+            ]
+            hops = min(settings.RATE_LIMIT_TRUSTED_PROXY_HOPS, len(addresses))
+            return addresses[-hops]
+    return request.META.get("REMOTE_ADDR")
+
+
+rate_limiter = RateLimiter()
@@ -1,12 +1,15 @@
 import os
 
-import boto3
 from botocore.exceptions import ClientError
-from utils.logger import get_logger
-from utils.ssm_util import get_cached_parameter
+
+from core.utils.aws_clients import LazyClient
+from core.utils.logger import get_logger
+from core.utils.ssm_util import get_cached_parameter
 
 logger = get_logger(__name__)
 
+s3_client = LazyClient("s3")
+
 
 def upload_file(key: str, body: bytes, content_type: str) -> str:
     """
@@ -22,10 +25,7 @@ def upload_file(key: str, body: bytes, content_type: str) -> str:
         # Retrieve SSM parameters for S3 bucket name and KMS key ID.
         bucket = get_cached_parameter(os.environ.get("S3_BUCKET_NAME"))
         kms_key_id = get_cached_parameter(os.environ.get("S3_KMS_KEY_ID"))
-        logger.info(f"Uploading file with key '{key}.")
-
-        # Create an S3 client.
-        s3_client = boto3.client("s3")
+        logger.info("Uploading file with key '%s.", key)
 
         # Upload the file using put_object.
         s3_client.put_object(
@@ -46,10 +46,12 @@ def upload_file(key: str, body: bytes, content_type: str) -> str:
         else:
             location = f"https://{bucket}.s3-{region}.amazonaws.com/{key}"
 
-        logger.info(f"File uploaded successfully. Accessible at {location}")
+        logger.info("File uploaded successfully. Accessible at %s", location)
         return location
 
     except ClientError as error:
-        logger.error(f"Error uploading file '{key}' to S3: {error}",
+        logger.error("Error uploading file '%s' to S3: %s",
+                     key,
+                     error,
                      exc_info=True)
         raise Exception(f"Error uploading file: {error}") from error
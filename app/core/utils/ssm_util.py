@@ -1,12 +1,39 @@
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List
 
-import boto3
 from botocore.exceptions import ClientError
 
+from core.utils.aws_clients import LazyClient
 from core.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+ssm_client = LazyClient("ssm")
+
+# SSM GetParameters accepts at most ten names per call.
+GET_PARAMETERS_MAX_NAMES = 10
+
+# Values fetched from SSM, shared by every caller in the process.
+_parameter_cache: Dict[str, str] = {}
+_parameter_cache_lock = threading.Lock()
+
+
+def _is_local() -> bool:
+    return os.environ.get("DJANGO_ENV", "").lower() in ["local", "test"]
+
+
+def cache_parameters(values: Dict[str, str]) -> None:
+    """Store already resolved parameter values in the process cache."""
+    with _parameter_cache_lock:
+        _parameter_cache.update(values)
+
+
+def clear_parameter_cache() -> None:
+    with _parameter_cache_lock:
+        _parameter_cache.clear()
+
 
 def get_cached_parameter(name: str) -> str:
     """
@@ -19,21 +46,109 @@ def get_cached_parameter(name: str) -> str:
         value = os.environ.get(name)
         if value is None:
             raise Exception(f"Environment variable '{name}' is not set")
-        logger.info(f"[get_cached_parameter] Using environment variable "
-                    f"'{name}': {value}")
+        logger.info(
+            "[get_cached_parameter] Using environment variable '%s': %s", name,
+            value)
         return value
 
+    cached = _parameter_cache.get(name)
+    if cached is not None:
+        return cached
+
     # Production: fetch the parameter from SSM.
-    ssm_client = boto3.client("ssm")
     try:
-        logger.info(
-            f"[get_cached_parameter] Fetching parameter '{name}' from SSM.")
+        logger.info("[get_cached_parameter] Fetching parameter '%s' from SSM.",
+                    name)
         response = ssm_client.get_parameter(Name=name, WithDecryption=True)
-        return response["Parameter"]["Value"]
+        value = response["Parameter"]["Value"]
+        cache_parameters({name: value})
+        return value
     except ClientError as error:
         logger.error(
-            f"[get_cached_parameter] Error fetching parameter "
-            f"'{name}': {error}",
-            exc_info=True,
-        )
+            "[get_cached_parameter] Error fetching parameter '%s': %s",
+            name,
+            error,
+            exc_info=True)
         raise Exception(f"Could not fetch parameter: {name}") from error
+
+
+def cached_parameters() -> Dict[str, str]:
+    """A copy of the values currently held in the process cache."""
+    with _parameter_cache_lock:
+        return dict(_parameter_cache)
+
+
+def fetch_parameters(names: Iterable[str],
+                     max_workers: int = 4) -> Dict[str, str]:
+    """
+    Fetch several parameters in one batch, bypassing the process cache.
+    Names are split into GetParameters calls of at most ten names which are
+    issued concurrently. In local/test environments the values come from
+    environment variables.
+
+    :raises Exception: If any parameter cannot be resolved.
+    """
+    names = list(dict.fromkeys(names))
+    if _is_local():
+        missing = [name for name in names if os.environ.get(name) is None]
+        if missing:
+            raise Exception(f"Environment variables not set: {missing}")
+        return {name: os.environ[name] for name in names}
+    return {
+        name: parameter["Value"]
+        for name, parameter in fetch_parameter_records(
+            names, max_workers).items()
+    }
+
+
+def fetch_parameter_records(names: Iterable[str],
+                            max_workers: int = 4) -> Dict[str, Dict]:
+    """
+    Fetch the full SSM records (Value, Version, LastModifiedDate, ...) of
+    several parameters, keyed by name, using concurrent GetParameters calls.
+
+    :raises Exception: If any parameter cannot be resolved.
+    """
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+
+    chunks = [
+        names[index:index + GET_PARAMETERS_MAX_NAMES]
+        for index in range(0, len(names), GET_PARAMETERS_MAX_NAMES)
+    ]
+
+    def fetch_chunk(chunk: List[str]):
+        return ssm_client.get_parameters(Names=chunk, WithDecryption=True)
+
+    records: Dict[str, Dict] = {}
+    invalid: List[str] = []
+    try:
+        logger.info(
+            "[fetch_parameters] Fetching %s parameters from SSM in "
+            "%s calls", len(names), len(chunks))
+        with ThreadPoolExecutor(max_workers=min(max_workers,
+                                                len(chunks))) as executor:
+            for response in executor.map(fetch_chunk, chunks):
+                for parameter in response.get("Parameters", []):
+                    records[parameter["Name"]] = parameter
+                invalid.extend(response.get("InvalidParameters", []))
+    except ClientError as error:
+        logger.error("[fetch_parameters] Error fetching parameters: %s",
+                     error,
+                     exc_info=True)
+        raise Exception(f"Could not fetch parameters: {names}") from error
+    if invalid:
+        raise Exception(f"Could not fetch parameters: {invalid}")
+    return records
+
+
+def get_parameters(names: Iterable[str]) -> Dict[str, str]:
+    """
+    Like ``fetch_parameters`` but populates the process cache so that later
+    ``get_cached_parameter`` calls for the same names are free.
+    """
+    values = fetch_parameters(names)
+    if not _is_local():
+        cache_parameters(values)
+    return values
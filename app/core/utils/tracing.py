@@ -0,0 +1,230 @@
+"""
+OpenTelemetry tracing.
+
+TracingMiddleware opens a server span per request, continuing the W3C trace
+context of the caller, and the existing hook points add child spans for
+services, repository methods, cache operations, database queries and AWS
+calls. AWS requests carry a ``traceparent`` header.
+
+Child spans are only created inside a sampled request, so unsampled
+requests and code running outside of a request pay one context variable
+lookup per hook. Nothing is traced until ``configure_tracing`` (called by
+CoreConfig.ready) installs a provider with TRACING_ENABLED set.
+"""
+
+import contextlib
+import functools
+import json
+import threading
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from opentelemetry import context as otel_context
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (BatchSpanProcessor, SpanExporter,
+                                            SpanExportResult)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from core.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_tracer: Optional[trace.Tracer] = None
+
+# Statements are truncated so a bulk insert cannot produce a huge span.
+MAX_STATEMENT_LENGTH = 2000
+
+_NOT_RECORDING = contextlib.nullcontext()
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Appends every finished span to ``path`` as one JSON object a line."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(
+            json.dumps(json.loads(span.to_json()), separators=(",", ":")) +
+            "\n" for span in spans)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as file:
+                file.write(lines)
+        except OSError:
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+
+def build_exporter(name: str, settings) -> SpanExporter:
+    if name == "file":
+        return JsonLinesSpanExporter(settings.TRACING_FILE_PATH)
+    if name == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import \
+                OTLPSpanExporter
+        except ImportError:
+            # Tracing must not stop the app from starting.
+            logger.warning(
+                "[Tracing] opentelemetry-exporter-otlp-proto-http is not "
+                "installed, exporting spans to %s instead",
+                settings.TRACING_FILE_PATH)
+            return JsonLinesSpanExporter(settings.TRACING_FILE_PATH)
+        return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+    raise ValueError(f"Unknown TRACING_EXPORTER '{name}'")
+
+
+def configure(provider: Optional[TracerProvider]) -> None:
+    """Trace with ``provider``, or stop tracing when it is None."""
+    global _tracer
+    _tracer = provider.get_tracer("core") if provider is not None else None
+
+
+def configure_tracing() -> None:
+    """Install the tracer provider described by the TRACING_* settings."""
+    from django.conf import settings
+
+    if not settings.TRACING_ENABLED:
+        return
+    provider = TracerProvider(
+        resource=Resource.create(
+            {"service.name": settings.TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(
+            settings.TRACING_SAMPLE_RATIO)),
+    )
+    # The batch processor restarts its export thread in forked workers.
+    provider.add_span_processor(
+        BatchSpanProcessor(build_exporter(settings.TRACING_EXPORTER,
+                                          settings)))
+    trace.set_tracer_provider(provider)
+    configure(provider)
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def recording() -> bool:
+    """Whether the current span is part of a sampled trace."""
+    return _tracer is not None and trace.get_current_span().is_recording()
+
+
+def span(name: str,
+         kind: SpanKind = SpanKind.INTERNAL,
+         attributes: Optional[Dict[str, Any]] = None):
+    """
+    Context manager running its block in a child span of the current one,
+    or doing nothing outside of a sampled trace.
+    """
+    if not recording():
+        return _NOT_RECORDING
+    return _tracer.start_as_current_span(name, kind=kind,
+                                         attributes=attributes)
+
+
+def traced(method: Callable) -> Callable:
+    """Decorator running a method in a span named ``Class.method``."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not recording():
+            return method(self, *args, **kwargs)
+        with _tracer.start_as_current_span(
+                f"{type(self).__name__}.{method.__name__}"):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def start_server_span(request):
+    """
+    Start the span of an incoming request, continuing the trace context in
+    its ``traceparent`` header. The caller must end it.
+    """
+    return _tracer.start_span(
+        request.method,
+        context=propagate.extract(request.headers),
+        kind=SpanKind.SERVER,
+        attributes={
+            "http.method": request.method,
+            "http.target": request.path,
+        },
+    )
+
+
+def finish_server_span(span, request, response) -> None:
+    match = request.resolver_match
+    if match is not None:
+        route = match.route or match.view_name
+        span.update_name(f"{request.method} {route}")
+        span.set_attribute("http.route", route)
+    span.set_attribute("http.status_code", response.status_code)
+    if response.status_code >= 500:
+        span.set_status(Status(StatusCode.ERROR))
+    span.end()
+
+
+def database_wrapper(execute, sql, params, many, context):
+    """``connection.execute_wrapper`` hook tracing every query."""
+    if not recording():
+        return execute(sql, params, many, context)
+    connection = context["connection"]
+    with _tracer.start_as_current_span(
+            sql.split(None, 1)[0].upper() if sql else "query",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": connection.vendor,
+                "db.name": connection.alias,
+                "db.statement": sql[:MAX_STATEMENT_LENGTH],
+            }):
+        return execute(sql, params, many, context)
+
+
+def _after_aws_call(context: Dict[str, Any],
+                    http_response=None,
+                    exception=None,
+                    **kwargs) -> None:
+    started = context.pop("tracing_span", None)
+    if started is None:
+        return
+    span, token = started
+    otel_context.detach(token)
+    if http_response is not None:
+        span.set_attribute("http.status_code", http_response.status_code)
+    if exception is not None:
+        span.record_exception(exception)
+    if http_response is None or http_response.status_code >= 300:
+        span.set_status(Status(StatusCode.ERROR))
+    span.end()
+
+
+def _inject_trace_context(request, **kwargs) -> None:
+    if recording():
+        propagate.inject(request.headers)
+
+
+def instrument_boto3_client(client) -> None:
+    """Trace every API call made by a boto3 client."""
+    service = client.meta.service_model.service_name
+
+    def before_call(context, model, **kwargs):
+        if not recording():
+            return
+        span = _tracer.start_span(f"{service}.{model.name}",
+                                  kind=SpanKind.CLIENT,
+                                  attributes={
+                                      "rpc.system": "aws-api",
+                                      "rpc.service": service,
+                                      "rpc.method": model.name,
+                                  })
+        # Current until after-call so the request sent below carries it.
+        token = otel_context.attach(trace.set_span_in_context(span))
+        context["tracing_span"] = (span, token)
+
+    events = client.meta.events
+    events.register_first("before-call.*.*", before_call)
+    events.register("before-send.*.*", _inject_trace_context)
+    events.register("after-call.*.*", _after_aws_call)
+    events.register("after-call-error.*.*", _after_aws_call)
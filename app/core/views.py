@@ -1 +1,93 @@
-# Create your views here.
+from django import http
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from core.db.slow_queries import slow_query_log
+from core.utils import metrics as prometheus_metrics
+from core.utils import profiling
+from core.utils.cache_analytics import key_space_analytics
+from core.utils.health import readiness
+from core.utils.http_response import HttpResponse
+
+
+@never_cache
+def healthz(request):
+    """Liveness: the process is up and serving requests."""
+    return JsonResponse(HttpResponse.success({"status": "alive"}))
+
+
+@never_cache
+def readyz(request):
+    """Readiness: database, cache and configuration, cached per process."""
+    ready, checks = readiness()
+    if ready:
+        return JsonResponse(HttpResponse.success(checks))
+    return JsonResponse(HttpResponse.error("Service not ready", 503, checks),
+                        status=503)
+
+
+@never_cache
+def metrics(request):
+    """Prometheus metrics, aggregated over all worker processes."""
+    return http.HttpResponse(prometheus_metrics.render(),
+                             content_type=CONTENT_TYPE_LATEST)
+
+
+@never_cache
+def slow_queries(request):
+    """Recent slow queries of this worker process, for staff users."""
+    if not request.user.is_staff:
+        return JsonResponse(HttpResponse.error("Forbidden", 403), status=403)
+    return JsonResponse(
+        HttpResponse.success({
+            "threshold_ms": slow_query_log.threshold * 1000,
+            "queries": slow_query_log.entries(),
+        }))
+
+
+@never_cache
+def cache_keys(request):
+    """Hot cache keys sampled by this worker process, for staff users."""
+    if not request.user.is_staff:
+        return JsonResponse(HttpResponse.error("Forbidden", 403), status=403)
+    return JsonResponse(HttpResponse.success(key_space_analytics.summary()))
+
+
+def _may_read_profiles(request) -> bool:
+    return request.user.is_staff or profiling.verify(
+        request.headers.get(profiling.PROFILE_HEADER))
+
+
+@never_cache
+def profiles(request):
+    """Stored request profiles of all worker processes, newest first."""
+    if not _may_read_profiles(request):
+        return JsonResponse(HttpResponse.error("Forbidden", 403), status=403)
+    return JsonResponse(
+        HttpResponse.success(
+            {"profiles": profiling.profile_store.summaries()}))
+
+
+@never_cache
+def profile(request, profile_id):
+    """
+    One stored profile, as a speedscope file or, with ``?format=collapsed``,
+    as collapsed stacks for flamegraph.pl.
+    """
+    if not _may_read_profiles(request):
+        return JsonResponse(HttpResponse.error("Forbidden", 403), status=403)
+    found = profiling.profile_store.get(profile_id)
+    if found is None:
+        return JsonResponse(HttpResponse.error("Profile not found", 404),
+                            status=404)
+    if request.GET.get("format") == "collapsed":
+        response = http.HttpResponse(found.collapsed(),
+                                     content_type="text/plain")
+        extension = "folded"
+    else:
+        response = JsonResponse(found.speedscope())
+        extension = "speedscope.json"
+    response["Content-Disposition"] = (
+        f'attachment; filename="{found.id}.{extension}"')
+    return response
@@ -0,0 +1,122 @@
+"""
+Gunicorn configuration for production.
+
+Usage (from the app directory):
+    python manage.py migrate            # run once per deploy, not per worker
+    gunicorn -c gunicorn.conf.py
+
+Every value can be overridden with the GUNICORN_* environment variables
+below. The defaults serve the WSGI app with gthread workers. Set
+GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker (uvicorn must be
+installed) to serve app.asgi, with the async user views, instead.
+
+Sizing: each worker process gets roughly one core's worth of CPU work, and
+its threads cover the time requests spend blocked on Postgres, Redis and
+AWS. With an I/O wait ratio of r (the fraction of a request spent waiting),
+one core stays busy with about 1 / (1 - r) concurrent requests.
+"""
+
+import math
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+cpu_count = multiprocessing.cpu_count()
+io_wait_ratio = min(0.95, max(0.0, float(
+    os.environ.get("GUNICORN_IO_WAIT_RATIO", 0.75))))
+
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+asgi = "uvicorn" in worker_class
+wsgi_app = "app.asgi:application" if asgi else "app.wsgi:application"
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", max(2, cpu_count)))
+threads = int(
+    os.environ.get("GUNICORN_THREADS",
+                   min(32, math.ceil(1 / (1 - io_wait_ratio)))))
+
+# Import the app once in the master so workers fork with the code already
+# loaded (faster boot, shared memory pages). Connections and clients that
+# must not be shared across fork are reset in post_fork.
+preload_app = True
+
+# Recycle workers periodically to bound memory growth. The jitter keeps all
+# workers from restarting at the same moment.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(
+    os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", max_requests // 10))
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+# Longer than the load balancer idle timeout so the balancer, not gunicorn,
+# closes idle keep-alive connections.
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 75))
+
+# Heartbeat files on tmpfs; a disk-backed /tmp can stall workers.
+worker_tmp_dir = os.environ.get(
+    "GUNICORN_WORKER_TMP_DIR",
+    "/dev/shm" if os.path.isdir("/dev/shm") else None)
+
+# Workers write their Prometheus samples to files in this directory so that
+# /metrics, served by any one worker, reports the whole server. It must be
+# set before prometheus_client is imported and exist before the preloaded
+# app creates its metrics, which gunicorn does before calling any server
+# hook, so it is emptied here. A SIGHUP reloads this file in the same
+# master, whose workers' files are kept.
+prometheus_multiproc_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR",
+    os.path.join(worker_tmp_dir or tempfile.gettempdir(), "prometheus"))
+if os.environ.get("PROMETHEUS_MULTIPROC_DIR_OWNER") != str(os.getpid()):
+    os.environ["PROMETHEUS_MULTIPROC_DIR_OWNER"] = str(os.getpid())
+    shutil.rmtree(prometheus_multiproc_dir, ignore_errors=True)
+    os.makedirs(prometheus_multiproc_dir)
+
+accesslog = os.environ.get("GUNICORN_ACCESSLOG", "-")
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOGLEVEL", "info")
+
+
+def pre_fork(server, worker):
+    # Close any database connection opened while preloading so children
+    # never inherit (and later terminate) the master's socket.
+    from django.db import connections
+
+    from core.utils.parameter_watcher import parameter_watcher
+
+    connections.close_all()
+    # Only the workers poll for parameter changes.
+    parameter_watcher.stop()
+
+
+def post_fork(server, worker):
+    from core.db.pool import reset_pools
+    from core.db.slow_queries import slow_query_log
+    from core.utils.async_executor import blocking_executor
+    from core.utils.aws_clients import reset_clients
+    from core.utils.cache_analytics import key_space_analytics
+    from core.utils.cache_util import cache
+    from core.utils.parameter_watcher import parameter_watcher
+
+    reset_pools()
+    reset_clients()
+    cache.reset()
+    cache.connect()
+    key_space_analytics.reset()
+    parameter_watcher.reset()
+    parameter_watcher.start()
+    slow_query_log.reset()
+    blocking_executor.reset()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def when_ready(server):
+    server.log.info(
+        "Serving %s with %s %s workers x %s threads "
+        "(cpus=%s, io_wait_ratio=%.2f)", wsgi_app, workers, worker_class,
+        threads, cpu_count, io_wait_ratio)
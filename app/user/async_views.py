@@ -0,0 +1,291 @@
+"""
+Async versions of the user views, routed instead of the DRF views when
+ASYNC_USER_VIEWS is set (app.asgi sets it). Requests and responses are the
+same as the DRF views'.
+"""
+
+import functools
+import json
+
+from django.http import HttpResponseNotAllowed, JsonResponse
+
+from core.services.async_user_service import AsyncUserService
+from core.utils.async_executor import run_blocking
+from core.utils.http_response import HttpResponse
+from core.utils.logger import get_logger
+from core.utils.rate_limiter import get_client_ip, rate_limiter
+from user.views import serialize_user, userService
+
+logger = get_logger(__name__)
+
+asyncUserService = AsyncUserService(userService)
+
+
+def async_api_view(*methods):
+    """
+    Allow only ``methods`` and exempt the view from CSRF checks, as DRF's
+    APIView does. Django's own decorators wrap views in sync functions,
+    which would make Django run them as sync views.
+    """
+
+    def decorator(view):
+
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return HttpResponseNotAllowed(methods)
+            return await view(request, *args, **kwargs)
+
+        wrapper.csrf_exempt = True
+        return wrapper
+
+    return decorator
+
+
+def json_body(request):
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+async def rate_limited_response(request, operation, username):
+    """
+    Return a 429 response when the request exceeds the rate limits for the
+    given operation, or None when it may proceed.
+    """
+    result = await run_blocking(rate_limiter.check, operation, username,
+                                get_client_ip(request))
+    if result.allowed:
+        return None
+    logger.warning("[AsyncUserController] Rate limit exceeded for %s (%s)",
+                   operation, result.reason)
+    response = JsonResponse(
+        HttpResponse.error("Too many requests, please try again later", 429,
+                           {"retryAfter": result.retry_after}),
+        status=429,
+    )
+    response["Retry-After"] = str(result.retry_after)
+    return response
+
+
+@async_api_view("POST")
+async def register_user(request):
+    try:
+        data = json_body(request)
+        username = data.get("username")
+        password = data.get("password")
+        email = data.get("email")
+
+        if not username or not password or not email:
+            logger.warning(
+                "[AsyncUserController] Missing user registration data")
+            return JsonResponse(
+                HttpResponse.error(("Missing required fields: "
+                                    "username, password, or email"), 400),
+                status=400,
+            )
+
+        limited = await rate_limited_response(request, "register", username)
+        if limited:
+            return limited
+
+        response = await asyncUserService.save({
+            "username": username,
+            "password": password,
+            "email": email,
+        })
+        return JsonResponse(
+            HttpResponse.success(serialize_user(response),
+                                 "User registered successfully"))
+    except Exception as error:
+        logger.error("[AsyncUserController] Registration failed",
+                     exc_info=True)
+        return JsonResponse(
+            HttpResponse.error("Failed to register user", 500, str(error)),
+            status=500,
+        )
+
+
+@async_api_view("POST")
+async def confirm_user_registration(request):
+    try:
+        data = json_body(request)
+        username = data.get("username")
+        confirmationCode = data.get("confirmationCode")
+
+        if not username or not confirmationCode:
+            logger.warning("[AsyncUserController] Missing confirmation data")
+            return JsonResponse(
+                HttpResponse.error(("Missing required fields: "
+                                    "username or confirmationCode"), 400),
+                status=400,
+            )
+
+        response = await asyncUserService.confirm_registration(
+            username, confirmationCode)
+        return JsonResponse(
+            HttpResponse.success(response, "User confirmed successfully"))
+    except Exception as error:
+        logger.error("[AsyncUserController] User confirmation failed",
+                     exc_info=True)
+        return JsonResponse(
+            HttpResponse.error("Failed to confirm user", 500, str(error)),
+            status=500,
+        )
+
+
+@async_api_view("POST")
+async def authenticate_user(request):
+    try:
+        data = json_body(request)
+        username = data.get("username")
+        password = data.get("password")
+
+        if not username or not password:
+            logger.warning(
+                "[AsyncUserController] Missing authentication data")
+            return JsonResponse(
+                HttpResponse.error(
+                    "Missing required fields: username or password", 400),
+                status=400,
+            )
+
+        limited = await rate_limited_response(request, "authenticate",
+                                              username)
+        if limited:
+            return limited
+
+        response = await asyncUserService.authenticate(username, password)
+        return JsonResponse(
+            HttpResponse.success(response, "Authentication successful"))
+    except Exception as error:
+        logger.error("[AsyncUserController] Authentication failed",
+                     exc_info=True)
+        return JsonResponse(
+            HttpResponse.error("Authentication failed", 500, str(error)),
+            status=500,
+        )
+
+
+@async_api_view("POST")
+async def initiate_password_reset(request):
+    try:
+        username = json_body(request).get("username")
+        if not username:
+            logger.warning(
+                "[AsyncUserController] Missing username for password reset")
+            return JsonResponse(
+                HttpResponse.error("Username is required", 400),
+                status=400,
+            )
+
+        limited = await rate_limited_response(request,
+                                              "initiate_password_reset",
+                                              username)
+        if limited:
+            return limited
+
+        response = await asyncUserService.initiate_password_reset(username)
+        return JsonResponse(
+            HttpResponse.success(response,
+                                 "Password reset initiated successfully"))
+    except Exception as error:
+        logger.error("[AsyncUserController] Password reset initiation failed",
+                     exc_info=True)
+        return JsonResponse(
+            HttpResponse.error("Failed to initiate password reset", 500,
+                               str(error)),
+            status=500,
+        )
+
+
+@async_api_view("POST")
+async def complete_password_reset(request):
+    try:
+        data = json_body(request)
+        username = data.get("username")
+        newPassword = data.get("newPassword")
+        confirmationCode = data.get("confirmationCode")
+
+        if not username or not newPassword or not confirmationCode:
+            logger.warning(
+                ("[AsyncUserController] Missing data for password reset "
+                 "completion"))
+            return JsonResponse(
+                HttpResponse.error(("Missing required fields: username, "
+                                    "newPassword, or confirmationCode"), 400),
+                status=400,
+            )
+
+        response = await asyncUserService.complete_password_reset(
+            username, newPassword, confirmationCode)
+        return JsonResponse(
+            HttpResponse.success(response,
+                                 "Password reset completed successfully"))
+    except Exception as error:
+        logger.error("[AsyncUserController] Password reset completion failed",
+                     exc_info=True)
+        return JsonResponse(
+            HttpResponse.error("Failed to complete password reset", 500,
+                               str(error)),
+            status=500,
+        )
+
+
+@async_api_view("GET")
+async def get_user_by_id(request, id):
+    try:
+        user = await asyncUserService.find_by_id(int(id))
+        if not user:
+            logger.warning("[AsyncUserController] User not found with ID: %s",
+                           id)
+            return JsonResponse(HttpResponse.error("User not found", 404),
+                                status=404)
+
+        logger.info(
+            "[AsyncUserController] User retrieved successfully with ID: %s",
+            id)
+        return JsonResponse(
+            HttpResponse.success(serialize_user(user),
+                                 "User retrieved successfully"))
+    except Exception as error:
+        logger.error("[AsyncUserController] Failed to fetch user by ID",
+                     exc_info=True)
+        return JsonResponse(
+            HttpResponse.error("Failed to fetch user", 500, str(error)),
+            status=500,
+        )
+
+
+@async_api_view("PUT")
+async def update_user(request, id):
+    try:
+        updated_data = json_body(request)
+        if not updated_data:
+            logger.warning("[AsyncUserController] Missing update data")
+            return JsonResponse(
+                HttpResponse.error("Update data is required", 400),
+                status=400,
+            )
+
+        updated_user = await asyncUserService.update(int(id), updated_data)
+        if not updated_user:
+            logger.warning(
+                "[AsyncUserController] Failed to update user with ID: %s", id)
+            return JsonResponse(HttpResponse.error("User not found", 404),
+                                status=404)
+
+        logger.info(
+            "[AsyncUserController] User updated successfully with ID: %s", id)
+        return JsonResponse(
+            HttpResponse.success(serialize_user(updated_user),
+                                 "User updated successfully"))
+    except Exception as error:
+        logger.error("[AsyncUserController] Failed to update user",
+                     exc_info=True)
+        return JsonResponse(
+            HttpResponse.error("Failed to update user", 500, str(error)),
+            status=500,
+        )
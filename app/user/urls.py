@@ -1,26 +1,52 @@
 # user/urls.py
+from django.conf import settings
 from django.urls import path
 
 from user import views
 
 app_name = 'user'
 
-urlpatterns = [
-    path('register/', views.RegisterUserView.as_view(), name='register_user'),
-    path('confirm/',
-         views.ConfirmUserRegistrationView.as_view(),
-         name='confirm_user_registration'),
-    path('authenticate/',
-         views.AuthenticateUserView.as_view(),
-         name='authenticate_user'),
-    path('password-reset/initiate/',
-         views.InitiatePasswordResetView.as_view(),
-         name='initiate_password_reset'),
-    path('password-reset/complete/',
-         views.CompletePasswordResetView.as_view(),
-         name='complete_password_reset'),
-    path('<int:id>/', views.GetUserByIdView.as_view(), name='get_user_by_id'),
-    path('<int:id>/update/',
-         views.UpdateUserView.as_view(),
-         name='update_user'),
-]
+if settings.ASYNC_USER_VIEWS:
+    from user import async_views
+
+    urlpatterns = [
+        path('register/', async_views.register_user, name='register_user'),
+        path('confirm/',
+             async_views.confirm_user_registration,
+             name='confirm_user_registration'),
+        path('authenticate/',
+             async_views.authenticate_user,
+             name='authenticate_user'),
+        path('password-reset/initiate/',
+             async_views.initiate_password_reset,
+             name='initiate_password_reset'),
+        path('password-reset/complete/',
+             async_views.complete_password_reset,
+             name='complete_password_reset'),
+        path('<int:id>/', async_views.get_user_by_id, name='get_user_by_id'),
+        path('<int:id>/update/', async_views.update_user, name='update_user'),
+    ]
+else:
+    urlpatterns = [
+        path('register/',
+             views.RegisterUserView.as_view(),
+             name='register_user'),
+        path('confirm/',
+             views.ConfirmUserRegistrationView.as_view(),
+             name='confirm_user_registration'),
+        path('authenticate/',
+             views.AuthenticateUserView.as_view(),
+             name='authenticate_user'),
+        path('password-reset/initiate/',
+             views.InitiatePasswordResetView.as_view(),
+             name='initiate_password_reset'),
+        path('password-reset/complete/',
+             views.CompletePasswordResetView.as_view(),
+             name='complete_password_reset'),
+        path('<int:id>/',
+             views.GetUserByIdView.as_view(),
+             name='get_user_by_id'),
+        path('<int:id>/update/',
+             views.UpdateUserView.as_view(),
+             name='update_user'),
+    ]
@@ -1,3 +1,4 @@
+from django.forms.models import model_to_dict
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -5,12 +6,37 @@ from rest_framework.views import APIView
 from core.services.user_service import UserService
 from core.utils.http_response import HttpResponse
 from core.utils.logger import get_logger
+from core.utils.rate_limiter import get_client_ip, rate_limiter
 
 logger = get_logger(__name__)
 
 userService = UserService()
 
 
+def serialize_user(user):
+    """The user as returned by the API, without the password ciphertext."""
+    return model_to_dict(user, exclude=["password"])
+
+
+def rate_limited_response(request, operation, username):
+    """
+    Return a 429 response when the request exceeds the rate limits for the
+    given operation, or None when it may proceed.
+    """
+    result = rate_limiter.check(operation, username, get_client_ip(request))
+    if result.allowed:
+        return None
+    logger.warning("[UserController] Rate limit exceeded for %s (%s)",
+                   operation, result.reason)
+    response = Response(
+        HttpResponse.error("Too many requests, please try again later", 429,
+                           {"retryAfter": result.retry_after}),
+        status=status.HTTP_429_TOO_MANY_REQUESTS,
+    )
+    response["Retry-After"] = str(result.retry_after)
+    return response
+
+
 class RegisterUserView(APIView):
 
     def post(self, request, format=None):
@@ -29,13 +55,18 @@ class RegisterUserView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
+            limited = rate_limited_response(request, "register", username)
+            if limited:
+                return limited
+
             response = userService.save({
                 "username": username,
                 "password": password,
                 "email": email,
             })
             return Response(
-                HttpResponse.success(response, "User registered successfully"),
+                HttpResponse.success(serialize_user(response),
+                                     "User registered successfully"),
                 status=status.HTTP_200_OK,
             )
         except Exception as error:
@@ -91,6 +122,10 @@ class AuthenticateUserView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
+            limited = rate_limited_response(request, "authenticate", username)
+            if limited:
+                return limited
+
             response = userService.authenticate(username, password)
             return Response(
                 HttpResponse.success(response, "Authentication successful"),
@@ -118,6 +153,12 @@ class InitiatePasswordResetView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
+            limited = rate_limited_response(request,
+                                            "initiate_password_reset",
+                                            username)
+            if limited:
+                return limited
+
             response = userService.initiate_password_reset(username)
             return Response(
                 HttpResponse.success(response,
@@ -182,19 +223,20 @@ class GetUserByIdView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            user = userService.findById(int(id))
+            user = userService.find_by_id(int(id))
             if not user:
-                logger.warning(
-                    f"[UserController] User not found with ID: {id}")
+                logger.warning("[UserController] User not found with ID: %s",
+                               id)
                 return Response(
                     HttpResponse.error("User not found", 404),
                     status=status.HTTP_404_NOT_FOUND,
                 )
 
             logger.info(
-                f"[UserController] User retrieved successfully with ID: {id}")
+                "[UserController] User retrieved successfully with ID: %s", id)
             return Response(
-                HttpResponse.success(user, "User retrieved successfully"),
+                HttpResponse.success(serialize_user(user),
+                                     "User retrieved successfully"),
                 status=status.HTTP_200_OK,
             )
         except Exception as error:
@@ -229,16 +271,16 @@ class UpdateUserView(APIView):
             updated_user = userService.update(int(id), updated_data)
             if not updated_user:
                 logger.warning(
-                    f"[UserController] Failed to update user with ID: {id}")
+                    "[UserController] Failed to update user with ID: %s", id)
                 return Response(
                     HttpResponse.error("User not found", 404),
                     status=status.HTTP_404_NOT_FOUND,
                 )
 
             logger.info(
-                f"[UserController] User updated successfully with ID: {id}")
+                "[UserController] User updated successfully with ID: %s", id)
             return Response(
-                HttpResponse.success(updated_user,
+                HttpResponse.success(serialize_user(updated_user),
                                      "User updated successfully"),
                 status=status.HTTP_200_OK,
             )